@@ -19,6 +19,9 @@ class APIConfig(BaseConfig):
     DEFAULT_QUERY_RESULT: int = Field(
         default=3, description="Default number of results per query"
     )
+    MAX_BATCH_QUERIES: int = Field(
+        default=100, description="Maximum number of queries in a batch request"
+    )
     SNIPPET_MAX_LENGTH: int = Field(
         default=300, description="Maximum length of job description snippet"
     )
@@ -1,5 +1,7 @@
 """API factory for creating FastAPI application"""
 
+import asyncio
+from contextlib import asynccontextmanager
 from typing import Never
 
 from fastapi import FastAPI, Request
@@ -7,13 +9,23 @@ from fastapi import FastAPI, Request
 from api_config import api_config
 from common.exception import JobSearchError
 from common.logger import get_logger
+from common.qdrant_connection import close_clients
 from search.routers.search import router as search_router
+from search.services.query_embedding import prewarm_query_embeddings
 
 logger = get_logger(
     __name__, api_config.LOG_LEVEL, api_config.LOG_TO_CONSOLE, api_config.LOG_TO_FILE
 )
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Warm query embeddings on startup and close Qdrant connections on shutdown"""
+    await asyncio.to_thread(prewarm_query_embeddings)
+    yield
+    await close_clients()
+
+
 def create_app() -> FastAPI:
     """Create and configure FastAPI application
 
@@ -25,6 +37,7 @@ def create_app() -> FastAPI:
         description="Intelligent job search using Retrieval-Augmented Generation",
         version="0.1",
         redoc_url="/redocs",
+        lifespan=lifespan,
     )
 
     # Register exception handler
@@ -46,6 +59,9 @@ def create_app() -> FastAPI:
             "description": "Intelligent job search using Retrieval-Augmented Generation",
             "endpoints": {
                 "POST /api/query": "Search for jobs with natural language",
+                "POST /api/query/stream": "Search for jobs, streaming the response",
+                "POST /api/query/batch": "Search for many queries at once",
+                "GET /api/stats": "Cache and speculative search statistics",
             },
         }
 
@@ -0,0 +1 @@
+"""Benchmarks - Micro-benchmarks and load tests for ingestion and search"""
@@ -0,0 +1,233 @@
+"""Load test of the async /api/query path against the previous sync path
+
+Both paths run in process behind an ASGI transport, with Gemini and Qdrant
+replaced by stand-ins that only wait for a configurable latency, so the
+report shows how many concurrent requests one worker can keep in flight.
+The sync path blocks an anyio threadpool thread per request (40 by
+default), the async path only suspends a coroutine.
+
+Usage:
+    python -m benchmarks.api_concurrency [--requests N] [--concurrency N]
+        [--llm-latency S] [--qdrant-latency S]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+from fastapi import Depends, FastAPI
+from qdrant_client import models
+
+from api_factory import create_app
+from common.logger import get_logger
+from search.config import SearchConfig
+from search.routers.search import build_query_response, validate_query_request
+from search.schemas.query_request import QueryRequest
+from search.schemas.query_response import QueryResponse
+from search.services import llm_service, query_parser, vector_search
+from search.services import search_service as search_service_module
+from search.services.search_service import SearchService, get_search_service
+from vector_backend import qdrant_backend
+
+config = SearchConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+PARSED_QUERY = {"semantic_query": "python developer", "filters": {}}
+
+
+class SimulatedModel:
+    """Gemini model stand-in that answers after a fixed latency"""
+
+    def __init__(self, text, latency):
+        self.response = SimpleNamespace(text=text)
+        self.latency = latency
+
+    def generate_content(self, *args, **kwargs):
+        time.sleep(self.latency)
+        return self.response
+
+    async def generate_content_async(self, *args, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self.response
+
+
+class SimulatedQdrant:
+    """Qdrant client stand-in that returns canned points after a fixed latency"""
+
+    def __init__(self, latency, points=15):
+        self.latency = latency
+        self.response = SimpleNamespace(
+            points=[
+                models.ScoredPoint(
+                    id=i,
+                    version=0,
+                    score=1.0 - i / points,
+                    payload={
+                        "chunk_id": f"job-{i:05d}",
+                        "chunk_index": 0,
+                        "job_title": "Python Developer",
+                        "company": "Acme Inc.",
+                        "text": "Job Title: Python Developer. Build APIs.",
+                    },
+                )
+                for i in range(points)
+            ]
+        )
+        self.groups_response = SimpleNamespace(
+            groups=[SimpleNamespace(hits=[point]) for point in self.response.points]
+        )
+
+    def query_points_groups(self, **kwargs):
+        time.sleep(self.latency)
+        return self.groups_response
+
+    def query_batch_points(self, requests, **kwargs):
+        time.sleep(self.latency)
+        return [self.response] * len(requests)
+
+
+class AsyncSimulatedQdrant(SimulatedQdrant):
+    async def query_points_groups(self, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self.groups_response
+
+    async def query_batch_points(self, requests, **kwargs):
+        await asyncio.sleep(self.latency)
+        return [self.response] * len(requests)
+
+
+def simulate_backends(llm_latency, qdrant_latency):
+    """Replace Gemini, Qdrant and the query models by simulated ones"""
+    query_parser.model = SimulatedModel(json.dumps(PARSED_QUERY), llm_latency)
+    llm_service.model = SimulatedModel("Here are some Python jobs.", llm_latency)
+    sync_qdrant = SimulatedQdrant(qdrant_latency)
+    async_qdrant = AsyncSimulatedQdrant(qdrant_latency)
+    qdrant_backend.get_client = lambda: sync_qdrant
+    qdrant_backend.get_async_client = lambda: async_qdrant
+    query_vectors = ([0.0], models.SparseVector(indices=[], values=[]))
+    vector_search.embed_query = lambda query: query_vectors
+
+    async def embed_query_async(query):
+        return query_vectors
+
+    vector_search.embed_query_async = embed_query_async
+    search_service_module.embed_queries = lambda queries: [query_vectors] * len(queries)
+    qdrant_backend.config.QDRANT_LOCATION = "http://simulated"
+
+
+def create_sync_app() -> FastAPI:
+    """Build an app serving /api/query through the sync SearchService"""
+    app = FastAPI()
+
+    @app.post("/api/query", response_model=QueryResponse)
+    def job_query(
+        request: QueryRequest,
+        search_service: SearchService = Depends(get_search_service),
+    ):
+        validate_query_request(request)
+        unique_results, response_from_llm = (
+            search_service.search_jobs_and_generate_response(request.query, request.top)
+        )
+        return build_query_response(request, unique_results, response_from_llm)
+
+    return app
+
+
+async def load_test(app, requests, concurrency):
+    """Send requests to an app with a fixed number of concurrent clients
+
+    Args:
+        app: ASGI application
+        requests: Total number of requests
+        concurrency: Number of requests in flight at once
+
+    Returns:
+        Dictionary of throughput and latency percentiles
+    """
+    latencies = []
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark", timeout=None
+    ) as client:
+
+        async def worker():
+            for _ in remaining:
+                start_time = time.perf_counter()
+                response = await client.post(
+                    "/api/query", json={"query": "python developer", "top": 3}
+                )
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start_time
+
+    return {
+        "throughput": requests / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "p99_ms": float(np.percentile(latencies, 99)) * 1000,
+    }
+
+
+def run_benchmark(requests=500, concurrency=200, llm_latency=0.5, qdrant_latency=0.02):
+    """Compare the sync and async request paths under concurrent load
+
+    Args:
+        requests: Total number of requests per path
+        concurrency: Number of requests in flight at once
+        llm_latency: Seconds each of the two Gemini calls takes
+        qdrant_latency: Seconds the Qdrant query takes
+
+    Returns:
+        Metrics of each path keyed by path name
+    """
+    simulate_backends(llm_latency, qdrant_latency)
+    results = {}
+    for name, app in (("sync", create_sync_app()), ("async", create_app())):
+        results[name] = asyncio.run(load_test(app, requests, concurrency))
+        logger.info(
+            f"{name:<6} {results[name]['throughput']:>8.1f} req/s "
+            f"p50 {results[name]['p50_ms']:>8.1f} ms "
+            f"p99 {results[name]['p99_ms']:>8.1f} ms"
+        )
+    speedup = results["async"]["throughput"] / results["sync"]["throughput"]
+    logger.info(
+        f"Async path serves {speedup:.1f}x the requests per second "
+        f"at concurrency {concurrency}"
+    )
+    return results
+
+
+def parse_args():
+    """Parse command line arguments of the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per path")
+    parser.add_argument(
+        "--concurrency", type=int, default=200, help="Requests in flight at once"
+    )
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.5, help="Seconds per Gemini call"
+    )
+    parser.add_argument(
+        "--qdrant-latency", type=float, default=0.02, help="Seconds per Qdrant query"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_benchmark(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        llm_latency=args.llm_latency,
+        qdrant_latency=args.qdrant_latency,
+    )
@@ -0,0 +1,125 @@
+"""Per-query cost of /api/query/batch against repeated /api/query calls
+
+Sends the same queries once as sequential /api/query requests, the way
+batch consumers loop today, and once as a single /api/query/batch
+request, with and without summaries. Gemini and Qdrant are the simulated
+backends of the concurrency benchmark.
+
+Usage:
+    python -m benchmarks.batch_query [--queries N] [--llm-latency S]
+        [--qdrant-latency S]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from api_factory import create_app
+from benchmarks.api_concurrency import simulate_backends
+from common.logger import get_logger
+from search.config import SearchConfig
+from search.services.query_parser import parse_cache
+from search.services.result_cache import result_cache
+
+config = SearchConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+ROLES = ["python developer", "data scientist", "ux designer", "sales manager"]
+PLACES = ["in London", "in Berlin", "at Google", "posted last week", "remote"]
+
+
+def make_queries(count):
+    """Distinct saved-search style queries"""
+    return [
+        f"{ROLES[i % len(ROLES)]} {PLACES[i // len(ROLES) % len(PLACES)]} {i}"
+        for i in range(count)
+    ]
+
+
+async def run_mode(mode, queries):
+    """Send the queries in one mode and time them
+
+    Args:
+        mode: "single", "batch" or "batch+summary"
+        queries: Query strings
+
+    Returns:
+        Milliseconds per query
+    """
+    result_cache.cache.clear()
+    parse_cache.clear()
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark", timeout=None
+    ) as client:
+        start_time = time.perf_counter()
+        if mode == "single":
+            for query in queries:
+                response = await client.post(
+                    "/api/query", json={"query": query, "top": 3}
+                )
+                response.raise_for_status()
+        else:
+            summarize = mode == "batch+summary"
+            response = await client.post(
+                "/api/query/batch",
+                json={
+                    "queries": [
+                        {"query": query, "top": 3, "summarize": summarize}
+                        for query in queries
+                    ]
+                },
+            )
+            response.raise_for_status()
+        elapsed = time.perf_counter() - start_time
+    return elapsed / len(queries) * 1000
+
+
+def run_benchmark(queries=100, llm_latency=0.5, qdrant_latency=0.02):
+    """Compare the per-query cost of the single and batch endpoints
+
+    Args:
+        queries: Number of queries
+        llm_latency: Seconds each Gemini call takes
+        qdrant_latency: Seconds each Qdrant request takes
+
+    Returns:
+        Milliseconds per query keyed by mode
+    """
+    simulate_backends(llm_latency, qdrant_latency)
+    batch = make_queries(queries)
+    results = {}
+    for mode in ("single", "batch", "batch+summary"):
+        results[mode] = asyncio.run(run_mode(mode, batch))
+        logger.info(f"{mode:<14} {results[mode]:>8.2f} ms per query")
+    logger.info(
+        f"Batch mode without summaries costs "
+        f"{results['batch'] / results['single']:.1%} of the single-query path"
+    )
+    return results
+
+
+def parse_args():
+    """Parse command line arguments of the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=100, help="Number of queries")
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.5, help="Seconds per Gemini call"
+    )
+    parser.add_argument(
+        "--qdrant-latency", type=float, default=0.02, help="Seconds per Qdrant query"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_benchmark(
+        queries=args.queries,
+        llm_latency=args.llm_latency,
+        qdrant_latency=args.qdrant_latency,
+    )
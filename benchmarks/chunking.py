@@ -0,0 +1,120 @@
+"""Chunking parity check and benchmark on long descriptions
+
+Compares WordCountTextSplitter against langchain's
+RecursiveCharacterTextSplitter with a word-count length function, which
+create_chunks used before, on job descriptions padded to a target length.
+
+Usage:
+    python -m benchmarks.chunking [--words N] [--limit N]
+"""
+
+import argparse
+import time
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from common.html_cleaner import clean_html
+from common.logger import get_logger
+from data_ingestion.config import DataIngestionConfig
+from data_ingestion.ingestion import load_data
+from data_ingestion.text_splitter import WordCountTextSplitter
+
+config = DataIngestionConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+
+def make_long_descriptions(descriptions, words):
+    """Concatenate descriptions until each one has at least the given words
+
+    Args:
+        descriptions: Cleaned job descriptions
+        words: Minimum number of words per generated description
+
+    Returns:
+        List of long descriptions, one per input description
+    """
+    long_descriptions = []
+    for i in range(len(descriptions)):
+        parts = []
+        word_count = 0
+        j = i
+        while word_count < words:
+            parts.append(descriptions[j % len(descriptions)])
+            word_count += len(parts[-1].split())
+            j += 1
+        long_descriptions.append("\n\n".join(parts))
+    return long_descriptions
+
+
+def time_splitter(name, split_text, texts):
+    """Time one splitter over all texts
+
+    Args:
+        name: Splitter name used in the report
+        split_text: Function splitting one text into chunks
+        texts: Texts to split
+
+    Returns:
+        Chunks of every text
+    """
+    start_time = time.perf_counter()
+    chunks = [split_text(text) for text in texts]
+    elapsed = time.perf_counter() - start_time
+    logger.info(
+        f"{name:<12} {len(texts) / elapsed:>10,.1f} docs/s ({elapsed:.2f}s, "
+        f"{sum(len(c) for c in chunks)} chunks)"
+    )
+    return chunks
+
+
+def run_benchmark(words=5000, limit=200):
+    """Check chunk boundaries against langchain and benchmark both splitters
+
+    Args:
+        words: Minimum number of words per description
+        limit: Number of descriptions to split
+
+    Returns:
+        Number of descriptions whose chunks differ from langchain
+    """
+    descriptions = [
+        clean_html(description)
+        for description in load_data()["Job Description"].tolist()[:limit]
+    ]
+    texts = make_long_descriptions(descriptions, words)
+    logger.info(
+        f"Benchmarking chunking on {len(texts)} descriptions of {words}+ words "
+        f"(CHUNK_SIZE={config.CHUNK_SIZE}, CHUNK_OVERLAP={config.CHUNK_OVERLAP})"
+    )
+
+    langchain_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=config.CHUNK_SIZE,
+        chunk_overlap=config.CHUNK_OVERLAP,
+        length_function=lambda text: len(text.split()),
+    )
+    splitter = WordCountTextSplitter(config.CHUNK_SIZE, config.CHUNK_OVERLAP)
+
+    expected = time_splitter("langchain", langchain_splitter.split_text, texts)
+    chunks = time_splitter("word-count", splitter.split_text, texts)
+
+    mismatches = sum(1 for a, b in zip(expected, chunks) if a != b)
+    if mismatches:
+        logger.warning(f"{mismatches} descriptions have different chunk boundaries")
+    else:
+        logger.info("Chunk boundaries are identical to langchain")
+    return mismatches
+
+
+def parse_args():
+    """Parse command line arguments of the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=5000, help="Words per text")
+    parser.add_argument("--limit", type=int, default=200, help="Number of texts")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_benchmark(words=args.words, limit=args.limit)
@@ -0,0 +1,269 @@
+"""Latency, memory and recall benchmark of the collection profiles
+
+Loads the corpus into one scratch collection per profile and runs the same
+hybrid queries against each. The report gives p50/p99 query latency, the
+estimated RAM of the dense vectors and their index, and recall@k of the
+dense and hybrid results against exact (brute force, unquantized) search
+on the same collection. Query vectors are computed up front, so only the
+database is timed.
+
+Run it against a Qdrant server: the local in-memory mode ignores HNSW and
+quantization settings and always searches exhaustively.
+
+Usage:
+    python -m benchmarks.collection_profiles [--profiles NAME ...]
+        [--limit N] [--queries N] [--top K] [--keep]
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+from qdrant_client import models
+
+from common.collection_profiles import PROFILES, CollectionProfile
+from common.html_cleaner import HtmlCleaner
+from common.logger import get_logger
+from common.qdrant_connection import get_client
+from data_ingestion.config import DataIngestionConfig
+from data_ingestion.embeddings import ChunkEmbedder
+from data_ingestion.ingestion import load_data_in_batches
+from data_ingestion.vector_database_setup import iter_job_chunks
+from search.services.query_embedding import embed_queries
+from vector_backend.qdrant_ingestion import iter_points
+from vector_backend.uploader import BatchUploader
+
+config = DataIngestionConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+# Words of a chunk used as a query, roughly the length of a user query
+QUERY_WORDS = 12
+
+# Exact search over the original vectors, used as the recall baseline
+EXACT_SEARCH = models.SearchParams(
+    exact=True, quantization=models.QuantizationSearchParams(ignore=True)
+)
+
+
+def take_jobs(batches, limit):
+    """Stop a stream of job batches after limit jobs"""
+    for batch in batches:
+        if limit <= 0:
+            return
+        yield batch.head(limit)
+        limit -= len(batch)
+
+
+def load_corpus(limit=None):
+    """Chunk and embed the jobs of the CSV
+
+    Args:
+        limit: Maximum number of jobs to load
+
+    Returns:
+        List of (chunk batch, dense vectors, sparse vectors) tuples
+    """
+    batches = load_data_in_batches()
+    if limit:
+        batches = take_jobs(batches, limit)
+    with HtmlCleaner(config.HTML_CLEAN_WORKERS) as cleaner, ChunkEmbedder() as embedder:
+        return list(embedder.embed_chunks(iter_job_chunks(batches, cleaner)))
+
+
+def make_queries(corpus, count, seed=0):
+    """Build query vectors from the opening words of random chunks
+
+    Args:
+        corpus: Embedded chunks
+        count: Number of queries
+        seed: Random seed, so every run uses the same queries
+
+    Returns:
+        List of (dense vector, sparse vector) query pairs
+    """
+    texts = [chunk["text"] for chunks, _, _ in corpus for chunk in chunks]
+    sample = random.Random(seed).sample(texts, min(count, len(texts)))
+    # Embedded like search queries, BM25 weighs query terms differently
+    return embed_queries([" ".join(text.split()[:QUERY_WORDS]) for text in sample])
+
+
+def build_collection(name, profile, corpus, timeout=600):
+    """Create a scratch collection with a profile and load the corpus
+
+    Args:
+        name: Collection name
+        profile: Collection profile
+        corpus: Embedded chunks
+        timeout: Seconds to wait for indexing to finish
+    """
+    if get_client().collection_exists(name):
+        get_client().delete_collection(name)
+    get_client().create_collection(
+        collection_name=name, **profile.create_collection_kwargs()
+    )
+    BatchUploader(get_client(), name).upload(iter_points(corpus))
+
+    deadline = time.monotonic() + timeout
+    while get_client().get_collection(name).status != models.CollectionStatus.GREEN:
+        if time.monotonic() > deadline:
+            logger.warning(f"Collection {name} still indexing after {timeout}s")
+            break
+        time.sleep(1)
+
+
+def dense_query(name, query, top, params):
+    """Run a dense-only query and return the ids of the results"""
+    dense, _ = query
+    response = get_client().query_points(
+        collection_name=name,
+        query=dense,
+        using="dense",
+        limit=top,
+        search_params=params,
+        with_payload=False,
+    )
+    return [point.id for point in response.points]
+
+
+def hybrid_query(name, query, top, params):
+    """Run the search service's hybrid query and return the ids of the results"""
+    dense, sparse = query
+    response = get_client().query_points(
+        collection_name=name,
+        prefetch=[
+            models.Prefetch(query=sparse, using="sparse", limit=20),
+            models.Prefetch(query=dense, using="dense", limit=20, params=params),
+        ],
+        query=models.FusionQuery(fusion=models.Fusion.RRF),
+        limit=top,
+        with_payload=False,
+    )
+    return [point.id for point in response.points]
+
+
+def recall(results, expected):
+    """Mean fraction of the exact results found by each query"""
+    return float(
+        np.mean(
+            [
+                len(set(found) & set(exact)) / len(exact)
+                for found, exact in zip(results, expected)
+                if exact
+            ]
+        )
+    )
+
+
+def benchmark_profile(
+    name: str, profile: CollectionProfile, corpus, queries, top: int
+) -> dict:
+    """Measure one profile
+
+    Args:
+        name: Scratch collection name
+        profile: Collection profile
+        corpus: Embedded chunks
+        queries: Query vectors
+        top: Number of results per query
+
+    Returns:
+        Dictionary of the measured metrics
+    """
+    build_collection(name, profile, corpus)
+    params = profile.search_params()
+
+    # Warm up caches so the first queries are not slower
+    for query in queries[:10]:
+        hybrid_query(name, query, top, params)
+
+    latencies = []
+    hybrid_results = []
+    for query in queries:
+        start_time = time.perf_counter()
+        hybrid_results.append(hybrid_query(name, query, top, params))
+        latencies.append((time.perf_counter() - start_time) * 1000)
+
+    dense_results = [dense_query(name, query, top, params) for query in queries]
+    exact_dense = [dense_query(name, query, top, EXACT_SEARCH) for query in queries]
+    exact_hybrid = [hybrid_query(name, query, top, EXACT_SEARCH) for query in queries]
+
+    points = get_client().count(name, exact=True).count
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "memory_mb": profile.estimate_memory_bytes(points) / 1024**2,
+        "dense_recall": recall(dense_results, exact_dense),
+        "hybrid_recall": recall(hybrid_results, exact_hybrid),
+    }
+
+
+def run_benchmark(profiles=None, limit=None, queries=100, top=10, keep=False):
+    """Benchmark collection profiles on the job corpus
+
+    Args:
+        profiles: Names of the profiles to benchmark, defaults to all
+        limit: Maximum number of jobs to load
+        queries: Number of queries
+        top: Number of results per query, the k of recall@k
+        keep: Keep the scratch collections instead of deleting them
+
+    Returns:
+        Metrics of each profile keyed by profile name
+    """
+    corpus = load_corpus(limit)
+    query_vectors = make_queries(corpus, queries)
+    logger.info(
+        f"Benchmarking {len(profiles or PROFILES)} profiles on "
+        f"{sum(len(chunks) for chunks, _, _ in corpus)} chunks "
+        f"with {len(query_vectors)} queries"
+    )
+
+    results = {}
+    for profile_name in profiles or PROFILES:
+        name = f"{config.COLLECTION_NAME}_bench_{profile_name}"
+        results[profile_name] = benchmark_profile(
+            name, PROFILES[profile_name], corpus, query_vectors, top
+        )
+        if not keep:
+            get_client().delete_collection(name)
+
+    logger.info(
+        f"{'profile':<12} {'p50 ms':>8} {'p99 ms':>8} {'RAM MB':>8} "
+        f"{f'dense R@{top}':>11} {f'hybrid R@{top}':>12}"
+    )
+    for profile_name, metrics in results.items():
+        logger.info(
+            f"{profile_name:<12} {metrics['p50_ms']:>8.2f} {metrics['p99_ms']:>8.2f} "
+            f"{metrics['memory_mb']:>8.1f} {metrics['dense_recall']:>11.3f} "
+            f"{metrics['hybrid_recall']:>12.3f}"
+        )
+    return results
+
+
+def parse_args():
+    """Parse command line arguments of the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--profiles", nargs="+", choices=list(PROFILES), help="Profiles to benchmark"
+    )
+    parser.add_argument("--limit", type=int, help="Number of jobs to load")
+    parser.add_argument("--queries", type=int, default=100, help="Number of queries")
+    parser.add_argument("--top", type=int, default=10, help="k of recall@k")
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the scratch collections"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_benchmark(
+        profiles=args.profiles,
+        limit=args.limit,
+        queries=args.queries,
+        top=args.top,
+        keep=args.keep,
+    )
@@ -0,0 +1,97 @@
+"""HTML cleaning parity check and micro-benchmark
+
+Compares the fast cleaner against BeautifulSoup on the job descriptions
+in the CSV and reports documents per second for each engine.
+
+Usage:
+    python -m benchmarks.html_cleaning [--limit N] [--workers N]
+"""
+
+import argparse
+import time
+
+from common.html_cleaner import WORKER_CHUNKSIZE, HtmlCleaner, clean_html
+from common.logger import get_logger
+from common.utils import remove_html_tags
+from data_ingestion.config import DataIngestionConfig
+from data_ingestion.ingestion import load_data
+
+config = DataIngestionConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+
+def time_engine(name, clean_batch, descriptions):
+    """Time one cleaning engine over all descriptions
+
+    Args:
+        name: Engine name used in the report
+        clean_batch: Function cleaning a list of descriptions
+        descriptions: Descriptions to clean
+
+    Returns:
+        Cleaned descriptions
+    """
+    start_time = time.perf_counter()
+    cleaned = clean_batch(descriptions)
+    elapsed = time.perf_counter() - start_time
+    logger.info(
+        f"{name:<24} {len(descriptions) / elapsed:>12,.0f} docs/s ({elapsed:.2f}s)"
+    )
+    return cleaned
+
+
+def run_benchmark(limit=None, workers=None):
+    """Check parity with BeautifulSoup and benchmark the cleaning engines
+
+    Args:
+        limit: Maximum number of descriptions to use
+        workers: Number of worker processes for the pooled engine
+
+    Returns:
+        Number of descriptions whose cleaned text differs from BeautifulSoup
+    """
+    descriptions = load_data()["Job Description"].tolist()[:limit]
+    logger.info(f"Benchmarking HTML cleaning on {len(descriptions)} descriptions")
+
+    expected = time_engine(
+        "BeautifulSoup",
+        lambda batch: [remove_html_tags(description) for description in batch],
+        descriptions,
+    )
+    fast = time_engine(
+        "Fast (1 process)",
+        lambda batch: [clean_html(description) for description in batch],
+        descriptions,
+    )
+    with HtmlCleaner(workers or config.HTML_CLEAN_WORKERS) as cleaner:
+        # Warm up the pool so process start-up is not timed
+        cleaner.clean(descriptions[: (WORKER_CHUNKSIZE + 1) * cleaner.workers])
+        pooled = time_engine(
+            f"Fast ({cleaner.workers} processes)", cleaner.clean, descriptions
+        )
+
+    mismatches = sum(
+        1
+        for reference, fast_text, pooled_text in zip(expected, fast, pooled)
+        if fast_text != reference or pooled_text != reference
+    )
+    if mismatches:
+        logger.warning(f"{mismatches} descriptions differ from BeautifulSoup output")
+    else:
+        logger.info("Cleaned text is identical to BeautifulSoup output")
+    return mismatches
+
+
+def parse_args():
+    """Parse command line arguments of the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, help="Number of descriptions to use")
+    parser.add_argument("--workers", type=int, help="Worker processes for the pool")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_benchmark(limit=args.limit, workers=args.workers)
@@ -0,0 +1,138 @@
+"""Throughput of micro-batched query embedding under concurrent requests
+
+Embeds distinct queries from many concurrent coroutines, once with one
+model call per query in worker threads (the previous async path) and once
+through the micro-batcher, and reports queries per second and latency.
+Every query is distinct so the embedding cache never answers.
+
+Usage:
+    python -m benchmarks.query_embedding_batching [--requests N]
+        [--concurrency N] [--batch-size N] [--batch-wait S]
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from common.logger import get_logger
+from common.qdrant_config import QdrantConfig
+from search.services.query_embedding import (
+    QueryEmbeddingBatcher,
+    embed_query,
+    embedding_cache,
+    get_query_models,
+)
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+TOPICS = [
+    "python developer",
+    "data scientist",
+    "frontend engineer react",
+    "sales manager",
+    "ux designer",
+    "project manager agile",
+    "devops kubernetes",
+    "marketing specialist",
+]
+
+
+async def load_test(embed, queries, concurrency):
+    """Embed queries with a fixed number of concurrent callers
+
+    Args:
+        embed: Coroutine function embedding one query
+        queries: Queries to embed
+        concurrency: Number of queries in flight at once
+
+    Returns:
+        Dictionary of throughput and latency percentiles
+    """
+    latencies = []
+    remaining = iter(queries)
+
+    async def worker():
+        for query in remaining:
+            start_time = time.perf_counter()
+            await embed(query)
+            latencies.append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start_time
+    return {
+        "throughput": len(queries) / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "p99_ms": float(np.percentile(latencies, 99)) * 1000,
+    }
+
+
+def run_benchmark(requests=2000, concurrency=200, batch_size=32, batch_wait=0.003):
+    """Compare per-query and batched embedding under concurrent load
+
+    Args:
+        requests: Number of queries embedded per mode
+        concurrency: Number of queries in flight at once
+        batch_size: Maximum number of queries per batch
+        batch_wait: Seconds a query waits for others to share its batch
+
+    Returns:
+        Metrics of each mode keyed by mode name
+    """
+    # Load the models outside of the timed runs
+    get_query_models()
+
+    async def per_query(query):
+        return await asyncio.to_thread(embed_query, query)
+
+    batcher = QueryEmbeddingBatcher(batch_size, batch_wait)
+    results = {}
+    for name, embed in (("per-query", per_query), ("batched", batcher.embed)):
+        embedding_cache.clear()
+        queries = [f"{TOPICS[i % len(TOPICS)]} {name} {i}" for i in range(requests)]
+        results[name] = asyncio.run(load_test(embed, queries, concurrency))
+        logger.info(
+            f"{name:<10} {results[name]['throughput']:>8.1f} queries/s "
+            f"p50 {results[name]['p50_ms']:>7.1f} ms "
+            f"p99 {results[name]['p99_ms']:>7.1f} ms"
+        )
+    logger.info(f"Batcher stats: {batcher.stats()}")
+    speedup = results["batched"]["throughput"] / results["per-query"]["throughput"]
+    logger.info(f"Batching embeds {speedup:.1f}x the queries per second")
+    return results
+
+
+def parse_args():
+    """Parse command line arguments of the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Queries embedded per mode"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=200, help="Queries in flight at once"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=32, help="Maximum queries per batch"
+    )
+    parser.add_argument(
+        "--batch-wait",
+        type=float,
+        default=0.003,
+        help="Seconds a query waits for others to share its batch",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_benchmark(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        batch_wait=args.batch_wait,
+    )
@@ -0,0 +1,93 @@
+"""Rule parser coverage and latency
+
+Parses the example queries of the LLM parsing prompt, and a few that
+need the LLM, with the rule parser. Reports which ones it answers with
+enough confidence to skip Gemini, and the parse latency.
+
+Usage:
+    python -m benchmarks.query_parsing [--repeat N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from common.logger import get_logger
+from search.config import SearchConfig
+from search.services.rule_parser import get_gazetteer, parse_query
+
+config = SearchConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+QUERIES = [
+    "Senior Python developer jobs in San Francisco",
+    "Looking for data scientist positions at Google",
+    "Entry level frontend developer with React experience",
+    "jobs in New York",
+    "software engineer in Bay Area",
+    "data analyst jobs in Asia",
+    "senior developer positions in Europe",
+    "data scientist jobs posted in last 30 days",
+    "recent python developer positions",
+    "jobs from last week",
+    "python jobs posted this year",
+    "senior engineer positions from last 6 months",
+    "senior python developer in London",
+    "marketing internship in Berlin",
+    "remote jobs except sales",
+    "something creative but not too stressful near the coast",
+]
+
+
+def run_benchmark(repeat=1000):
+    """Parse the sample queries with the rules and time them
+
+    Args:
+        repeat: Number of times each query is parsed for the timing
+
+    Returns:
+        Fraction of the queries parsed without the LLM
+    """
+    # Build the gazetteer outside of the timed parses
+    get_gazetteer()
+
+    accepted = 0
+    latencies = []
+    for query in QUERIES:
+        parsed = parse_query(query)
+        confident = parsed["confidence"] >= config.RULE_PARSER_MIN_CONFIDENCE
+        accepted += confident
+        logger.info(
+            f"{'rules' if confident else 'LLM':<5} {parsed['confidence']:.2f} "
+            f"{query!r} -> {parsed['semantic_query']!r} {parsed['filters']}"
+        )
+
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            parse_query(query)
+        latencies.append((time.perf_counter() - start_time) / repeat)
+
+    coverage = accepted / len(QUERIES)
+    logger.info(
+        f"Rule parser answered {accepted}/{len(QUERIES)} queries ({coverage:.0%}), "
+        f"p50 {np.percentile(latencies, 50) * 1e6:.0f} us "
+        f"p99 {np.percentile(latencies, 99) * 1e6:.0f} us per parse"
+    )
+    return coverage
+
+
+def parse_args():
+    """Parse command line arguments of the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--repeat", type=int, default=1000, help="Timed parses per query"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_benchmark(repeat=args.repeat)
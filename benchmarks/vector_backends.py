@@ -0,0 +1,180 @@
+"""Query latency of the in-process NumPy vector backend
+
+Builds a synthetic collection of random dense vectors, sparse vectors with
+Zipf distributed terms and job payloads, saves it the way ingestion does
+and memory-maps it back. The report gives p50/p99 latency of hybrid
+searches without filter, with a broad and a selective keyword filter and
+with a date range, and of batches of searches. Query vectors are built up
+front, so only the backend is timed.
+
+Usage:
+    python -m benchmarks.vector_backends [--points N] [--queries N]
+        [--top K] [--batch N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from qdrant_client import models
+
+from common.collection_profiles import DENSE_VECTOR_SIZE
+from common.logger import get_logger
+from common.payload_fields import (
+    COMPANY_FIELD,
+    LEVEL_FIELD,
+    LOCATION_FIELD,
+    PUBLISHED_FIELD,
+)
+from common.qdrant_config import QdrantConfig
+from search.services.vector_search import create_filter_object
+from vector_backend.numpy_index import NumpyCollection, NumpyIndex
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+LEVELS = ["entry level", "mid level", "senior level", "internship"]
+LOCATIONS = ["london", "berlin", "new york", "san francisco", "remote"]
+COMPANIES = 500
+CHUNKS_PER_JOB = 4
+VOCABULARY = 30000
+TERMS_PER_CHUNK = 60
+TERMS_PER_QUERY = 4
+
+FILTERS = {
+    "none": None,
+    "level": {"Level": "Senior Level"},
+    "company": {"company": "Company 7"},
+    "date_range": {"date_range": {"gte": "2024-06-01T00:00:00Z"}},
+}
+
+
+def random_sparse(rng, terms):
+    """Sparse vector of distinct Zipf distributed terms"""
+    indices = np.unique(rng.zipf(1.3, terms) % VOCABULARY).astype(np.int64)
+    return indices, rng.random(len(indices), dtype=np.float32)
+
+
+def build_collection(path, points, seed=0):
+    """Save a synthetic collection of job chunks
+
+    Args:
+        path: Collection directory
+        points: Number of chunks
+        seed: Seed of the random generator
+    """
+    rng = np.random.default_rng(seed)
+    collection = NumpyCollection(DENSE_VECTOR_SIZE)
+    dense = rng.standard_normal((points, DENSE_VECTOR_SIZE), dtype=np.float32)
+    start = np.datetime64("2024-01-01T00:00:00")
+    for i in range(points):
+        job = i // CHUNKS_PER_JOB
+        published = start + np.timedelta64(int(rng.integers(0, 365 * 86400)), "s")
+        payload = {
+            "chunk_id": f"job-{job}",
+            "chunk_index": i % CHUNKS_PER_JOB,
+            LEVEL_FIELD: LEVELS[job % len(LEVELS)],
+            COMPANY_FIELD: [f"company {job % COMPANIES}"],
+            LOCATION_FIELD: [LOCATIONS[job % len(LOCATIONS)]],
+            PUBLISHED_FIELD: f"{published}Z",
+        }
+        collection.upsert(
+            f"point-{i}", payload, dense[i], random_sparse(rng, TERMS_PER_CHUNK)
+        )
+    collection.save(path)
+
+
+def make_queries(count, seed=1):
+    """Dense and sparse vectors of random queries"""
+    rng = np.random.default_rng(seed)
+    queries = []
+    for _ in range(count):
+        indices, values = random_sparse(rng, TERMS_PER_QUERY)
+        sparse = models.SparseVector(indices=indices.tolist(), values=values.tolist())
+        dense = rng.standard_normal(DENSE_VECTOR_SIZE, dtype=np.float32).tolist()
+        queries.append((dense, sparse))
+    return queries
+
+
+def percentiles(timings):
+    """p50 and p99 of timings in seconds, as milliseconds"""
+    p50, p99 = np.percentile(timings, [50, 99]) * 1000
+    return p50, p99
+
+
+def run_benchmark(points=50000, queries=200, top=10, batch=16):
+    """Time hybrid searches of the NumPy backend
+
+    Args:
+        points: Number of chunks in the collection
+        queries: Number of queries per filter
+        top: Number of jobs per search
+        batch: Number of searches per batch
+
+    Returns:
+        (p50, p99) milliseconds keyed by filter name, and "batch" for the
+        per-search latency of batches
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "collection"
+        start_time = time.perf_counter()
+        build_collection(path, points)
+        logger.info(f"Built {points} points in {time.perf_counter() - start_time:.1f}s")
+        index = NumpyIndex(path)
+        index.warm()
+        query_vectors = make_queries(queries)
+
+        results = {}
+        for name, filter_dict in FILTERS.items():
+            filters = create_filter_object(filter_dict) if filter_dict else None
+            matching = index.count(filters) if filters else index.size
+            timings = []
+            for vectors in query_vectors:
+                start_time = time.perf_counter()
+                index.search(vectors, filters, top)
+                timings.append(time.perf_counter() - start_time)
+            results[name] = percentiles(timings)
+            logger.info(
+                f"{name:<11} {matching:>8} matching  "
+                f"p50 {results[name][0]:>7.3f} ms  p99 {results[name][1]:>7.3f} ms"
+            )
+
+        timings = []
+        for i in range(0, len(query_vectors) - batch + 1, batch):
+            searches = [
+                (vectors, None, top) for vectors in query_vectors[i : i + batch]
+            ]
+            start_time = time.perf_counter()
+            index.search_batch(searches)
+            timings.append((time.perf_counter() - start_time) / batch)
+        if timings:
+            results["batch"] = percentiles(timings)
+            logger.info(
+                f"{'batch':<11} {batch:>8} searches  "
+                f"p50 {results['batch'][0]:>7.3f} ms  "
+                f"p99 {results['batch'][1]:>7.3f} ms per search"
+            )
+    return results
+
+
+def parse_args():
+    """Parse command line arguments of the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=50000, help="Number of chunks")
+    parser.add_argument(
+        "--queries", type=int, default=200, help="Number of queries per filter"
+    )
+    parser.add_argument("--top", type=int, default=10, help="Jobs per search")
+    parser.add_argument("--batch", type=int, default=16, help="Searches per batch")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_benchmark(
+        points=args.points, queries=args.queries, top=args.top, batch=args.batch
+    )
@@ -1,5 +1,7 @@
 """Base configuration settings - Shared across all modules"""
 
+from pathlib import Path
+
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,6 +19,17 @@ class BaseConfig(BaseSettings):
         default="hybrid_search", description="Qdrant collection name"
     )
 
+    # Job document store, holding chunk texts and job details
+    DOCUMENT_STORE_PATH: str = Field(
+        default=str(
+            Path(__file__).parent.parent
+            / "data_ingestion"
+            / "artifacts"
+            / "documents.sqlite"
+        ),
+        description="Path of the SQLite job document store",
+    )
+
     # LLM settings (shared by search and query parsing)
     LLM_TEMPERATURE: float = Field(default=0.3, description="LLM temperature")
     LLM_MAX_TOKENS: int = Field(default=10000, description="LLM max token output")
@@ -0,0 +1,189 @@
+"""Named performance profiles for the Qdrant collection
+
+A profile picks the HNSW graph parameters, vector quantization, what is
+kept on disk rather than in RAM, and the search parameters that go with
+them. It is selected with COLLECTION_PROFILE when the collection is created,
+and search reads the same profile to rescore quantized results.
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+from qdrant_client import models
+
+from common.exception import ConfigurationError
+
+DENSE_VECTOR_SIZE = 384
+
+# Bytes per stored HNSW link, and links per point relative to m (level 0
+# keeps twice as many links as the upper levels)
+HNSW_LINK_BYTES = 4
+HNSW_LINKS_PER_M = 2
+
+
+class CollectionProfile(BaseModel):
+    """Storage, indexing and search settings of the collection"""
+
+    model_config = ConfigDict(frozen=True)
+
+    description: str
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_on_disk: bool = False
+    quantization: Literal["none", "scalar", "binary"] = "none"
+    vectors_on_disk: bool = False
+    payload_on_disk: bool = False
+    sparse_index_on_disk: bool = False
+    search_hnsw_ef: int | None = None
+    rescore: bool = True
+    oversampling: float | None = None
+
+    def vectors_config(self, size: int = DENSE_VECTOR_SIZE) -> dict:
+        return {
+            "dense": models.VectorParams(
+                distance=models.Distance.COSINE,
+                size=size,
+                on_disk=self.vectors_on_disk,
+            ),
+        }
+
+    def sparse_vectors_config(self) -> dict:
+        return {
+            "sparse": models.SparseVectorParams(
+                modifier=models.Modifier.IDF,
+                index=models.SparseIndexParams(on_disk=self.sparse_index_on_disk),
+            )
+        }
+
+    def hnsw_config(self) -> models.HnswConfigDiff:
+        return models.HnswConfigDiff(
+            m=self.hnsw_m,
+            ef_construct=self.hnsw_ef_construct,
+            on_disk=self.hnsw_on_disk,
+        )
+
+    def quantization_config(self) -> models.QuantizationConfig | None:
+        # Quantized vectors stay in RAM, the originals are only read to rescore
+        if self.quantization == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            )
+        if self.quantization == "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+        return None
+
+    def create_collection_kwargs(self, size: int = DENSE_VECTOR_SIZE) -> dict:
+        """Arguments of create_collection for this profile
+
+        Args:
+            size: Dense vector size
+
+        Returns:
+            Keyword arguments for QdrantClient.create_collection
+        """
+        return {
+            "vectors_config": self.vectors_config(size),
+            "sparse_vectors_config": self.sparse_vectors_config(),
+            "hnsw_config": self.hnsw_config(),
+            "quantization_config": self.quantization_config(),
+            "on_disk_payload": self.payload_on_disk,
+        }
+
+    def search_params(self) -> models.SearchParams | None:
+        """Dense search parameters, rescoring quantized candidates
+
+        Returns:
+            SearchParams for the dense query, None for server defaults
+        """
+        quantization = None
+        if self.quantization != "none":
+            quantization = models.QuantizationSearchParams(
+                rescore=self.rescore, oversampling=self.oversampling
+            )
+        if quantization is None and self.search_hnsw_ef is None:
+            return None
+        return models.SearchParams(
+            hnsw_ef=self.search_hnsw_ef, quantization=quantization
+        )
+
+    def estimate_memory_bytes(self, points: int, size: int = DENSE_VECTOR_SIZE) -> int:
+        """Estimate the RAM used by the dense vectors and their index
+
+        Sparse vectors and payloads are left out, they are the same for
+        every profile unless moved to disk.
+
+        Args:
+            points: Number of points in the collection
+            size: Dense vector size
+
+        Returns:
+            Approximate number of bytes kept in RAM
+        """
+        per_point = 0
+        if not self.vectors_on_disk:
+            per_point += size * 4
+        if self.quantization == "scalar":
+            per_point += size
+        elif self.quantization == "binary":
+            per_point += (size + 7) // 8
+        if not self.hnsw_on_disk:
+            per_point += self.hnsw_m * HNSW_LINKS_PER_M * HNSW_LINK_BYTES
+        return points * per_point
+
+
+PROFILES: dict[str, CollectionProfile] = {
+    "default": CollectionProfile(
+        description="Everything in RAM without quantization, Qdrant defaults",
+    ),
+    "low-latency": CollectionProfile(
+        description="Int8 quantized vectors and a denser graph, all in RAM",
+        hnsw_m=32,
+        hnsw_ef_construct=200,
+        quantization="scalar",
+        search_hnsw_ef=64,
+        oversampling=1.5,
+    ),
+    "balanced": CollectionProfile(
+        description="Int8 quantized vectors in RAM, originals and payload on disk",
+        hnsw_ef_construct=128,
+        quantization="scalar",
+        vectors_on_disk=True,
+        payload_on_disk=True,
+        search_hnsw_ef=128,
+        oversampling=2.0,
+    ),
+    "low-memory": CollectionProfile(
+        description="Binary quantized vectors in RAM, everything else on disk",
+        hnsw_on_disk=True,
+        quantization="binary",
+        vectors_on_disk=True,
+        payload_on_disk=True,
+        sparse_index_on_disk=True,
+        search_hnsw_ef=128,
+        oversampling=3.0,
+    ),
+}
+
+
+def get_profile(name: str) -> CollectionProfile:
+    """Look up a collection profile by name
+
+    Args:
+        name: Profile name
+
+    Returns:
+        The collection profile
+
+    Raises:
+        ConfigurationError: If no profile has this name
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ConfigurationError(
+            f"Unknown collection profile '{name}', expected one of {list(PROFILES)}"
+        ) from None
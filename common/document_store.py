@@ -0,0 +1,487 @@
+"""Local job document store backing slim Qdrant payloads
+
+Qdrant points only carry ids and the fields used for filtering. Chunk texts
+and job details live in a SQLite file built during ingestion, keyed by job
+id and chunk index, and are looked up for the few results left after
+ranking.
+
+Each collection version has its own store, so building a new version never
+changes the texts the live version returns. A small pointer file names the
+version whose store search reads, and is switched together with the
+collection alias.
+"""
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from common.base_config import BaseConfig
+from common.logger import get_logger
+from common.payload_fields import canonical_fields
+
+config = BaseConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    job_title TEXT,
+    company TEXT,
+    category TEXT,
+    location TEXT,
+    Level TEXT,
+    publication_date TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chunks (
+    job_id TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (job_id, chunk_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chunkless_jobs (
+    job_id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+# Meta key of the version the setup script writes after each ingestion
+INGESTION_VERSION_KEY = "ingestion_version"
+
+# Job fields stored once per job rather than on every chunk
+JOB_FIELDS = [
+    "job_title",
+    "company",
+    "category",
+    "location",
+    "Level",
+    "publication_date",
+]
+
+# Payload fields kept in Qdrant for incremental updates, next to the
+# canonical filter fields
+PAYLOAD_FIELDS = ["chunk_id", "chunk_index", "content_hash"]
+
+# SQLite limits the number of parameters of a single statement
+LOOKUP_BATCH_SIZE = 400
+
+# Files SQLite keeps next to a store in WAL mode
+SIDE_FILES = ["-wal", "-shm"]
+
+
+def _text_or_none(value):
+    """Store missing values (None or NaN) as NULL"""
+    if value is None or value != value:
+        return None
+    return str(value)
+
+
+class DocumentStore:
+    """SQLite store of chunk texts and job details
+
+    Search opens it read-only, each thread with its own connection.
+    Ingestion opens it writable to add and delete jobs.
+
+    Args:
+        path: SQLite file, defaults to DOCUMENT_STORE_PATH
+        writable: Open the store for writing, creating it if needed
+    """
+
+    def __init__(self, path: str | Path | None = None, writable: bool = False):
+        self.path = Path(path or config.DOCUMENT_STORE_PATH)
+        self.writable = writable
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if self.writable:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(self.path)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(SCHEMA)
+            else:
+                connection = sqlite3.connect(f"{self.path.as_uri()}?mode=ro", uri=True)
+            self._local.connection = connection
+        return connection
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def add_chunks(self, chunks: Iterable[dict]) -> None:
+        """Store the text of chunks and the details of their jobs
+
+        A job whose first chunk is added loses its previously stored
+        chunks, so a job that now has fewer chunks keeps no stale ones, and
+        stops being recorded as chunkless.
+
+        Args:
+            chunks: Chunks with text and metadata
+        """
+        job_rows = {}
+        chunk_rows = []
+        replaced_job_ids = []
+        for chunk in chunks:
+            metadata = chunk["metadata"]
+            job_id = str(metadata["chunk_id"])
+            if metadata["chunk_index"] == 0:
+                replaced_job_ids.append((job_id,))
+                job_rows[job_id] = (
+                    job_id,
+                    *(_text_or_none(metadata.get(field)) for field in JOB_FIELDS),
+                )
+            chunk_rows.append((job_id, metadata["chunk_index"], chunk["text"]))
+
+        with self.connection as connection:
+            connection.executemany(
+                "DELETE FROM chunks WHERE job_id = ?", replaced_job_ids
+            )
+            connection.executemany(
+                "DELETE FROM chunkless_jobs WHERE job_id = ?", replaced_job_ids
+            )
+            connection.executemany(
+                f"INSERT OR REPLACE INTO jobs VALUES ({','.join('?' * (len(JOB_FIELDS) + 1))})",
+                job_rows.values(),
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?)", chunk_rows
+            )
+
+    def delete_jobs(self, job_ids: Iterable[str]) -> None:
+        """Delete jobs and all of their chunks
+
+        Args:
+            job_ids: Ids of the jobs to delete
+        """
+        rows = [(str(job_id),) for job_id in job_ids]
+        with self.connection as connection:
+            connection.executemany("DELETE FROM chunks WHERE job_id = ?", rows)
+            connection.executemany("DELETE FROM jobs WHERE job_id = ?", rows)
+            connection.executemany("DELETE FROM chunkless_jobs WHERE job_id = ?", rows)
+
+    def add_chunkless_jobs(self, content_hashes: dict[str, str]) -> None:
+        """Record the content hash of jobs whose description has no chunks
+
+        Such jobs have no point in the vector database to carry their hash,
+        so the next incremental run reads it from here instead of cleaning
+        and chunking them again. Chunks stored for them before are deleted.
+
+        Args:
+            content_hashes: Content hash of each chunkless job, keyed by job id
+        """
+        rows = [(str(job_id),) for job_id in content_hashes]
+        with self.connection as connection:
+            connection.executemany("DELETE FROM chunks WHERE job_id = ?", rows)
+            connection.executemany("DELETE FROM jobs WHERE job_id = ?", rows)
+            connection.executemany(
+                "INSERT OR REPLACE INTO chunkless_jobs VALUES (?, ?)",
+                [(str(job_id), value) for job_id, value in content_hashes.items()],
+            )
+
+    def chunkless_job_hashes(self) -> dict[str, str]:
+        """Content hash of every job recorded as chunkless
+
+        Returns:
+            Content hashes keyed by job id, empty if the store is missing
+        """
+        if not self.exists():
+            return {}
+        # Stores built before the chunkless_jobs table existed have none
+        try:
+            return dict(
+                self.connection.execute(
+                    "SELECT job_id, content_hash FROM chunkless_jobs"
+                )
+            )
+        except sqlite3.OperationalError:
+            return {}
+
+    def copy_to(self, target: "DocumentStore") -> None:
+        """Copy every job and chunk into another store
+
+        Args:
+            target: Writable store, replaced by the copy
+        """
+        self.connection.backup(target.connection)
+
+    def job_ids(self) -> list[str]:
+        """List the ids of every stored job"""
+        return [row[0] for row in self.connection.execute("SELECT job_id FROM jobs")]
+
+    def distinct_job_values(self, field: str) -> list[str]:
+        """List the distinct values of a job field
+
+        Args:
+            field: One of JOB_FIELDS
+
+        Returns:
+            Distinct non-null values of the field
+        """
+        if field not in JOB_FIELDS:
+            raise ValueError(f"Unknown job field {field}, expected one of {JOB_FIELDS}")
+        return [
+            row[0]
+            for row in self.connection.execute(
+                f"SELECT DISTINCT {field} FROM jobs WHERE {field} IS NOT NULL"
+            )
+        ]
+
+    def ingestion_version(self) -> str | None:
+        """Version written by the last completed ingestion
+
+        Returns:
+            The version, None if no ingestion recorded one
+        """
+        # Stores built before the meta table existed have no version
+        try:
+            row = self.connection.execute(
+                "SELECT value FROM meta WHERE key = ?", (INGESTION_VERSION_KEY,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row else None
+
+    def set_ingestion_version(self, version: str) -> None:
+        """Record the version of a completed ingestion
+
+        Args:
+            version: New version, different from every previous one
+        """
+        with self.connection as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                (INGESTION_VERSION_KEY, version),
+            )
+
+    def get_chunk_texts(
+        self, keys: list[tuple[str, int]]
+    ) -> dict[tuple[str, int], str]:
+        """Look up the text of chunks
+
+        Args:
+            keys: (job id, chunk index) of each chunk
+
+        Returns:
+            Chunk texts keyed by (job id, chunk index), missing chunks left out
+        """
+        texts = {}
+        for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+            batch = keys[start : start + LOOKUP_BATCH_SIZE]
+            conditions = " OR ".join(["(job_id = ? AND chunk_index = ?)"] * len(batch))
+            parameters = [value for key in batch for value in key]
+            for job_id, chunk_index, text in self.connection.execute(
+                f"SELECT job_id, chunk_index, text FROM chunks WHERE {conditions}",
+                parameters,
+            ):
+                texts[(job_id, chunk_index)] = text
+        return texts
+
+    def get_jobs(self, job_ids: list[str]) -> dict[str, dict]:
+        """Look up the details of jobs
+
+        Args:
+            job_ids: Ids of the jobs
+
+        Returns:
+            Job details keyed by job id, missing jobs left out
+        """
+        jobs = {}
+        for start in range(0, len(job_ids), LOOKUP_BATCH_SIZE):
+            batch = job_ids[start : start + LOOKUP_BATCH_SIZE]
+            for row in self.connection.execute(
+                f"SELECT job_id, {', '.join(JOB_FIELDS)} FROM jobs "
+                f"WHERE job_id IN ({','.join('?' * len(batch))})",
+                batch,
+            ):
+                jobs[row[0]] = dict(zip(JOB_FIELDS, row[1:]))
+        return jobs
+
+
+def slim_payload(chunk: dict) -> dict:
+    """Build the Qdrant payload of a chunk, without text or job details
+
+    Args:
+        chunk: Chunk with text and metadata
+
+    Returns:
+        Payload with ids and canonical filter fields only
+    """
+    metadata = chunk["metadata"]
+    return {
+        **{field: metadata.get(field) for field in PAYLOAD_FIELDS},
+        **canonical_fields(metadata),
+    }
+
+
+def hydrate_payloads(points: list, store: DocumentStore | None = None) -> list:
+    """Fill in the chunk text and job details of ranked points
+
+    Points are updated in place with one lookup per table. Points that
+    already have their text are left alone, so calling this again on the
+    same points costs nothing, and payloads from collections built before
+    the document store existed still work.
+
+    Args:
+        points: Scored points with slim payloads
+        store: Document store to read from, defaults to the live store
+
+    Returns:
+        The same points
+    """
+    pending = [point for point in points if "text" not in point.payload]
+    if not pending:
+        return points
+
+    store = store or get_document_store()
+    if not store.exists():
+        logger.warning(f"Document store not found at {store.path}, skipping hydration")
+        return points
+
+    keys = [
+        (str(point.payload.get("chunk_id")), point.payload.get("chunk_index", 0))
+        for point in pending
+    ]
+    # Principle 2: A failed lookup degrades results instead of failing search
+    try:
+        texts = store.get_chunk_texts(keys)
+        jobs = store.get_jobs(list({job_id for job_id, _ in keys}))
+    except sqlite3.Error as e:
+        logger.error(f"Document store lookup failed: {e}")
+        return points
+
+    for point, key in zip(pending, keys):
+        payload = point.payload
+        for field, value in jobs.get(key[0], {}).items():
+            if value is not None:
+                payload.setdefault(field, value)
+        payload["text"] = texts.get(key, "")
+    return points
+
+
+def store_version(store: DocumentStore):
+    """Path and modification times of the store files, None if it is missing
+
+    Changes whenever the store is written, or search switches to another
+    store, for the cost of a few stats.
+    """
+    if not store.exists():
+        return None
+    wal_path = store.path.with_name(f"{store.path.name}-wal")
+    return (
+        store.path,
+        store.path.stat().st_mtime_ns,
+        wal_path.stat().st_mtime_ns if wal_path.exists() else None,
+    )
+
+
+def version_store_path(collection: str) -> Path:
+    """Path of the document store of a collection version
+
+    Args:
+        collection: Name of the collection version
+
+    Returns:
+        SQLite file next to DOCUMENT_STORE_PATH, named after the version
+    """
+    path = Path(config.DOCUMENT_STORE_PATH)
+    return path.with_name(f"{path.stem}_{collection}{path.suffix}")
+
+
+def live_pointer_path() -> Path:
+    """Path of the file naming the collection version search reads"""
+    path = Path(config.DOCUMENT_STORE_PATH)
+    return path.with_name(f"{path.name}.live")
+
+
+def live_store_collection() -> str | None:
+    """Name of the collection version whose document store search reads
+
+    Returns:
+        Collection the pointer names, None for stores built before
+        collection versions had their own
+    """
+    try:
+        return live_pointer_path().read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def live_store_path() -> Path:
+    """Path of the document store of the live collection version
+
+    Returns:
+        Store of the version the pointer names, DOCUMENT_STORE_PATH for
+        stores built before collection versions had their own
+    """
+    collection = live_store_collection()
+    return (
+        version_store_path(collection)
+        if collection
+        else Path(config.DOCUMENT_STORE_PATH)
+    )
+
+
+def switch_live_store(collection: str | None) -> None:
+    """Point search at the document store of a collection version
+
+    Args:
+        collection: Name of the collection version, None for the store at
+            DOCUMENT_STORE_PATH
+    """
+    pointer = live_pointer_path()
+    if collection is None:
+        pointer.unlink(missing_ok=True)
+        logger.info(f"Search now reads the document store {config.DOCUMENT_STORE_PATH}")
+        return
+    staging = pointer.with_name(f"{pointer.name}.tmp")
+    staging.write_text(collection)
+    os.replace(staging, pointer)
+    logger.info(f"Search now reads the document store of {collection}")
+
+
+def delete_version_store(collection: str) -> None:
+    """Delete the document store of a deleted collection version
+
+    Args:
+        collection: Name of the collection version
+    """
+    path = version_store_path(collection)
+    for suffix in ["", *SIDE_FILES]:
+        path.with_name(f"{path.name}{suffix}").unlink(missing_ok=True)
+    logger.info(f"Deleted document store {path}")
+
+
+_document_store: DocumentStore | None = None
+_pointer_version = None
+_lock = threading.Lock()
+
+
+def get_document_store() -> DocumentStore:
+    """Get the read-only document store of the live collection version
+
+    The pointer file is only read again when its modification time
+    changes, so most calls cost a single stat.
+
+    Returns:
+        DocumentStore of the live collection version
+    """
+    global _document_store, _pointer_version
+    try:
+        stat = live_pointer_path().stat()
+        version = (stat.st_ino, stat.st_mtime_ns)
+    except FileNotFoundError:
+        version = None
+    if _document_store is None or version != _pointer_version:
+        with _lock:
+            if _document_store is None or version != _pointer_version:
+                _document_store = DocumentStore(live_store_path())
+                _pointer_version = version
+    return _document_store
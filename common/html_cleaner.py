@@ -0,0 +1,290 @@
+"""High-throughput HTML cleaning for job descriptions
+
+Reproduces the visible text that ``BeautifulSoup(...).get_text(" ")``
+returns without building a parse tree. Well-formed markup is split into
+tags and text with a single regular expression. Anything else goes
+through the standard library tokenizer, and markup that neither handles
+the way BeautifulSoup does falls back to BeautifulSoup itself.
+"""
+
+import html
+import multiprocessing
+import os
+import re
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from html.entities import html5
+from html.parser import HTMLParser
+
+from common.utils import remove_html_tags
+
+# Tags whose strings BeautifulSoup leaves out of get_text()
+SKIPPED_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+# Tags inside which BeautifulSoup keeps whitespace-only strings as they are
+PRESERVE_WHITESPACE_TAGS = frozenset({"pre", "textarea"})
+
+# Void elements, which BeautifulSoup closes as soon as they are opened
+VOID_TAGS = frozenset(
+    {
+        "area", "base", "basefont", "bgsound", "br", "col", "command", "embed",
+        "frame", "hr", "image", "img", "input", "isindex", "keygen", "link",
+        "menuitem", "meta", "nextid", "param", "source", "spacer", "track", "wbr",
+    }
+)  # fmt: skip
+
+# Whitespace that BeautifulSoup collapses in whitespace-only strings
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+# Named references are decoded differently by BeautifulSoup unless they are
+# known entities terminated by a semicolon
+NAMED_REFERENCE = re.compile(r"&([a-zA-Z][a-zA-Z0-9]*)(;?)")
+
+# Tags and comments recognized by the regular expression fast path
+TOKEN = re.compile(
+    r"<(/?)([a-zA-Z][^\t\n\r\f />\x00<]*)([^<>]*)>|<!--.*?--\s*>", re.DOTALL
+)
+
+# Raw text elements, whose content the fast path cannot tokenize
+RAW_TEXT_TAG = re.compile(r"<(?:script|style)", re.IGNORECASE)
+
+# Descriptions are sent to workers in chunks to amortize pickling overhead
+WORKER_CHUNKSIZE = 64
+
+
+class _TagStack:
+    """Tracks open tags the way BeautifulSoup nests them
+
+    An end tag closes the most recent open tag of that name along with
+    everything opened after it, and is ignored if no such tag is open.
+    """
+
+    def __init__(self):
+        self.open_tags: list[str] = []
+        self.skip_depth = 0
+        self.preserve_depth = 0
+
+    def start(self, tag: str) -> None:
+        if tag in VOID_TAGS:
+            return
+        self.open_tags.append(tag)
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif tag in PRESERVE_WHITESPACE_TAGS:
+            self.preserve_depth += 1
+
+    def end(self, tag: str) -> None:
+        if tag not in self.open_tags:
+            return
+        while True:
+            closed = self.open_tags.pop()
+            if closed in SKIPPED_TAGS:
+                self.skip_depth -= 1
+            elif closed in PRESERVE_WHITESPACE_TAGS:
+                self.preserve_depth -= 1
+            if closed == tag:
+                return
+
+
+def _visible_string(data: str, preserve_whitespace: bool) -> str:
+    """Collapse a whitespace-only string the way BeautifulSoup does"""
+    if not preserve_whitespace and not data.strip(ASCII_SPACES):
+        return "\n" if "\n" in data else " "
+    return data
+
+
+class _VisibleTextParser(HTMLParser):
+    """Collects visible strings the same way BeautifulSoup splits them"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.strings: list[str] = []
+        self._pending: list[str] = []
+        self._tags = _TagStack()
+
+    def _end_data(self, always_visible: bool = False) -> None:
+        """Close the current string, as BeautifulSoup does at every tag"""
+        if not self._pending:
+            return
+        data = "".join(self._pending)
+        self._pending = []
+        if always_visible or not self._tags.skip_depth:
+            self.strings.append(_visible_string(data, self._tags.preserve_depth > 0))
+
+    def handle_starttag(self, tag, attrs):
+        self._end_data()
+        self._tags.start(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._end_data()
+
+    def handle_endtag(self, tag):
+        self._end_data()
+        self._tags.end(tag)
+
+    def handle_data(self, data):
+        self._pending.append(data)
+
+    def handle_comment(self, data):
+        self._end_data()
+
+    def handle_decl(self, decl):
+        self._end_data()
+
+    def handle_pi(self, data):
+        self._end_data()
+
+    def unknown_decl(self, data):
+        self._end_data()
+        if data.upper().startswith("CDATA["):
+            # CDATA sections stay visible even inside skipped tags
+            self._pending.append(data[len("CDATA[") :])
+            self._end_data(always_visible=True)
+
+    def close(self):
+        super().close()
+        self._end_data()
+
+
+def _split_well_formed(description: str) -> list[str] | None:
+    """Extract visible strings from well-formed markup with a regex
+
+    Args:
+        description: HTML text without raw text elements
+
+    Returns:
+        Visible strings, or None if the markup is not simple enough
+    """
+    strings = []
+    tags = _TagStack()
+    position = 0
+    for match in TOKEN.finditer(description):
+        data = description[position : match.start()]
+        position = match.end()
+        if data:
+            if "<" in data:
+                return None
+            if not tags.skip_depth:
+                if "&" in data:
+                    data = html.unescape(data)
+                strings.append(_visible_string(data, tags.preserve_depth > 0))
+
+        closing, tag, attributes = match.groups()
+        if tag is None:
+            continue
+        # A quote left open means an attribute value contains ">"
+        if attributes.count('"') % 2 or attributes.count("'") % 2:
+            return None
+
+        tag = tag.lower()
+        if closing:
+            tags.end(tag)
+        elif not attributes.endswith("/"):
+            tags.start(tag)
+
+    data = description[position:]
+    if data:
+        if "<" in data:
+            return None
+        if not tags.skip_depth:
+            if "&" in data:
+                data = html.unescape(data)
+            strings.append(_visible_string(data, tags.preserve_depth > 0))
+    return strings
+
+
+def _has_ambiguous_references(description: str) -> bool:
+    """Check for named references that the fast path would decode differently
+
+    Args:
+        description: HTML text to check
+
+    Returns:
+        True if BeautifulSoup should be used to clean the text
+    """
+    for match in NAMED_REFERENCE.finditer(description):
+        name, semicolon = match.groups()
+        if not semicolon or f"{name};" not in html5:
+            return True
+    return False
+
+
+def clean_html(description: str) -> str:
+    """Remove HTML tags from text without building a parse tree
+
+    Args:
+        description: HTML text to clean
+
+    Returns:
+        Cleaned text without HTML tags, identical to remove_html_tags
+    """
+    if not isinstance(description, str):
+        return remove_html_tags(description)
+
+    # Plain text needs no parsing, unless it is whitespace only, which
+    # BeautifulSoup collapses to a single separator
+    if "<" not in description and "&" not in description:
+        if description.strip(ASCII_SPACES) or not description:
+            return description
+
+    if "&" in description and _has_ambiguous_references(description):
+        return remove_html_tags(description)
+
+    # A tag left open at the end is kept as raw, undecoded text
+    if description.rfind("<") > description.rfind(">"):
+        return remove_html_tags(description)
+
+    if not RAW_TEXT_TAG.search(description):
+        strings = _split_well_formed(description)
+        if strings is not None:
+            return " ".join(strings)
+
+    try:
+        parser = _VisibleTextParser()
+        parser.feed(description)
+        parser.close()
+    except Exception:
+        return remove_html_tags(description)
+    return " ".join(parser.strings)
+
+
+class HtmlCleaner:
+    """Cleans batches of descriptions across a pool of worker processes
+
+    With a single worker descriptions are cleaned in the current process.
+
+    Args:
+        workers: Number of worker processes, 0 or None uses all CPU cores
+    """
+
+    def __init__(self, workers: int | None = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "HtmlCleaner":
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def clean(self, descriptions: Sequence[str]) -> list[str]:
+        """Clean a batch of descriptions, preserving their order
+
+        Args:
+            descriptions: HTML descriptions to clean
+
+        Returns:
+            Cleaned descriptions
+        """
+        if self._executor is None or len(descriptions) <= WORKER_CHUNKSIZE:
+            return [clean_html(description) for description in descriptions]
+        return list(
+            self._executor.map(clean_html, descriptions, chunksize=WORKER_CHUNKSIZE)
+        )
@@ -0,0 +1,216 @@
+"""Canonical payload fields used to filter jobs
+
+Job level, category, company and location are stored in Qdrant as
+normalized keyword values, and the publication date as an RFC 3339 UTC
+timestamp. Ingestion and query parsing normalize values with the same
+functions, so a filter is an exact keyword match resolved from the payload
+index rather than a full-text phrase match. Filters built on these
+fields serialize to a canonical key shared by the search caches.
+"""
+
+import json
+import re
+from datetime import UTC, datetime
+
+from qdrant_client import models
+
+# Bump when normalization changes, so every job is uploaded again
+NORMALIZATION_VERSION = 1
+
+LEVEL_FIELD = "level_key"
+CATEGORY_FIELD = "category_key"
+COMPANY_FIELD = "company_key"
+LOCATION_FIELD = "location_key"
+PUBLISHED_FIELD = "published_at"
+
+# Parsed query filters mapped to the canonical field they match on
+FILTER_FIELDS = {
+    "Level": LEVEL_FIELD,
+    "category": CATEGORY_FIELD,
+    "company": COMPANY_FIELD,
+    "location": LOCATION_FIELD,
+}
+
+# First word of a job level mapped to its canonical value
+LEVEL_ALIASES = {
+    "senior": "senior level",
+    "sr": "senior level",
+    "mid": "mid level",
+    "middle": "mid level",
+    "intermediate": "mid level",
+    "entry": "entry level",
+    "junior": "entry level",
+    "jr": "entry level",
+    "graduate": "entry level",
+    "intern": "internship",
+    "internship": "internship",
+}
+
+# Legal suffixes dropped from company names, "Google LLC" matches "Google"
+COMPANY_SUFFIXES = {
+    "co",
+    "company",
+    "corp",
+    "corporation",
+    "gmbh",
+    "inc",
+    "incorporated",
+    "limited",
+    "llc",
+    "ltd",
+    "plc",
+}
+
+# Date formats tried when a publication date is not ISO 8601, which is what
+# the job CSV uses. Numeric dates such as 04/05/2025 read as April 5th in
+# the US and May 4th elsewhere, so they are not parsed: only formats naming
+# the month are
+DATE_FORMATS = ["%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y"]
+
+
+def normalize_keyword(value) -> str | None:
+    """Casefold a value and collapse its whitespace
+
+    Args:
+        value: Raw value, missing values (None or NaN) are allowed
+
+    Returns:
+        Canonical keyword, or None if the value is missing or blank
+    """
+    if value is None or value != value:
+        return None
+    keyword = " ".join(str(value).split()).casefold()
+    return keyword or None
+
+
+def normalize_level(value) -> str | None:
+    """Map a job level such as "Senior" or "Mid-Level" to its canonical value"""
+    keyword = normalize_keyword(value)
+    if keyword is None:
+        return None
+    words = re.findall(r"[^\W_]+", keyword)
+    return LEVEL_ALIASES.get(words[0], keyword) if words else keyword
+
+
+def normalize_company(value) -> str | None:
+    """Normalize a company name and drop its legal suffix"""
+    keyword = normalize_keyword(value)
+    if keyword is None:
+        return None
+    words = re.findall(r"[^\W_]+(?:[&'][^\W_]+)*", keyword)
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words) or keyword
+
+
+def company_keywords(value) -> list[str]:
+    """Keywords a company matches on: every leading run of its name words
+
+    "Leapfrog Technology Inc." gives ["leapfrog", "leapfrog technology"], so
+    a filter on "Leapfrog" still matches, as the phrase match used to.
+    """
+    company = normalize_company(value)
+    if company is None:
+        return []
+    words = company.split()
+    return [" ".join(words[: i + 1]) for i in range(len(words))]
+
+
+def location_keywords(value) -> list[str]:
+    """Keywords a location matches on: the whole location and each part
+
+    "San Francisco, CA" gives ["san francisco, ca", "san francisco", "ca"].
+    """
+    location = normalize_keyword(value)
+    if location is None:
+        return []
+    parts = [part.strip() for part in location.split(",")]
+    return list(dict.fromkeys([location, *(part for part in parts if part)]))
+
+
+def parse_timestamp(value) -> str | None:
+    """Parse a publication date into an RFC 3339 UTC timestamp
+
+    Args:
+        value: Raw date, ISO 8601 or one of DATE_FORMATS
+
+    Returns:
+        Timestamp such as "2025-04-06T10:00:00Z", or None if unparseable or
+        ambiguous
+    """
+    if normalize_keyword(value) is None:
+        return None
+    text = str(value).strip()
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        for date_format in DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(text, date_format)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def canonical_fields(metadata: dict) -> dict:
+    """Build the canonical filter fields of a chunk
+
+    Args:
+        metadata: Chunk metadata with raw job fields
+
+    Returns:
+        Payload fields holding normalized keywords and the parsed timestamp
+    """
+    return {
+        LEVEL_FIELD: normalize_level(metadata.get("Level")),
+        CATEGORY_FIELD: normalize_keyword(metadata.get("category")),
+        COMPANY_FIELD: company_keywords(metadata.get("company")),
+        LOCATION_FIELD: location_keywords(metadata.get("location")),
+        PUBLISHED_FIELD: parse_timestamp(metadata.get("publication_date")),
+    }
+
+
+def normalize_filter_value(name: str, value) -> list[str]:
+    """Normalize a parsed filter value the way ingestion normalized the field
+
+    Args:
+        name: Parsed filter name, a key of FILTER_FIELDS
+        value: Filter value or list of alternative values
+
+    Returns:
+        Canonical values to match, empty if none are usable
+    """
+    normalize = {"Level": normalize_level, "company": normalize_company}.get(
+        name, normalize_keyword
+    )
+    values = value if isinstance(value, list | tuple | set) else [value]
+    return list(
+        dict.fromkeys(
+            keyword for keyword in map(normalize, values) if keyword is not None
+        )
+    )
+
+
+def canonical_filter(filters: models.Filter | None) -> str:
+    """Serialize a filter independently of the order of its conditions
+
+    Args:
+        filters: Qdrant filter, or None
+
+    Returns:
+        JSON string equal for equivalent filters
+    """
+    if filters is None:
+        return ""
+    clauses = filters.model_dump(mode="json", exclude_none=True)
+    for clause, conditions in clauses.items():
+        if isinstance(conditions, list):
+            clauses[clause] = sorted(
+                conditions, key=lambda condition: json.dumps(condition, sort_keys=True)
+            )
+    return json.dumps(clauses, sort_keys=True)
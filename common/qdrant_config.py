@@ -1,5 +1,7 @@
 """Qdrant-specific configuration"""
 
+from pathlib import Path
+
 from pydantic import Field
 
 from common.base_config import BaseConfig
@@ -16,3 +18,143 @@ class QdrantConfig(BaseConfig):
         default="sentence-transformers/all-MiniLM-L6-v2",
         description="Model for dense search",
     )
+
+    # vector backend storing the chunks, used by ingestion and search
+    VECTOR_BACKEND: str = Field(
+        default="qdrant",
+        description="Vector backend: qdrant, or numpy for the in-process engine",
+    )
+    NUMPY_INDEX_DIR: str = Field(
+        default=str(
+            Path(__file__).parent.parent
+            / "data_ingestion"
+            / "artifacts"
+            / "vector_index"
+        ),
+        description="Directory of the collections of the numpy vector backend",
+    )
+    NUMPY_FLUSH_POINTS: int = Field(
+        default=20000,
+        description="Points uploaded to a numpy collection between two saves",
+    )
+
+    # client connection pool, shared by every request of a process
+    QDRANT_TIMEOUT: int = Field(
+        default=10, description="Timeout of a Qdrant request in seconds"
+    )
+    QDRANT_POOL_SIZE: int = Field(
+        default=32, description="Maximum number of pooled HTTP connections to Qdrant"
+    )
+    QDRANT_KEEPALIVE_EXPIRY: float = Field(
+        default=30.0, description="Seconds an idle pooled connection is kept open"
+    )
+    QDRANT_CHECK_COMPATIBILITY: bool = Field(
+        default=False,
+        description="Check the server version when connecting, one extra request",
+    )
+
+    # collection storage and indexing profile, applied when it is created
+    COLLECTION_PROFILE: str = Field(
+        default="default",
+        description="Collection profile: default, low-latency, balanced or low-memory",
+    )
+
+    # blue/green re-indexing, search queries COLLECTION_NAME as an alias
+    COLLECTION_VERSIONS_KEPT: int = Field(
+        default=2,
+        description="Collection versions kept, including the live one, for rollback",
+    )
+    INDEXING_TIMEOUT: float = Field(
+        default=1800.0,
+        description="Seconds to wait for a new collection to finish indexing",
+    )
+    WARMUP_QUERIES: int = Field(
+        default=50,
+        description="Queries run against a new collection before switching to it",
+    )
+
+    # query embeddings cached by the search API
+    QUERY_EMBEDDING_CACHE_SIZE: int = Field(
+        default=4096, description="Maximum number of cached query embeddings"
+    )
+    QUERY_EMBEDDING_WARMUP_PATH: str = Field(
+        default="",
+        description="File of frequent queries, one per line, embedded at startup",
+    )
+
+    QUERY_EMBEDDING_BATCH_SIZE: int = Field(
+        default=32,
+        description="Maximum number of concurrent queries embedded in one batch",
+    )
+    QUERY_EMBEDDING_BATCH_WAIT: float = Field(
+        default=0.003,
+        description="Seconds a query waits for others to share its batch, 0 disables batching",
+    )
+
+    # depth of the sparse and dense prefetch of the hybrid query
+    PREFETCH_MIN_LIMIT: int = Field(
+        default=20, description="Minimum number of candidates of each prefetch"
+    )
+    PREFETCH_MAX_LIMIT: int = Field(
+        default=200, description="Maximum number of candidates of each prefetch"
+    )
+    PREFETCH_DEPTH_FACTOR: int = Field(
+        default=3,
+        description="Candidates of each prefetch per requested job, jobs span several chunks",
+    )
+    GROUPED_PREFETCH_MAX_LIMIT: int = Field(
+        default=5000,
+        description="Maximum prefetch depth of grouped searches retried for missing jobs",
+    )
+    PREFETCH_EXACT_THRESHOLD: int = Field(
+        default=1000,
+        description="Filtered dense prefetches matching fewer points search exhaustively",
+    )
+    FILTER_COUNT_CACHE_SIZE: int = Field(
+        default=1024, description="Maximum number of cached filter match counts"
+    )
+    FILTER_COUNT_CACHE_TTL: float = Field(
+        default=300.0, description="Seconds a filter match count stays cached"
+    )
+
+    # client-side embedding settings
+    EMBEDDING_BATCH_SIZE: int = Field(
+        default=256, description="Number of chunks embedded per batch"
+    )
+    EMBEDDING_WORKERS: int = Field(
+        default=0,
+        description="Number of embedding worker processes, 0 uses all CPU cores",
+    )
+
+    # on-disk embedding cache, reused across ingestion runs
+    EMBEDDING_CACHE_DIR: str = Field(
+        default=str(
+            Path(__file__).parent.parent
+            / "data_ingestion"
+            / "artifacts"
+            / "embedding_cache"
+        ),
+        description="Directory of the embedding cache, empty disables it",
+    )
+    EMBEDDING_CACHE_MAX_ROWS: int = Field(
+        default=500_000, description="Maximum number of cached chunk embeddings"
+    )
+
+    # upload settings
+    UPLOAD_WORKERS: int = Field(
+        default=4, description="Number of upload batches in flight"
+    )
+    UPLOAD_MAX_BATCH_BYTES: int = Field(
+        default=4 * 1024 * 1024,
+        description="Estimated request size at which an upload batch is closed",
+    )
+    UPLOAD_MAX_BATCH_POINTS: int = Field(
+        default=512, description="Maximum number of points per upload batch"
+    )
+    UPLOAD_MAX_RETRIES: int = Field(
+        default=5, description="Number of retries of a failed upload batch"
+    )
+    UPLOAD_RETRY_BACKOFF: float = Field(
+        default=1.0,
+        description="Delay before the first upload retry in seconds, doubled after",
+    )
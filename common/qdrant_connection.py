@@ -0,0 +1,90 @@
+"""Lazily created, pooled Qdrant clients
+
+Importing this module does not connect to anything. The sync and async
+clients are created on first use and shared by the whole process, each
+with a keep-alive HTTP connection pool, so requests reuse connections
+instead of opening one per call.
+"""
+
+import threading
+
+import httpx
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+from common.logger import get_logger
+from common.qdrant_config import QdrantConfig
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+_client: QdrantClient | None = None
+_async_client: AsyncQdrantClient | None = None
+_lock = threading.Lock()
+
+
+def client_options() -> dict:
+    """Connection options shared by the sync and async clients
+
+    The local in-memory mode ignores the HTTP options.
+
+    Returns:
+        Keyword arguments for QdrantClient and AsyncQdrantClient
+    """
+    return {
+        "location": config.QDRANT_LOCATION,
+        "api_key": config.QDRANT_API_KEY,
+        "timeout": config.QDRANT_TIMEOUT,
+        "check_compatibility": config.QDRANT_CHECK_COMPATIBILITY,
+        "limits": httpx.Limits(
+            max_connections=config.QDRANT_POOL_SIZE,
+            max_keepalive_connections=config.QDRANT_POOL_SIZE,
+            keepalive_expiry=config.QDRANT_KEEPALIVE_EXPIRY,
+        ),
+    }
+
+
+def get_client() -> QdrantClient:
+    """Get the shared sync Qdrant client, creating it on first use
+
+    Returns:
+        QdrantClient connected to QDRANT_LOCATION
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = QdrantClient(**client_options())
+                logger.info(f"Created Qdrant client for {config.QDRANT_LOCATION}")
+    return _client
+
+
+def get_async_client() -> AsyncQdrantClient:
+    """Get the shared async Qdrant client, creating it on first use
+
+    In the local in-memory mode the async client has its own storage and
+    does not see what the sync client wrote.
+
+    Returns:
+        AsyncQdrantClient connected to QDRANT_LOCATION
+    """
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = AsyncQdrantClient(**client_options())
+                logger.info(f"Created async Qdrant client for {config.QDRANT_LOCATION}")
+    return _async_client
+
+
+async def close_clients() -> None:
+    """Close the shared clients and their connection pools"""
+    global _client, _async_client
+    with _lock:
+        client, async_client = _client, _async_client
+        _client = _async_client = None
+    if client is not None:
+        client.close()
+    if async_client is not None:
+        await async_client.close()
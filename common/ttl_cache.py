@@ -0,0 +1,99 @@
+"""Bounded in-process cache with per-entry expiry
+
+Entries expire a fixed time after they were stored, and once the cache is
+full the least recently used entry is evicted. Hits, misses, evictions and
+expirations are counted so callers can report how well the cache works.
+Safe to share between threads.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class TTLCache:
+    """LRU cache whose entries expire after a time to live
+
+    Args:
+        max_size: Maximum number of entries, 0 disables the cache
+        ttl: Seconds an entry stays valid, None keeps entries until evicted
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up an entry, counting a hit or a miss
+
+        Args:
+            key: Entry key
+            default: Value returned when the entry is missing or expired
+
+        Returns:
+            The cached value, or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store an entry, evicting the least recently used ones if full
+
+        Args:
+            key: Entry key
+            value: Value to cache
+        """
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Counters and fill level of the cache
+
+        Returns:
+            Dictionary with size, max_size, hits, misses, hit_rate,
+            evictions and expirations
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -16,6 +16,33 @@ class DataIngestionConfig(BaseConfig):
         description="Path to the CSV file (relative to artifacts folder)",
     )
 
+    # Streaming settings
+    CSV_BATCH_SIZE: int = Field(
+        default=1000, description="Number of CSV rows read per batch"
+    )
+
+    # HTML cleaning settings
+    HTML_CLEAN_WORKERS: int = Field(
+        default=0,
+        description="Number of HTML cleaning worker processes, 0 uses all CPU cores",
+    )
+
+    # Stage artifact settings
+    USE_STAGE_ARTIFACTS: bool = Field(
+        default=False,
+        description="Persist and reuse the output of each ingestion stage",
+    )
+    STAGE_ARTIFACTS_DIR: str = Field(
+        default="stages",
+        description="Folder of the stage artifacts (relative to artifacts folder)",
+    )
+
+    # Upload checkpoint, used to resume an interrupted upload
+    UPLOAD_CHECKPOINT_PATH: str = Field(
+        default="upload_checkpoint.json",
+        description="Path of the upload checkpoint (relative to artifacts folder)",
+    )
+
     # Text chunking settings
     CHUNK_SIZE: int = Field(default=300, description="Text chunk size for splitting")
     CHUNK_OVERLAP: int = Field(default=30, description="Overlap between chunks")
@@ -33,3 +60,9 @@ class DataIngestionConfig(BaseConfig):
                 f"Please ensure the file exists or update CSV_FILE_PATH in .env"
             )
         return str(csv_path.resolve())
+
+    @field_validator("STAGE_ARTIFACTS_DIR", "UPLOAD_CHECKPOINT_PATH")
+    @classmethod
+    def resolve_artifact_path(cls, v):
+        """convert to absolute path inside the artifacts folder"""
+        return str((Path(__file__).parent / "artifacts" / v).resolve())
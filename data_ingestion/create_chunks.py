@@ -1,11 +1,16 @@
 """Create text chunks from job descriptions"""
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
 from data_ingestion.config import DataIngestionConfig
+from data_ingestion.text_splitter import WordCountTextSplitter
 
 config = DataIngestionConfig()
 
+# Built once and shared by every call
+text_splitter = WordCountTextSplitter(
+    chunk_size=config.CHUNK_SIZE,
+    chunk_overlap=config.CHUNK_OVERLAP,
+)
+
 
 def create_chunks(job_title, description, metadata):
     """Split job description into chunks with metadata
@@ -18,19 +23,85 @@ def create_chunks(job_title, description, metadata):
     Returns:
         List of chunks with text and metadata
     """
+    text_chunks = text_splitter.split_text(description)
+    return build_chunks(job_title, text_chunks, metadata)
+
+
+def create_chunks_batch(jobs):
+    """Split many job descriptions into chunks with metadata
+
+    Args:
+        jobs: List of (job_title, description, metadata) tuples
+
+    Returns:
+        List of chunks with text and metadata, in job order
+    """
+    text_chunks_per_job = text_splitter.split_texts(
+        [description for _, description, _ in jobs]
+    )
     chunks = []
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=config.CHUNK_SIZE,
-        chunk_overlap=config.CHUNK_OVERLAP,
-        length_function=lambda text: len(text.split()),
+    for (job_title, _, metadata), text_chunks in zip(jobs, text_chunks_per_job):
+        chunks.extend(build_chunks(job_title, text_chunks, metadata))
+    return chunks
+
+
+def get_job_metadata(row):
+    """Extract chunk metadata from a job row
+
+    Args:
+        row: Job record from the CSV
+
+    Returns:
+        Dictionary of job metadata
+    """
+    return {
+        "id": str(row.get("ID")),
+        "category": row.get("Job Category", ""),
+        "location": row.get("Job Location", ""),
+        "company": row.get("Company Name", ""),
+        "Level": row.get("Job Level", ""),
+        "publication_date": row.get("Publication Date", ""),
+        "content_hash": row.get("content_hash"),
+    }
+
+
+def create_job_record_chunks(data):
+    """Split a batch of job records with cleaned descriptions into chunks
+
+    Args:
+        data: DataFrame of job records
+
+    Returns:
+        List of chunks with text and metadata, in record order
+    """
+    return create_chunks_batch(
+        [
+            (row.get("Job Title"), row["Job Description"], get_job_metadata(row))
+            for _, row in data.iterrows()
+        ]
     )
-    text_chunks = text_splitter.split_text(description)
+
+
+def build_chunks(job_title, text_chunks, metadata):
+    """Attach job title and metadata to the chunks of one job
+
+    Args:
+        job_title: Title of the job
+        text_chunks: Chunk texts of the job description
+        metadata: Additional job metadata
+
+    Returns:
+        List of chunks with text and metadata
+    """
+    chunks = []
     for id, chunk_text in enumerate(text_chunks):
         chunks.append(
             {
                 "text": f" Job Title: {job_title}.{chunk_text.strip()}",
                 "metadata": {
                     "chunk_id": metadata.get("id"),
+                    "chunk_index": id,
+                    "content_hash": metadata.get("content_hash"),
                     "job_title": job_title,
                     "category": metadata.get("category", ""),
                     "location": metadata.get("location", ""),
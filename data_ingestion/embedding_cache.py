@@ -0,0 +1,272 @@
+"""Persistent on-disk cache of chunk embeddings
+
+Dense vectors live in a fixed-size memory-mapped float32 matrix, one row
+per cached text. A SQLite index maps each text hash to its row and holds
+the sparse vector as compact binary blobs. Each pair of dense and sparse
+models gets its own cache directory, so entries are keyed by
+(model names, text hash). Once the matrix is full, the least recently
+used rows are recycled.
+"""
+
+import hashlib
+import re
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+from common.logger import get_logger
+from common.qdrant_config import QdrantConfig
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+SparseEmbedding = tuple[np.ndarray, np.ndarray]
+
+# SQLite limits the number of parameters of a single statement
+LOOKUP_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS embeddings (
+    text_hash BLOB PRIMARY KEY,
+    row INTEGER NOT NULL UNIQUE,
+    sparse_indices BLOB NOT NULL,
+    sparse_values BLOB NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used);
+"""
+
+
+def hash_text(text: str) -> bytes:
+    """Hash a chunk text into a cache key
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        SHA-256 digest of the text
+    """
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """Size-bounded embedding cache shared across ingestion runs
+
+    Use it as a context manager. Every write is committed, so entries
+    survive an interrupted run.
+
+    Args:
+        directory: Root directory of the cache
+        dense_model: Name of the dense embedding model
+        sparse_model: Name of the sparse embedding model
+        max_rows: Maximum number of cached texts
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        dense_model: str | None = None,
+        sparse_model: str | None = None,
+        max_rows: int | None = None,
+    ):
+        dense_model = dense_model or config.DENSE_MODEL
+        sparse_model = sparse_model or config.SPARSE_MODEL
+        model_key = re.sub(r"[^A-Za-z0-9.]+", "-", f"{dense_model}--{sparse_model}")
+        self.directory = Path(directory or config.EMBEDDING_CACHE_DIR) / model_key
+        self.max_rows = max_rows or config.EMBEDDING_CACHE_MAX_ROWS
+        self.hits = 0
+        self.misses = 0
+        self._connection: sqlite3.Connection | None = None
+        self._dense: np.memmap | None = None
+        self._clock = 0
+        self._next_row = 0
+
+    def __enter__(self) -> "EmbeddingCache":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.directory / "index.sqlite")
+        self._connection.executescript(SCHEMA)
+
+        meta = dict(self._connection.execute("SELECT key, value FROM meta"))
+        if meta.get("max_rows", self.max_rows) != self.max_rows:
+            logger.info("Embedding cache size changed, clearing the cache")
+            self._clear()
+            meta = {}
+
+        self._clock = meta.get("clock", 0)
+        self._next_row = meta.get("next_row", 0)
+        if "dim" in meta:
+            self._open_dense(meta["dim"])
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._dense is not None:
+            self._dense.flush()
+            self._dense = None
+        if self._connection is not None:
+            self._save_meta()
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+        logger.info(f"Embedding cache: {self.hits} hits, {self.misses} misses")
+
+    def get_many(
+        self, texts: list[str]
+    ) -> list[tuple[np.ndarray, SparseEmbedding] | None]:
+        """Look up the embeddings of texts
+
+        Args:
+            texts: Chunk texts
+
+        Returns:
+            (dense vector, sparse vector) for each text, None if not cached
+        """
+        results: list[tuple[np.ndarray, SparseEmbedding] | None] = [None] * len(texts)
+        if self._dense is None:
+            self.misses += len(texts)
+            return results
+
+        hashes = [hash_text(text) for text in texts]
+        entries = self._lookup(hashes)
+
+        self._clock += 1
+        self._connection.executemany(
+            "UPDATE embeddings SET last_used = ? WHERE text_hash = ?",
+            [(self._clock, text_hash) for text_hash in entries],
+        )
+
+        for position, text_hash in enumerate(hashes):
+            entry = entries.get(text_hash)
+            if entry is None:
+                continue
+            row, indices, values = entry
+            results[position] = (
+                np.array(self._dense[row]),
+                (
+                    np.frombuffer(indices, dtype=np.uint32),
+                    np.frombuffer(values, dtype=np.float32),
+                ),
+            )
+        self.hits += len(texts) - results.count(None)
+        self.misses += results.count(None)
+        return results
+
+    def put_many(
+        self, texts: list[str], dense: np.ndarray, sparse: list[SparseEmbedding]
+    ) -> None:
+        """Store the embeddings of texts, recycling old rows when full
+
+        Args:
+            texts: Chunk texts
+            dense: Dense vectors, one row per text
+            sparse: Sparse (indices, values) pairs, one per text
+        """
+        if self._dense is None:
+            self._open_dense(dense.shape[1])
+
+        entries = {hash_text(text): i for i, text in enumerate(texts)}
+        stored = self._lookup(list(entries))
+        new_entries = [
+            (text_hash, i)
+            for text_hash, i in entries.items()
+            if text_hash not in stored
+        ][-self.max_rows :]
+        if not new_entries:
+            return
+
+        rows = self._allocate_rows(len(new_entries))
+        for row, (_, i) in zip(rows, new_entries):
+            self._dense[row] = dense[i]
+        self._dense.flush()
+
+        self._clock += 1
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    text_hash,
+                    row,
+                    np.asarray(sparse[i][0], dtype=np.uint32).tobytes(),
+                    np.asarray(sparse[i][1], dtype=np.float32).tobytes(),
+                    self._clock,
+                )
+                for row, (text_hash, i) in zip(rows, new_entries)
+            ],
+        )
+        self._save_meta()
+        self._connection.commit()
+
+    def _lookup(self, hashes: list[bytes]) -> dict[bytes, tuple[int, bytes, bytes]]:
+        """Fetch the index entries of text hashes, keyed by hash"""
+        entries = {}
+        for start in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+            batch = hashes[start : start + LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            entries.update(
+                (text_hash, (row, indices, values))
+                for text_hash, row, indices, values in self._connection.execute(
+                    "SELECT text_hash, row, sparse_indices, sparse_values "
+                    f"FROM embeddings WHERE text_hash IN ({placeholders})",
+                    batch,
+                )
+            )
+        return entries
+
+    def _allocate_rows(self, count: int) -> list[int]:
+        """Take free rows first, then evict the least recently used ones"""
+        fresh = min(count, self.max_rows - self._next_row)
+        rows = list(range(self._next_row, self._next_row + fresh))
+        self._next_row += fresh
+
+        evict_count = count - fresh
+        if evict_count:
+            evicted = self._connection.execute(
+                "SELECT text_hash, row FROM embeddings ORDER BY last_used LIMIT ?",
+                (evict_count,),
+            ).fetchall()
+            self._connection.executemany(
+                "DELETE FROM embeddings WHERE text_hash = ?",
+                [(text_hash,) for text_hash, _ in evicted],
+            )
+            rows.extend(row for _, row in evicted)
+            logger.debug(f"Evicted {len(evicted)} embeddings from the cache")
+        return rows
+
+    def _open_dense(self, dim: int) -> None:
+        """Memory-map the dense matrix, creating it on first use"""
+        path = self.directory / "dense.f32"
+        size = self.max_rows * dim * np.dtype(np.float32).itemsize
+        if not path.exists() or path.stat().st_size != size:
+            if path.exists():
+                self._clear()
+            # Truncating creates a sparse file, disk is used as rows are written
+            with open(path, "wb") as file:
+                file.truncate(size)
+        self._dense = np.memmap(
+            path, dtype=np.float32, mode="r+", shape=(self.max_rows, dim)
+        )
+        self._connection.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (dim,)
+        )
+
+    def _save_meta(self) -> None:
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+            [
+                ("clock", self._clock),
+                ("next_row", self._next_row),
+                ("max_rows", self.max_rows),
+            ],
+        )
+
+    def _clear(self) -> None:
+        self._connection.execute("DELETE FROM embeddings")
+        self._connection.execute("DELETE FROM meta")
+        self._next_row = 0
+        self._clock = 0
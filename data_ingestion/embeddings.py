@@ -0,0 +1,200 @@
+"""Batched dense and sparse embedding of chunks with fastembed"""
+
+import itertools
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+from fastembed import SparseTextEmbedding, TextEmbedding
+
+from common.logger import get_logger
+from common.qdrant_config import QdrantConfig
+from data_ingestion.embedding_cache import EmbeddingCache, SparseEmbedding
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+# Models are loaded once per process, either in the main process or in each
+# worker of the embedding pool
+_dense_model: TextEmbedding | None = None
+_sparse_model: SparseTextEmbedding | None = None
+
+
+def _load_models(threads: int | None = None) -> None:
+    """Load the dense and sparse embedding models into this process
+
+    Args:
+        threads: Number of ONNX runtime threads per model, None for default
+    """
+    global _dense_model, _sparse_model
+    if _dense_model is None:
+        _dense_model = TextEmbedding(config.DENSE_MODEL, threads=threads)
+    if _sparse_model is None:
+        _sparse_model = SparseTextEmbedding(config.SPARSE_MODEL, threads=threads)
+
+
+def _init_worker() -> None:
+    """Initialize an embedding worker process with single-threaded models"""
+    _load_models(threads=1)
+
+
+def embed_texts(texts: list[str]) -> tuple[np.ndarray, list[SparseEmbedding]]:
+    """Embed a batch of texts with the dense and sparse models
+
+    Args:
+        texts: Texts to embed
+
+    Returns:
+        Tuple of (dense float32 matrix of shape (len(texts), dim),
+        list of sparse (indices, values) pairs)
+    """
+    _load_models()
+    dense = np.asarray(
+        list(_dense_model.embed(texts, batch_size=len(texts))), dtype=np.float32
+    )
+    sparse = [
+        (embedding.indices, embedding.values.astype(np.float32))
+        for embedding in _sparse_model.embed(texts, batch_size=len(texts))
+    ]
+    return dense, sparse
+
+
+class ChunkEmbedder:
+    """Embeds chunks in large batches across a pool of worker processes
+
+    With a single worker the models run in the current process. Otherwise
+    each worker loads its own single-threaded copy of the models and
+    batches are embedded in parallel, keeping a bounded number in flight.
+    Chunks found in the embedding cache are not embedded again, and the
+    pool is only started once a chunk misses the cache.
+
+    Args:
+        workers: Number of worker processes, 0 or None uses the configured
+            number or all CPU cores
+        batch_size: Number of chunks embedded per batch
+        use_cache: Reuse and store embeddings in the on-disk cache
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        batch_size: int | None = None,
+        use_cache: bool = True,
+    ):
+        self.workers = workers or config.EMBEDDING_WORKERS or os.cpu_count() or 1
+        self.batch_size = batch_size or config.EMBEDDING_BATCH_SIZE
+        self.cache = (
+            EmbeddingCache() if use_cache and config.EMBEDDING_CACHE_DIR else None
+        )
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "ChunkEmbedder":
+        if self.cache is not None:
+            self.cache.__enter__()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        if self.cache is not None:
+            self.cache.__exit__(*exc_info)
+
+    def _submit(self, texts: list[str]) -> Future:
+        """Embed texts in the pool, or right away with a single worker"""
+        if self.workers <= 1:
+            future = Future()
+            future.set_result(embed_texts(texts))
+            return future
+
+        if self._executor is None:
+            logger.info(f"Starting embedding pool with {self.workers} workers")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor.submit(embed_texts, texts)
+
+    def _collect(
+        self,
+        texts: list[str],
+        cached: list[tuple[np.ndarray, SparseEmbedding] | None],
+        future: Future | None,
+    ) -> tuple[np.ndarray, list[SparseEmbedding]]:
+        """Combine cached embeddings with freshly computed ones
+
+        Args:
+            texts: Texts of the batch
+            cached: Cached embedding of each text, None for cache misses
+            future: Embedding of the cache misses, None if there were none
+
+        Returns:
+            Tuple of (dense matrix, sparse vectors) for the whole batch
+        """
+        if future is None:
+            return (
+                np.stack([dense for dense, _ in cached]),
+                [sparse for _, sparse in cached],
+            )
+
+        missing = [i for i, entry in enumerate(cached) if entry is None]
+        missing_dense, missing_sparse = future.result()
+        if len(missing) == len(texts):
+            if self.cache is not None:
+                self.cache.put_many(texts, missing_dense, missing_sparse)
+            return missing_dense, missing_sparse
+
+        if self.cache is not None:
+            self.cache.put_many(
+                [texts[i] for i in missing], missing_dense, missing_sparse
+            )
+        dense = np.empty((len(texts), missing_dense.shape[1]), dtype=np.float32)
+        sparse: list[SparseEmbedding | None] = [None] * len(texts)
+        for i, entry in enumerate(cached):
+            if entry is not None:
+                dense[i], sparse[i] = entry
+        dense[missing] = missing_dense
+        for i, embedding in zip(missing, missing_sparse):
+            sparse[i] = embedding
+        return dense, sparse
+
+    def embed_chunks(
+        self, chunks: Iterable[dict]
+    ) -> Iterator[tuple[tuple[dict, ...], np.ndarray, list[SparseEmbedding]]]:
+        """Embed chunks lazily, preserving their order
+
+        Args:
+            chunks: Iterable of chunks with text and metadata
+
+        Yields:
+            Tuples of (chunk batch, dense vectors, sparse vectors)
+        """
+        # Keep two batches per worker in flight so workers never sit idle,
+        # without reading the whole input ahead
+        pending: deque[tuple[tuple[dict, ...], list[str], list, Future | None]]
+        pending = deque()
+        for batch in itertools.batched(chunks, self.batch_size):
+            texts = [chunk["text"] for chunk in batch]
+            if self.cache is not None:
+                cached = self.cache.get_many(texts)
+            else:
+                cached = [None] * len(texts)
+
+            missing_texts = [
+                text for text, entry in zip(texts, cached) if entry is None
+            ]
+            future = self._submit(missing_texts) if missing_texts else None
+            pending.append((batch, texts, cached, future))
+            if len(pending) >= self.workers * 2:
+                done_batch, *done = pending.popleft()
+                yield done_batch, *self._collect(*done)
+
+        while pending:
+            done_batch, *done = pending.popleft()
+            yield done_batch, *self._collect(*done)
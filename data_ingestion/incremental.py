@@ -0,0 +1,137 @@
+"""Change detection for incremental re-ingestion of job data"""
+
+import hashlib
+import json
+
+import pandas as pd
+
+from common.logger import get_logger
+from common.payload_fields import NORMALIZATION_VERSION
+from common.qdrant_config import QdrantConfig
+from data_ingestion.config import DataIngestionConfig
+
+config = DataIngestionConfig()
+qdrant_config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+# Raw CSV columns that contribute to a job's chunks and payload
+HASHED_COLUMNS = [
+    "ID",
+    "Job Title",
+    "Job Description",
+    "Job Category",
+    "Job Location",
+    "Company Name",
+    "Job Level",
+    "Publication Date",
+]
+
+
+def compute_content_hash(values) -> str:
+    """Compute the content hash of a job record
+
+    The chunking and embedding settings and the payload normalization
+    version are hashed along with the record, so changing any of them marks
+    every job as changed.
+
+    Args:
+        values: Raw values of HASHED_COLUMNS for one job
+
+    Returns:
+        Hex digest identifying the job content
+    """
+    content = json.dumps(
+        [
+            [str(value) for value in values],
+            config.CHUNK_SIZE,
+            config.CHUNK_OVERLAP,
+            qdrant_config.DENSE_MODEL,
+            qdrant_config.SPARSE_MODEL,
+            NORMALIZATION_VERSION,
+        ]
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class IncrementalSync:
+    """Tracks which jobs changed since the last ingestion run
+
+    Args:
+        existing_hashes: Content hash of every job already in the vector
+            database, keyed by job id
+    """
+
+    def __init__(self, existing_hashes: dict[str, str]):
+        self.existing_hashes = existing_hashes
+        self.seen_job_ids: set[str] = set()
+        self.changed_hashes: dict[str, str] = {}
+        self.chunked_job_ids: set[str] = set()
+        self.unchanged_count = 0
+
+    def filter_changed(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Keep only new or changed jobs from a batch of job records
+
+        Args:
+            data: Batch of raw job records
+
+        Returns:
+            New or changed job records, with a "content_hash" column added
+        """
+        columns = [column for column in HASHED_COLUMNS if column in data.columns]
+        hashes = [
+            compute_content_hash(values)
+            for values in data[columns].itertuples(index=False, name=None)
+        ]
+        job_ids = data["ID"].astype(str)
+
+        changed = []
+        for job_id, content_hash in zip(job_ids, hashes):
+            self.seen_job_ids.add(job_id)
+            is_changed = self.existing_hashes.get(job_id) != content_hash
+            if is_changed:
+                self.changed_hashes[job_id] = content_hash
+            else:
+                self.unchanged_count += 1
+            changed.append(is_changed)
+
+        changed_data = data[changed].copy()
+        changed_data["content_hash"] = [
+            content_hash
+            for content_hash, is_changed in zip(hashes, changed)
+            if is_changed
+        ]
+        return changed_data
+
+    def vanished_job_ids(self) -> list[str]:
+        """Job ids present in the vector database but no longer in the CSV
+
+        Returns:
+            List of job ids to delete
+        """
+        return [
+            job_id for job_id in self.existing_hashes if job_id not in self.seen_job_ids
+        ]
+
+    def mark_chunked(self, chunks) -> None:
+        """Record the jobs that a batch of chunks belongs to
+
+        Args:
+            chunks: Chunks of changed jobs, with metadata
+        """
+        self.chunked_job_ids.update(chunk["metadata"]["chunk_id"] for chunk in chunks)
+
+    def chunkless_hashes(self) -> dict[str, str]:
+        """Content hash of the changed jobs that produced no chunk
+
+        Only complete once every chunk of the run went through mark_chunked.
+
+        Returns:
+            Content hashes keyed by job id
+        """
+        return {
+            job_id: content_hash
+            for job_id, content_hash in self.changed_hashes.items()
+            if job_id not in self.chunked_job_ids
+        }
@@ -1,5 +1,7 @@
 """Data ingestion script for loading and processing job data"""
 
+from collections.abc import Iterator
+
 import pandas as pd
 
 from data_ingestion.config import DataIngestionConfig
@@ -15,3 +17,21 @@ def load_data():
     """
     df = pd.read_csv(config.CSV_FILE_PATH)
     return df
+
+
+def load_data_in_batches(batch_size: int | None = None) -> Iterator[pd.DataFrame]:
+    """Lazily load job data from CSV file in row batches
+
+    Only one batch is held in memory at a time, so memory use does not
+    grow with the size of the CSV.
+
+    Args:
+        batch_size: Number of rows per batch, defaults to CSV_BATCH_SIZE
+
+    Yields:
+        DataFrame: Next batch of job data
+    """
+    with pd.read_csv(
+        config.CSV_FILE_PATH, chunksize=batch_size or config.CSV_BATCH_SIZE
+    ) as reader:
+        yield from reader
@@ -0,0 +1,387 @@
+"""Columnar stage artifacts for the ingestion pipeline
+
+Each stage of the pipeline (raw -> cleaned -> chunked -> embedded) can
+persist its output as a Parquet file in the artifacts folder. Artifacts are
+named after a key that hashes the stage inputs and settings, chained from
+the CSV contents, so a run reuses the output of the last stage whose inputs
+did not change and only recomputes the stages after it. Artifacts are
+written while the stage streams its output and read back batch by batch.
+"""
+
+import hashlib
+import json
+import math
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from common.html_cleaner import HtmlCleaner
+from common.logger import get_logger
+from common.qdrant_config import QdrantConfig
+from data_ingestion.config import DataIngestionConfig
+from data_ingestion.create_chunks import create_job_record_chunks
+from data_ingestion.embeddings import ChunkEmbedder, SparseEmbedding
+from data_ingestion.ingestion import load_data_in_batches
+
+config = DataIngestionConfig()
+qdrant_config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+STAGES = ["raw", "cleaned", "chunked", "embedded"]
+
+# Older artifacts of each stage are kept, so switching settings back and
+# forth while tuning does not recompute them
+KEPT_ARTIFACTS_PER_STAGE = 3
+
+# Chunk metadata stored in the chunked and embedded artifacts. The content
+# hash is left out, it is attached when changed jobs are selected for upload
+CHUNK_SCHEMA = pa.schema(
+    [
+        ("text", pa.string()),
+        ("chunk_id", pa.string()),
+        ("chunk_index", pa.int64()),
+        ("job_title", pa.string()),
+        ("category", pa.string()),
+        ("location", pa.string()),
+        ("company", pa.string()),
+        ("Level", pa.string()),
+        ("publication_date", pa.string()),
+    ]
+)
+
+EmbeddedBatch = tuple[tuple[dict, ...], np.ndarray, list[SparseEmbedding]]
+
+
+def hash_file(path: str | Path, block_size: int = 1 << 20) -> str:
+    """Hash the contents of a file
+
+    Args:
+        path: File to hash
+        block_size: Number of bytes read at a time
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while block := file.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stage_key(parent_key: str, stage: str, *settings) -> str:
+    """Derive the key of a stage from its input key and settings
+
+    Args:
+        parent_key: Key of the stage input
+        stage: Stage name
+        *settings: Settings that change the stage output
+
+    Returns:
+        Hex digest identifying the stage output
+    """
+    content = json.dumps([parent_key, stage, *settings])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _null_if_nan(value):
+    """Map the NaN pandas uses for missing values to a Parquet null"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return None if value is None else str(value)
+
+
+def _nan_if_null(value):
+    """Map a Parquet null back to the NaN pandas uses for missing values"""
+    return np.nan if value is None else value
+
+
+def _frame_to_table(data: pd.DataFrame) -> pa.Table:
+    """Convert a batch of job records to a table of nullable strings"""
+    schema = pa.schema([(str(column), pa.string()) for column in data.columns])
+    return pa.Table.from_pydict(
+        {
+            str(column): [_null_if_nan(value) for value in data[column]]
+            for column in data.columns
+        },
+        schema=schema,
+    )
+
+
+def _table_to_frame(table: pa.Table | pa.RecordBatch) -> pd.DataFrame:
+    """Convert a table of nullable strings back to job records"""
+    data = table.to_pandas()
+    return data.where(data.notna(), np.nan)
+
+
+def _chunks_to_table(chunks: list[dict]) -> pa.Table:
+    """Convert chunks with text and metadata to a table"""
+    columns = {"text": [chunk["text"] for chunk in chunks]}
+    for field in CHUNK_SCHEMA.names[1:]:
+        values = [chunk["metadata"].get(field) for chunk in chunks]
+        if field != "chunk_index":
+            values = [_null_if_nan(value) for value in values]
+        columns[field] = values
+    return pa.Table.from_pydict(columns, schema=CHUNK_SCHEMA)
+
+
+def _table_to_chunks(table: pa.Table | pa.RecordBatch) -> list[dict]:
+    """Convert a table back to chunks with text and metadata"""
+    columns = {field: table.column(field).to_pylist() for field in CHUNK_SCHEMA.names}
+    chunks = []
+    for i, text in enumerate(columns["text"]):
+        metadata = {
+            field: _nan_if_null(columns[field][i]) for field in CHUNK_SCHEMA.names[1:]
+        }
+        metadata["content_hash"] = None
+        chunks.append({"text": text, "metadata": metadata})
+    return chunks
+
+
+class StageStore:
+    """Reads and writes the Parquet artifacts of pipeline stages
+
+    Args:
+        directory: Folder holding the artifacts
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def path(self, stage: str, key: str) -> Path:
+        return self.directory / f"{stage}-{key[:16]}.parquet"
+
+    def exists(self, stage: str, key: str) -> bool:
+        return self.path(stage, key).exists()
+
+    def read(self, stage: str, key: str, batch_size: int) -> Iterator[pa.RecordBatch]:
+        """Stream the record batches of an artifact
+
+        Args:
+            stage: Stage name
+            key: Stage key
+            batch_size: Number of rows per batch
+
+        Yields:
+            Record batches of the artifact, in order
+        """
+        parquet_file = pq.ParquetFile(self.path(stage, key), memory_map=True)
+        yield from parquet_file.iter_batches(batch_size=batch_size)
+
+    def write(
+        self, stage: str, key: str, tables: Iterator[pa.Table]
+    ) -> Iterator[pa.Table]:
+        """Write tables to an artifact as they stream through
+
+        The artifact only appears once every table has been written, so an
+        interrupted stage never leaves a partial artifact behind.
+
+        Args:
+            stage: Stage name
+            key: Stage key
+            tables: Tables making up the stage output
+
+        Yields:
+            The same tables, once written
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(stage, key)
+        temp_path = path.with_suffix(".tmp")
+        writer: pq.ParquetWriter | None = None
+        completed = False
+        try:
+            for table in tables:
+                if writer is None:
+                    writer = pq.ParquetWriter(temp_path, table.schema)
+                writer.write_table(table)
+                yield table
+            completed = True
+        finally:
+            if writer is not None:
+                writer.close()
+            if completed and writer is not None:
+                temp_path.replace(path)
+                self._remove_old_artifacts(stage)
+                logger.info(f"Saved {stage} stage artifact to {path.name}")
+            else:
+                temp_path.unlink(missing_ok=True)
+
+    def _remove_old_artifacts(self, stage: str) -> None:
+        artifacts = sorted(
+            self.directory.glob(f"{stage}-*.parquet"),
+            key=lambda artifact: artifact.stat().st_mtime,
+            reverse=True,
+        )
+        for artifact in artifacts[KEPT_ARTIFACTS_PER_STAGE:]:
+            artifact.unlink(missing_ok=True)
+
+
+class StagedPipeline:
+    """Ingestion pipeline that reuses the stage artifacts of earlier runs
+
+    Every stage method streams the full output of its stage, from its
+    artifact when one exists for the current key, otherwise by computing it
+    from the previous stage and saving the artifact along the way.
+
+    Args:
+        cleaner: HTML cleaner used for job descriptions
+        directory: Folder holding the artifacts, defaults to
+            STAGE_ARTIFACTS_DIR
+        batch_size: Number of rows per batch, defaults to CSV_BATCH_SIZE
+    """
+
+    def __init__(
+        self,
+        cleaner: HtmlCleaner,
+        directory: str | Path | None = None,
+        batch_size: int | None = None,
+    ):
+        self.cleaner = cleaner
+        self.store = StageStore(directory or config.STAGE_ARTIFACTS_DIR)
+        self.batch_size = batch_size or config.CSV_BATCH_SIZE
+
+        raw_key = stage_key(hash_file(config.CSV_FILE_PATH), "raw")
+        cleaned_key = stage_key(raw_key, "cleaned")
+        chunked_key = stage_key(
+            cleaned_key, "chunked", config.CHUNK_SIZE, config.CHUNK_OVERLAP
+        )
+        embedded_key = stage_key(
+            chunked_key,
+            "embedded",
+            qdrant_config.DENSE_MODEL,
+            qdrant_config.SPARSE_MODEL,
+        )
+        self.keys = dict(zip(STAGES, [raw_key, cleaned_key, chunked_key, embedded_key]))
+
+    def _cached(self, stage: str) -> bool:
+        if self.store.exists(stage, self.keys[stage]):
+            logger.info(f"Reusing {stage} stage artifact")
+            return True
+        logger.info(f"Computing {stage} stage")
+        return False
+
+    def raw(self) -> Iterator[pd.DataFrame]:
+        """Stream the raw job records of the CSV
+
+        Yields:
+            Batches of job records, with every value as a string or NaN
+        """
+        if self._cached("raw"):
+            for batch in self.store.read("raw", self.keys["raw"], self.batch_size):
+                yield _table_to_frame(batch)
+            return
+
+        tables = (
+            _frame_to_table(data) for data in load_data_in_batches(self.batch_size)
+        )
+        for table in self.store.write("raw", self.keys["raw"], tables):
+            yield _table_to_frame(table)
+
+    def cleaned(self) -> Iterator[pd.DataFrame]:
+        """Stream job records with cleaned descriptions
+
+        Yields:
+            Batches of job records
+        """
+        if self._cached("cleaned"):
+            for batch in self.store.read(
+                "cleaned", self.keys["cleaned"], self.batch_size
+            ):
+                yield _table_to_frame(batch)
+            return
+
+        def clean_batches():
+            for data in self.raw():
+                data["Job Description"] = self.cleaner.clean(
+                    data["Job Description"].tolist()
+                )
+                yield _frame_to_table(data)
+
+        for table in self.store.write("cleaned", self.keys["cleaned"], clean_batches()):
+            yield _table_to_frame(table)
+
+    def chunks(self) -> Iterator[dict]:
+        """Stream the chunks of every job
+
+        Yields:
+            Chunks with text and metadata, without content hash
+        """
+        if self._cached("chunked"):
+            for batch in self.store.read(
+                "chunked", self.keys["chunked"], self.batch_size
+            ):
+                yield from _table_to_chunks(batch)
+            return
+
+        def chunk_batches():
+            for data in self.cleaned():
+                chunks = create_job_record_chunks(data)
+                if chunks:
+                    yield _chunks_to_table(chunks)
+
+        for table in self.store.write("chunked", self.keys["chunked"], chunk_batches()):
+            yield from _table_to_chunks(table)
+
+    def embedded(self, embedder: ChunkEmbedder) -> Iterator[EmbeddedBatch]:
+        """Stream the embedded chunks of every job
+
+        Args:
+            embedder: Embedder used when the artifact has to be computed
+
+        Yields:
+            Tuples of (chunk batch, dense vectors, sparse vectors)
+        """
+        if self._cached("embedded"):
+            for batch in self.store.read(
+                "embedded", self.keys["embedded"], embedder.batch_size
+            ):
+                yield self._read_embedded(batch)
+            return
+
+        def embedded_tables():
+            for chunks, dense, sparse in embedder.embed_chunks(self.chunks()):
+                table = _chunks_to_table(list(chunks))
+                table = table.append_column(
+                    "dense",
+                    pa.FixedSizeListArray.from_arrays(
+                        pa.array(dense.ravel(), pa.float32()), dense.shape[1]
+                    ),
+                )
+                table = table.append_column(
+                    "sparse_indices",
+                    pa.array([indices for indices, _ in sparse], pa.list_(pa.uint32())),
+                )
+                table = table.append_column(
+                    "sparse_values",
+                    pa.array([values for _, values in sparse], pa.list_(pa.float32())),
+                )
+                yield table
+
+        for table in self.store.write(
+            "embedded", self.keys["embedded"], embedded_tables()
+        ):
+            yield self._read_embedded(table)
+
+    @staticmethod
+    def _read_embedded(table: pa.Table | pa.RecordBatch) -> EmbeddedBatch:
+        """Split an embedded table into chunks and vectors"""
+        dense_column = table.column("dense")
+        if isinstance(dense_column, pa.ChunkedArray):
+            dense_column = dense_column.combine_chunks()
+        dense = dense_column.flatten().to_numpy().reshape(len(table), -1)
+
+        sparse = []
+        for name in ("sparse_indices", "sparse_values"):
+            column = table.column(name)
+            if isinstance(column, pa.ChunkedArray):
+                column = column.combine_chunks()
+            values = column.flatten().to_numpy()
+            offsets = column.offsets.to_numpy() - column.offsets[0].as_py()
+            sparse.append(np.split(values, offsets[1:-1]))
+        return tuple(_table_to_chunks(table)), dense, list(zip(*sparse))
@@ -0,0 +1,229 @@
+"""Recursive text splitter measuring chunk size in words
+
+Produces the same chunks as langchain's ``RecursiveCharacterTextSplitter``
+with ``length_function=lambda text: len(text.split())``, without
+re-tokenizing candidate pieces. Each text is tokenized once into a word
+start prefix sum, pieces are handled as offset arrays into the text, and
+their word counts and merge points are computed with vectorized lookups.
+"""
+
+import re
+
+import numpy as np
+
+DEFAULT_SEPARATORS = ["\n\n", "\n", " ", ""]
+
+# Lookup table of the code points str.split() treats as whitespace
+IS_SPACE = np.zeros(0x110000, dtype=bool)
+IS_SPACE[[code for code in range(0x10000) if chr(code).isspace()]] = True
+
+
+class _WordIndex:
+    """Word boundaries of a text, used to count words in any slice of it"""
+
+    def __init__(self, text: str):
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        self.is_word = ~IS_SPACE[codes]
+        self.is_word_start = self.is_word.copy()
+        self.is_word_start[1:] &= ~self.is_word[:-1]
+        self.word_starts_before = np.concatenate(
+            ([0], np.cumsum(self.is_word_start, dtype=np.int64))
+        )
+
+    def count(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Count the words of each non-empty slice text[start:end]
+
+        A word cut by the start of a slice still counts, as it would when
+        splitting the slice on its own.
+        """
+        return (
+            self.word_starts_before[ends]
+            - self.word_starts_before[starts]
+            - self.is_word_start[starts]
+            + self.is_word[starts]
+        )
+
+
+class WordCountTextSplitter:
+    """Splits text recursively into chunks of at most chunk_size words
+
+    Build it once and reuse it for every text.
+
+    Args:
+        chunk_size: Maximum number of words per chunk
+        chunk_overlap: Number of words shared by consecutive chunks
+        separators: Separators to try in order, defaults to paragraphs,
+            lines, spaces and single characters
+    """
+
+    def __init__(
+        self, chunk_size: int, chunk_overlap: int, separators: list[str] | None = None
+    ):
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"Got a larger chunk overlap ({chunk_overlap}) than chunk size "
+                f"({chunk_size}), should be smaller."
+            )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = separators or DEFAULT_SEPARATORS
+        self._patterns = {
+            separator: re.compile(re.escape(separator))
+            for separator in self.separators
+            if len(separator) > 1
+        }
+
+    def split_text(self, text: str) -> list[str]:
+        """Split a text into chunks
+
+        Args:
+            text: Text to split
+
+        Returns:
+            List of chunk texts
+        """
+        if not text:
+            return []
+        words = _WordIndex(text)
+        return self._split(text, 0, len(text), self.separators, words)
+
+    def split_texts(self, texts: list[str]) -> list[list[str]]:
+        """Split many texts into chunks
+
+        Args:
+            texts: Texts to split
+
+        Returns:
+            List of chunk texts for each input text
+        """
+        return [self.split_text(text) for text in texts]
+
+    def _split(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        separators: list[str],
+        words: _WordIndex,
+    ) -> list[str]:
+        """Split text[start:end] with the first separator it contains"""
+        separator = separators[-1]
+        remaining_separators = []
+        for i, candidate in enumerate(separators):
+            if not candidate:
+                separator = candidate
+                break
+            if text.find(candidate, start, end) != -1:
+                separator = candidate
+                remaining_separators = separators[i + 1 :]
+                break
+
+        piece_starts, piece_ends = self._piece_bounds(text, start, end, separator)
+        word_counts = words.count(piece_starts, piece_ends)
+
+        final_chunks = []
+        run_start = 0
+        for large in np.flatnonzero(word_counts >= self.chunk_size).tolist():
+            if large > run_start:
+                final_chunks.extend(
+                    self._merge(
+                        text,
+                        piece_starts[run_start:large],
+                        piece_ends[run_start:large],
+                        word_counts[run_start:large],
+                    )
+                )
+            if not remaining_separators:
+                final_chunks.append(text[piece_starts[large] : piece_ends[large]])
+            else:
+                final_chunks.extend(
+                    self._split(
+                        text,
+                        int(piece_starts[large]),
+                        int(piece_ends[large]),
+                        remaining_separators,
+                        words,
+                    )
+                )
+            run_start = large + 1
+
+        if len(word_counts) > run_start:
+            final_chunks.extend(
+                self._merge(
+                    text,
+                    piece_starts[run_start:],
+                    piece_ends[run_start:],
+                    word_counts[run_start:],
+                )
+            )
+        return final_chunks
+
+    def _piece_bounds(
+        self, text: str, start: int, end: int, separator: str
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Offsets of the non-empty pieces of text[start:end]
+
+        Every piece but the first starts with the separator that precedes it.
+        """
+        if not separator:
+            bounds = np.arange(start, end + 1)
+        else:
+            if len(separator) == 1:
+                codes = np.frombuffer(
+                    text[start:end].encode("utf-32-le"), dtype=np.uint32
+                )
+                positions = np.flatnonzero(codes == ord(separator)) + start
+            else:
+                positions = [
+                    match.start()
+                    for match in self._patterns[separator].finditer(text, start, end)
+                ]
+            bounds = np.concatenate(([start], positions, [end])).astype(np.int64)
+
+        non_empty = bounds[1:] > bounds[:-1]
+        return bounds[:-1][non_empty], bounds[1:][non_empty]
+
+    def _merge(
+        self,
+        text: str,
+        piece_starts: np.ndarray,
+        piece_ends: np.ndarray,
+        word_counts: np.ndarray,
+    ) -> list[str]:
+        """Merge consecutive pieces into chunks with overlap
+
+        Pieces are added to a window until the next one would exceed
+        chunk_size, then the window is emitted and shrunk from the front
+        to at most chunk_overlap words. Both points are found with binary
+        searches over the prefix sum of the word counts.
+        """
+        words_before = np.concatenate(([0], np.cumsum(word_counts)))
+        piece_count = len(word_counts)
+
+        chunks = []
+        first = 0
+        next_piece = 0
+        while True:
+            # First piece that no longer fits in the window
+            fits_until = words_before[first] + self.chunk_size
+            overflow = int(np.searchsorted(words_before, fits_until, "right")) - 1
+            next_piece = max(overflow, next_piece)
+            if next_piece >= piece_count:
+                break
+
+            chunk = text[piece_starts[first] : piece_ends[next_piece - 1]].strip()
+            if chunk:
+                chunks.append(chunk)
+
+            window_end = words_before[next_piece]
+            keep_from = max(
+                window_end - self.chunk_overlap,
+                min(words_before[next_piece + 1] - self.chunk_size, window_end),
+            )
+            first = max(first, int(np.searchsorted(words_before, keep_from, "left")))
+            next_piece += 1
+
+        chunk = text[piece_starts[first] : piece_ends[piece_count - 1]].strip()
+        if chunk:
+            chunks.append(chunk)
+        return chunks
@@ -1,14 +1,29 @@
 """Vector database setup script"""
 
+import argparse
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from common.document_store import (
+    DocumentStore,
+    delete_version_store,
+    live_store_collection,
+    live_store_path,
+    switch_live_store,
+    version_store_path,
+)
+from common.html_cleaner import HtmlCleaner
 from common.logger import get_logger
-from common.utils import remove_html_tags
 from data_ingestion.config import DataIngestionConfig
-from data_ingestion.create_chunks import create_chunks
-from data_ingestion.ingestion import load_data
-from data_ingestion.qdrant_client import (
-    create_field_indexes,
-    upload_chunks_to_vector_db,
-)
+from data_ingestion.create_chunks import create_job_record_chunks
+from data_ingestion.embeddings import ChunkEmbedder
+from data_ingestion.incremental import IncrementalSync
+from data_ingestion.ingestion import load_data_in_batches
+from data_ingestion.stages import EmbeddedBatch, StagedPipeline, hash_file, stage_key
+from vector_backend.factory import get_backend
+from vector_backend.uploader import UploadCheckpoint
 
 config = DataIngestionConfig()
 logger = get_logger(
@@ -16,50 +31,348 @@ logger = get_logger(
 )
 
 
-def setup_vector_database():
-    """Main function to setup vector database with job data"""
-    logger.info("Starting database setup process")
-    logger.info("Loading data from the CSV")
-    data = load_data()
-    logger.info(f"Loaded {len(data)} job records")
-
-    logger.info("Cleaning HTML from job description")
-    data["Job Description"] = data["Job Description"].apply(remove_html_tags)
-    logger.info("HTML cleaning completed")
-
-    all_chunks = []
-
-    logger.info("Creating chunks from job description")
-    for id, row in data.iterrows():
-        metadata = {
-            "id": row.get("ID"),
-            "category": row.get("Job Category", ""),
-            "location": row.get("Job Location", ""),
-            "company": row.get("Company Name", ""),
-            "Level": row.get("Job Level", ""),
-            "publication_date": row.get("Publication Date", ""),
-        }
-
-        chunks = create_chunks(
-            job_title=row.get("Job Title"),
-            description=row["Job Description"],
-            metadata=metadata,
+def iter_job_chunks(
+    batches: Iterable[pd.DataFrame],
+    cleaner: HtmlCleaner,
+    sync: IncrementalSync | None = None,
+) -> Iterator[dict]:
+    """Clean and chunk job records batch by batch
+
+    Args:
+        batches: Iterable of job data batches
+        cleaner: HTML cleaner used for job descriptions
+        sync: Optional change tracker, only new or changed jobs are chunked
+
+    Yields:
+        Chunks with text and metadata, in CSV order
+    """
+    total_jobs = 0
+    total_chunks = 0
+    for data in batches:
+        if sync is not None:
+            data = sync.filter_changed(data)
+        data["Job Description"] = cleaner.clean(data["Job Description"].tolist())
+
+        chunks = create_job_record_chunks(data)
+        if sync is not None:
+            sync.mark_chunked(chunks)
+        total_chunks += len(chunks)
+        yield from chunks
+
+        total_jobs += len(data)
+        logger.debug(f"Chunked {total_jobs} job records so far")
+
+    logger.info(f"Created {total_chunks} chunks from {total_jobs} job records")
+
+
+def select_changed_chunks(
+    embedded_batches: Iterable[EmbeddedBatch], sync: IncrementalSync
+) -> Iterator[EmbeddedBatch]:
+    """Keep only the embedded chunks of new or changed jobs
+
+    Args:
+        embedded_batches: Embedded chunks of every job
+        sync: Change tracker that already saw every job record
+
+    Yields:
+        Embedded chunks of changed jobs, with their content hash attached
+    """
+    for chunks, dense, sparse in embedded_batches:
+        selected = [
+            i
+            for i, chunk in enumerate(chunks)
+            if chunk["metadata"]["chunk_id"] in sync.changed_hashes
+        ]
+        if not selected:
+            continue
+        sync.mark_chunked(chunks[i] for i in selected)
+        for i in selected:
+            metadata = chunks[i]["metadata"]
+            metadata["content_hash"] = sync.changed_hashes[metadata["chunk_id"]]
+        yield (
+            tuple(chunks[i] for i in selected),
+            dense[selected],
+            [sparse[i] for i in selected],
         )
 
-        all_chunks.extend(chunks)
 
-    logger.info(f"Created {len(all_chunks)} chunks from {len(data)} data")
+def upload_from_stages(
+    cleaner: HtmlCleaner,
+    sync: IncrementalSync,
+    checkpoint: UploadCheckpoint,
+    document_store: DocumentStore,
+    target_collection: str,
+) -> None:
+    """Upload changed jobs, reusing the stage artifacts of earlier runs
+
+    Args:
+        cleaner: HTML cleaner used if the cleaned stage is recomputed
+        sync: Change tracker, fed with every raw job record first
+        checkpoint: Upload checkpoint to record progress in
+        document_store: Document store receiving chunk texts and job details
+        target_collection: Collection to upload to
+    """
+    pipeline = StagedPipeline(cleaner)
+    for data in pipeline.raw():
+        sync.filter_changed(data)
+    if not sync.changed_hashes:
+        logger.info("No new or changed jobs to upload")
+        return
+
+    with ChunkEmbedder() as embedder:
+        get_backend().upload_embedded_chunks(
+            select_changed_chunks(pipeline.embedded(embedder), sync),
+            checkpoint,
+            document_store,
+            target_collection,
+        )
 
-    logger.info("Uploading chunks to Qdrant")
-    upload_chunks_to_vector_db(all_chunks)
+
+def upload_chunks_to_vector_db(
+    chunks_with_metadata: Iterable[dict],
+    checkpoint: UploadCheckpoint | None = None,
+    document_store: DocumentStore | None = None,
+    target_collection: str | None = None,
+) -> int:
+    """Embed chunks and store them in the configured vector backend
+
+    Chunks are consumed lazily, so a generator can be passed in and each
+    batch is stored as soon as it has been embedded. Dense and sparse
+    vectors are computed client-side by the embedding pool.
+
+    Args:
+        chunks_with_metadata: Iterable of chunks with text and metadata
+        checkpoint: Optional upload checkpoint to record progress in and
+            resume from
+        document_store: Optional document store receiving the chunk texts
+        target_collection: Collection to upload to, defaults to the live one
+
+    Returns:
+        Number of chunks uploaded
+    """
+    backend = get_backend()
+    if target_collection is None:
+        target_collection = backend.get_live_collection()
+    with ChunkEmbedder() as embedder:
+        return backend.upload_embedded_chunks(
+            embedder.embed_chunks(chunks_with_metadata),
+            checkpoint,
+            document_store,
+            target_collection,
+        )
+
+
+def get_run_key(full_rebuild, use_stages):
+    """Identify an ingestion run by everything its point stream depends on
+
+    Args:
+        full_rebuild: Whether every job is uploaded
+        use_stages: Whether stage artifacts are used
+
+    Returns:
+        Hex digest identifying the run
+    """
+    return stage_key(
+        hash_file(config.CSV_FILE_PATH),
+        "upload",
+        full_rebuild,
+        use_stages,
+        config.CHUNK_SIZE,
+        config.CHUNK_OVERLAP,
+        config.COLLECTION_NAME,
+    )
+
+
+def setup_vector_database(full_rebuild=False, use_stages=None, resume=False):
+    """Main function to setup vector database with job data
+
+    Records are streamed from the CSV through cleaning, chunking and upload,
+    so memory stays bounded by the batch size rather than the corpus size.
+    Jobs whose content hash matches the one stored in Qdrant, or in the
+    document store for jobs without chunks, are skipped, and jobs that
+    vanished from the CSV are deleted.
+
+    With stage artifacts enabled, the raw, cleaned, chunked and embedded
+    outputs are saved as Parquet files, and stages whose inputs did not
+    change since the previous run are read back instead of recomputed.
+
+    Upload progress is checkpointed, so an interrupted run can be resumed
+    with the same data and settings without uploading everything again.
+
+    A full rebuild, or the first build, goes into a new versioned
+    collection. Once it is indexed and warmed, the COLLECTION_NAME alias
+    that search queries is switched to it atomically and old versions are
+    deleted, so search never sees a partial or still-indexing collection.
+    Each version writes its own document store, which search starts reading
+    when the alias switches and which is deleted with the version.
+    Incremental runs update the live collection in place.
+
+    Args:
+        full_rebuild: Re-embed and upload every job, even unchanged ones
+        use_stages: Persist and reuse stage artifacts, defaults to
+            USE_STAGE_ARTIFACTS
+        resume: Continue the upload of an interrupted run
+    """
+    if use_stages is None:
+        use_stages = config.USE_STAGE_ARTIFACTS
+    logger.info("Starting database setup process")
+
+    backend = get_backend()
+    checkpoint = UploadCheckpoint(
+        config.UPLOAD_CHECKPOINT_PATH, get_run_key(full_rebuild, use_stages)
+    )
+    live_collection = backend.get_live_collection()
+    # A resumed run compares jobs against the hashes it started from, since
+    # the partially uploaded jobs would otherwise look unchanged, and keeps
+    # uploading to the same collection
+    existing_hashes = checkpoint.resume() if resume else None
+    target_collection = checkpoint.collection
+    if (
+        existing_hashes is None
+        or target_collection is None
+        or not backend.collection_exists(target_collection)
+    ):
+        if (
+            not full_rebuild
+            and live_collection is not None
+            and backend.has_unhashed_points(live_collection)
+        ):
+            # Their jobs would be uploaded again next to the old points
+            logger.warning(
+                f"Collection {live_collection} has points without content hash, "
+                "rebuilding it in full"
+            )
+            full_rebuild = True
+        if full_rebuild or live_collection is None:
+            existing_hashes = {}
+            target_collection = backend.new_collection_version()
+        else:
+            existing_hashes = backend.fetch_job_content_hashes(live_collection)
+            # Jobs without chunks have no point to carry their hash
+            existing_hashes.update(
+                DocumentStore(
+                    version_store_path(live_collection)
+                ).chunkless_job_hashes()
+            )
+            target_collection = live_collection
+        checkpoint.start(existing_hashes, target_collection)
+    blue_green = target_collection != live_collection
+    logger.info(
+        f"Building new collection version {target_collection}"
+        if blue_green
+        else f"Updating live collection {target_collection} in place"
+    )
+    sync = IncrementalSync(existing_hashes)
+
+    # Chunk texts and job details go to the document store of the target
+    # version, Qdrant payloads only keep ids and filter fields
+    document_store = DocumentStore(version_store_path(target_collection), writable=True)
+    if not blue_green and not document_store.exists():
+        # Live versions built before each version had its own store start
+        # from the shared one
+        shared_store = DocumentStore(config.DOCUMENT_STORE_PATH)
+        if shared_store.exists():
+            logger.info(f"Copying the shared document store to {document_store.path}")
+            shared_store.copy_to(document_store)
+
+    logger.info(f"Streaming data from the CSV in batches of {config.CSV_BATCH_SIZE}")
+    logger.info(f"Uploading chunks to the {backend.name} vector backend")
+    with HtmlCleaner(config.HTML_CLEAN_WORKERS) as cleaner:
+        if use_stages:
+            upload_from_stages(
+                cleaner, sync, checkpoint, document_store, target_collection
+            )
+        else:
+            upload_chunks_to_vector_db(
+                iter_job_chunks(load_data_in_batches(), cleaner, sync),
+                checkpoint,
+                document_store,
+                target_collection,
+            )
+    chunkless_hashes = sync.chunkless_hashes()
+    if chunkless_hashes:
+        logger.info(f"Recording {len(chunkless_hashes)} jobs without chunks")
+        document_store.add_chunkless_jobs(chunkless_hashes)
+    logger.info(
+        f"Uploaded {len(sync.changed_hashes)} new or changed jobs, "
+        f"skipped {sync.unchanged_count} unchanged jobs"
+    )
 
     logger.info("creating field indexes")
-    field_names = ["category", "location", "company", "Level", "publication_date"]
-    create_field_indexes(field_names)
-    logger.info(f"Created index for fields: {field_names}")
+    backend.create_field_indexes(target_collection)
+
+    # Search result caches keyed on the previous version become stale
+    ingestion_version = f"{target_collection}@{datetime.now(timezone.utc).isoformat()}"
 
+    if blue_green:
+        # Switch only once the new version is complete and fast to query.
+        # The new store only holds jobs of the CSV, so it has no vanished jobs
+        backend.wait_until_indexed(target_collection)
+        backend.warm_collection(target_collection)
+        document_store.set_ingestion_version(ingestion_version)
+        # The two switches are not atomic. Switching the store first means
+        # the chunks search finds until the alias moves are mostly in it
+        # already, while chunks of the new collection would not be in the
+        # old store at all
+        previous_store = live_store_collection()
+        switch_live_store(target_collection)
+        try:
+            backend.switch_alias(target_collection)
+        except Exception:
+            # Search stays on the previous version, and so does its store
+            switch_live_store(previous_store)
+            raise
+        for version_name in backend.delete_old_versions():
+            delete_version_store(version_name)
+    elif existing_hashes:
+        backend.delete_stale_job_points(
+            {
+                job_id: content_hash
+                for job_id, content_hash in sync.changed_hashes.items()
+                if job_id in existing_hashes
+            },
+            target_collection,
+        )
+        vanished_job_ids = sync.vanished_job_ids()
+        if vanished_job_ids:
+            logger.info(f"Deleting {len(vanished_job_ids)} jobs no longer in the CSV")
+            backend.delete_job_points(vanished_job_ids, target_collection)
+            document_store.delete_jobs(vanished_job_ids)
+
+    if not blue_green:
+        document_store.set_ingestion_version(ingestion_version)
+        if live_store_path() != document_store.path:
+            switch_live_store(target_collection)
+    logger.info(f"Ingestion version is now {ingestion_version}")
+
+    checkpoint.clear()
     logger.info("Database setup completed successfully")
 
 
+def parse_args():
+    """Parse command line arguments of the setup script"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--full-rebuild",
+        action="store_true",
+        help="Re-embed every job into a new collection version and switch to it",
+    )
+    parser.add_argument(
+        "--stages",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Persist and reuse the output of each stage as Parquet artifacts",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the upload of an interrupted run from its checkpoint",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    setup_vector_database()
+    args = parse_args()
+    setup_vector_database(
+        full_rebuild=args.full_rebuild, use_stages=args.stages, resume=args.resume
+    )
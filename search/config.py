@@ -1,9 +1,49 @@
 """Search module configuration"""
 
+from pydantic import Field
+
 from common.base_config import BaseConfig
 
 
 class SearchConfig(BaseConfig):
-    """Configuration for search module - inherits all from base"""
+    """Configuration for search module - Search specific settings"""
+
+    # Cache of LLM query parsing results
+    QUERY_PARSE_CACHE_SIZE: int = Field(
+        default=10_000, description="Maximum number of cached parsed queries"
+    )
+    QUERY_PARSE_CACHE_TTL: float = Field(
+        default=3600.0, description="Seconds a parsed query stays cached"
+    )
+
+    # Rule-based parsing of simple queries without the LLM
+    RULE_PARSER_ENABLED: bool = Field(
+        default=True, description="Parse simple queries with rules before the LLM"
+    )
+    RULE_PARSER_MIN_CONFIDENCE: float = Field(
+        default=0.8, description="Minimum rule parser confidence to skip the LLM"
+    )
+
+    # Vector search started on the raw query while the query is parsed. Off
+    # by default: it only hits for LLM-parsed queries without filters whose
+    # words are unchanged, and costs one extra vector search otherwise
+    SPECULATIVE_SEARCH_ENABLED: bool = Field(
+        default=False, description="Search the raw query while the LLM parses it"
+    )
+    SPECULATIVE_PARSE_DEADLINE: float = Field(
+        default=5.0,
+        description="Seconds to wait for query parsing before using the speculative results",
+    )
+
+    # Cache of search results, invalidated by each ingestion
+    RESULT_CACHE_SIZE: int = Field(
+        default=2048, description="Maximum number of cached search results"
+    )
+    RESULT_CACHE_TTL: float = Field(
+        default=3600.0, description="Seconds a search result stays cached"
+    )
 
-    pass
+    # Batch search requests
+    BATCH_CONCURRENCY: int = Field(
+        default=8, description="LLM calls in flight per batch search request"
+    )
@@ -1,17 +1,29 @@
 """Search API router"""
 
+import json
 from datetime import datetime
+from typing import List
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from api_config import api_config
 from common.logger import get_logger
 from search.config import SearchConfig
 from search.exceptions import InvalidQueryError, SearchError
+from search.schemas.batch_query_request import BatchQueryRequest
+from search.schemas.batch_query_response import BatchQueryResponse
 from search.schemas.job_result import JobResult
 from search.schemas.query_request import QueryRequest
 from search.schemas.query_response import QueryResponse
-from search.services.search_service import SearchService, get_search_service
+from search.services.query_embedding import batcher, embedding_cache
+from search.services.query_parser import parse_cache
+from search.services.result_cache import result_cache
+from search.services.search_service import (
+    AsyncSearchService,
+    get_async_search_service,
+    speculation_stats,
+)
 
 config = SearchConfig()
 logger = get_logger(
@@ -22,12 +34,16 @@ router = APIRouter(prefix="/api", tags=["Search"])
 
 
 @router.post("/query", response_model=QueryResponse)
-def job_query(
-    request: QueryRequest, search_service: SearchService = Depends(get_search_service)
+async def job_query(
+    request: QueryRequest,
+    search_service: AsyncSearchService = Depends(get_async_search_service),
 ):
     """
     Search for jobs using natural language query.
 
+    The handler awaits the LLM and Qdrant calls, so a worker keeps serving
+    other requests while this one waits on them.
+
     Args:
         request: Query request containing search query and result limit
         search_service: Injected search service dependency
@@ -39,6 +55,161 @@ def job_query(
         InvalidQueryError: If query is empty or invalid
         SearchError: If search operation fails
     """
+    validate_query_request(request)
+
+    logger.info(f"Processing query: '{request.query}' (top={request.top})")
+
+    search_results = await search_service.search_jobs_and_generate_response(
+        request.query, request.top
+    )
+    unique_results, response_from_llm = search_results
+
+    return build_query_response(request, unique_results, response_from_llm)
+
+
+@router.post("/query/stream")
+async def job_query_stream(
+    request: QueryRequest,
+    search_service: AsyncSearchService = Depends(get_async_search_service),
+):
+    """
+    Search for jobs and stream the response as server-sent events.
+
+    The ranked jobs are sent as soon as retrieval finishes, before the LLM
+    starts writing its summary. Events, each with a JSON payload:
+
+    - ``jobs``: query, jobs and timestamp
+    - ``token``: the next piece of the summary, as text
+    - ``done``: success and the full summary
+
+    Args:
+        request: Query request containing search query and result limit
+        search_service: Injected search service dependency
+
+    Returns:
+        StreamingResponse of text/event-stream
+
+    Raises:
+        InvalidQueryError: If query is empty or invalid
+        SearchError: If search operation fails
+    """
+    validate_query_request(request)
+
+    logger.info(f"Processing streamed query: '{request.query}' (top={request.top})")
+
+    # Search errors are raised before the stream starts, as HTTP errors
+    unique_results = await search_service.find_jobs(request.query, request.top)
+    job_result = build_job_results(unique_results)
+
+    async def events():
+        yield format_event(
+            "jobs",
+            {
+                "query": request.query,
+                "jobs": [job.model_dump() for job in job_result],
+                "timestamp": datetime.now().isoformat(),
+            },
+        )
+        chunks = []
+        async for chunk in search_service.stream_response(
+            unique_results, request.query
+        ):
+            chunks.append(chunk)
+            yield format_event("token", {"text": chunk})
+        yield format_event("done", {"success": True, "response": "".join(chunks)})
+        logger.info(f"Streamed query processed, {len(job_result)} jobs")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/query/batch", response_model=BatchQueryResponse)
+async def job_query_batch(
+    request: BatchQueryRequest,
+    search_service: AsyncSearchService = Depends(get_async_search_service),
+):
+    """
+    Search for many natural language queries in one request.
+
+    Queries share parsing, one embedding batch and one Qdrant request.
+    LLM summaries are only generated for queries asking for them.
+
+    Args:
+        request: Batch request with the queries and their result limits
+        search_service: Injected search service dependency
+
+    Returns:
+        BatchQueryResponse with a QueryResponse for each query, in order,
+        whose response is empty when no summary was asked for
+
+    Raises:
+        InvalidQueryError: If any query is empty or invalid
+        SearchError: If search operation fails
+    """
+    for item in request.queries:
+        validate_query_request(item)
+
+    logger.info(f"Processing batch of {len(request.queries)} queries")
+
+    batch_results = await search_service.search_jobs_batch(
+        [(item.query, item.top, item.summarize) for item in request.queries]
+    )
+
+    return BatchQueryResponse(
+        success=True,
+        results=[
+            build_query_response(item, unique_results, response_from_llm or "")
+            for item, (unique_results, response_from_llm) in zip(
+                request.queries, batch_results
+            )
+        ],
+        timestamp=datetime.now().isoformat(),
+    )
+
+
+@router.get("/stats")
+def search_stats():
+    """
+    Report the caches and speculative searches of this worker.
+
+    Returns:
+        Stats of the result, query parse and query embedding caches, of
+        the query embedding batches and of the speculative searches
+    """
+    return {
+        "result_cache": result_cache.stats(),
+        "parse_cache": parse_cache.stats(),
+        "query_embedding_cache": embedding_cache.stats(),
+        "query_embedding_batches": batcher.stats(),
+        "speculation": speculation_stats.stats(),
+    }
+
+
+def format_event(event: str, data: dict) -> str:
+    """Format a server-sent event with a JSON payload
+
+    Args:
+        event: Event name
+        data: Payload of the event
+
+    Returns:
+        Event in text/event-stream format
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def validate_query_request(request: QueryRequest) -> None:
+    """Check a query request before searching
+
+    Args:
+        request: Query request containing search query and result limit
+
+    Raises:
+        InvalidQueryError: If query is empty or invalid
+    """
     # Principle 3: Validate inputs to prevent exceptions
     if not request.query or not request.query.strip():
         logger.warning("Empty query received")
@@ -52,12 +223,51 @@ def job_query(
         logger.warning(f"Invalid top value: {request.top}")
         raise InvalidQueryError("Top must be a positive integer")
 
-    logger.info(f"Processing query: '{request.query}' (top={request.top})")
 
-    unique_results, response_from_llm = (
-        search_service.search_jobs_and_generate_response(request.query, request.top)
+def build_query_response(
+    request: QueryRequest, unique_results, response_from_llm: str
+) -> QueryResponse:
+    """Build the API response from ranked results
+
+    Args:
+        request: Query request the results answer
+        unique_results: Ranked unique job results
+        response_from_llm: LLM-generated summary
+
+    Returns:
+        QueryResponse with matching jobs and LLM-generated response
+
+    Raises:
+        SearchError: If the results are invalid
+    """
+    job_result = build_job_results(unique_results)
+
+    logger.info(f"Query processed successfully, returning {len(job_result)} jobs")
+
+    return QueryResponse(
+        success=True,
+        query=request.query,
+        response=response_from_llm,
+        jobs=job_result,
+        timestamp=datetime.now().isoformat(),
     )
 
+
+def build_job_results(unique_results) -> List[JobResult]:
+    """Convert ranked results into API job results
+
+    The search service hydrates the results off the event loop, so this
+    does no I/O.
+
+    Args:
+        unique_results: Ranked unique job results, hydrated
+
+    Returns:
+        JobResult for each valid result, ranked from 1
+
+    Raises:
+        SearchError: If the results are invalid
+    """
     # Principle 3: Check for None results before processing
     if unique_results is None:
         logger.error("Search service returned None for unique_results")
@@ -104,12 +314,4 @@ def job_query(
             )
         )
 
-    logger.info(f"Query processed successfully, returning {len(job_result)} jobs")
-
-    return QueryResponse(
-        success=True,
-        query=request.query,
-        response=response_from_llm,
-        jobs=job_result,
-        timestamp=datetime.now().isoformat(),
-    )
+    return job_result
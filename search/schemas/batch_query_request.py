@@ -0,0 +1,22 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from api_config import api_config
+from search.schemas.query_request import QueryRequest
+
+
+class BatchQueryItem(QueryRequest):
+    """One query of a batch search request"""
+
+    summarize: bool = Field(
+        default=False, description="Generate the LLM summary of this query"
+    )
+
+
+class BatchQueryRequest(BaseModel):
+    """Request model for searching many job queries at once"""
+
+    queries: List[BatchQueryItem] = Field(
+        min_length=1, max_length=api_config.MAX_BATCH_QUERIES
+    )
@@ -0,0 +1,13 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from search.schemas.query_response import QueryResponse
+
+
+class BatchQueryResponse(BaseModel):
+    """Response model for a batch of job search queries"""
+
+    success: bool
+    results: List[QueryResponse]
+    timestamp: str
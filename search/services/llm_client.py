@@ -0,0 +1,84 @@
+"""Gemini model used by query parsing and response generation
+
+Setting LLM_MODEL to "stub" replaces Gemini by a local model that answers
+instantly from the prompt, so the API runs in tests and offline without
+an API key being used.
+"""
+
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+import google.generativeai as genai
+
+from common.logger import get_logger
+from search.config import SearchConfig
+
+config = SearchConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+STUB_MODEL = "stub"
+
+QUERY_PATTERN = re.compile(r'User Query: "(.*)"')
+JOB_TITLE_PATTERN = re.compile(r"^Job Title: (.*)$", re.MULTILINE)
+
+
+class StubModel:
+    """Local stand-in for genai.GenerativeModel
+
+    Parsing prompts are answered with the whole query as semantic query
+    and no filters, response prompts with a summary listing the job
+    titles, streamed word by word when asked to.
+    """
+
+    def answer(self, prompt: str) -> str:
+        """Deterministic answer to a prompt"""
+        match = QUERY_PATTERN.search(prompt)
+        query = match.group(1) if match else ""
+        if "query parser" in prompt:
+            return json.dumps({"semantic_query": query, "filters": {}})
+        titles = JOB_TITLE_PATTERN.findall(prompt)
+        return f"Found {len(titles)} jobs matching '{query}': {', '.join(titles)}."
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        text = self.answer(prompt)
+        if stream:
+            return [SimpleNamespace(text=chunk) for chunk in split_words(text)]
+        return SimpleNamespace(text=text)
+
+    async def generate_content_async(
+        self, prompt, generation_config=None, stream=False
+    ):
+        text = self.answer(prompt)
+        if stream:
+            return stream_chunks(split_words(text))
+        return SimpleNamespace(text=text)
+
+
+def split_words(text: str) -> list[str]:
+    """Split text into chunks of one word and its trailing space"""
+    return re.findall(r"\S+\s*", text)
+
+
+async def stream_chunks(chunks):
+    """Yield response chunks asynchronously, like a streamed Gemini response"""
+    for chunk in chunks:
+        # Hand control back to the event loop between chunks
+        await asyncio.sleep(0)
+        yield SimpleNamespace(text=chunk)
+
+
+def create_model():
+    """Create the LLM client configured by LLM_MODEL
+
+    Returns:
+        genai.GenerativeModel, or StubModel if LLM_MODEL is "stub"
+    """
+    if config.LLM_MODEL == STUB_MODEL:
+        logger.warning("Using the local stub LLM instead of Gemini")
+        return StubModel()
+    genai.configure(api_key=config.GEMINI_API_KEY)
+    return genai.GenerativeModel(config.LLM_MODEL)
@@ -8,28 +8,25 @@ from api_config import api_config
 from common.logger import get_logger
 from search.config import SearchConfig
 from search.exceptions import LLMError
+from search.services.llm_client import create_model
 
 config = SearchConfig()
 logger = get_logger(
     __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
 )
 
-genai.configure(api_key=config.GEMINI_API_KEY)
-model = genai.GenerativeModel(config.LLM_MODEL)
+model = create_model()
 
 
-def get_llm_response(unique_job_results, original_query):
-    """Generate natural language response from search results
+def validate_llm_request(unique_job_results, original_query):
+    """Check the inputs of a response generation request
 
     Args:
         unique_job_results: List of unique job results
         original_query: Original user query
 
-    Returns:
-        Generated response text
-
     Raises:
-        LLMError: If LLM response generation fails
+        LLMError: If there is nothing to generate a response for
     """
     # Principle 3: Validate inputs to prevent exceptions
     if not unique_job_results:
@@ -44,6 +41,97 @@ def get_llm_response(unique_job_results, original_query):
         logger.warning("Empty query provided to LLM service")
         raise LLMError("Cannot generate response for empty query")
 
+
+def generation_config():
+    """Generation settings of the response generation LLM call"""
+    return genai.types.GenerationConfig(
+        temperature=config.LLM_TEMPERATURE,
+        max_output_tokens=config.LLM_MAX_TOKENS,
+    )
+
+
+def read_response_text(response, elapsed):
+    """Extract the generated text from an LLM response
+
+    Args:
+        response: LLM response
+        elapsed: Seconds the LLM call took, for logging
+
+    Returns:
+        Generated response text
+
+    Raises:
+        LLMError: If the response is missing or empty
+    """
+    # Principle 3: Validate response before processing
+    if not response or not hasattr(response, "text"):
+        logger.error("Invalid LLM response structure")
+        raise LLMError("LLM returned invalid response structure")
+
+    if not response.text or not response.text.strip():
+        logger.error("LLM returned empty response")
+        raise LLMError("LLM returned empty response")
+
+    response_text = response.text.strip()
+
+    logger.info(f"LLM response generated in {elapsed:.2f}s, {len(response_text)} chars")
+    logger.debug(f"Response preview: {response_text[:100]}...")
+
+    return response_text
+
+
+def get_llm_response(unique_job_results, original_query):
+    """Generate natural language response from search results
+
+    Args:
+        unique_job_results: List of unique job results, hydrated
+        original_query: Original user query
+
+    Returns:
+        Generated response text
+
+    Raises:
+        LLMError: If LLM response generation fails
+    """
+    validate_llm_request(unique_job_results, original_query)
+
+    logger.info(f"Generating LLM response for {len(unique_job_results)} jobs")
+
+    formatted_unique_jobs = format_job_for_response(unique_job_results)
+    prompt = prompt_for_llm_response(formatted_unique_jobs, original_query)
+
+    logger.debug("Sending request to LLM for response generation")
+
+    start_time = datetime.now()
+
+    # Principle 2: Use specific exception handling for LLM API calls
+    try:
+        response = model.generate_content(prompt, generation_config=generation_config())
+    except Exception as e:
+        logger.error(f"LLM API call failed: {e}")
+        raise LLMError(f"Failed to generate response: {str(e)}") from e
+
+    elapsed = (datetime.now() - start_time).total_seconds()
+    return read_response_text(response, elapsed)
+
+
+async def get_llm_response_async(unique_job_results, original_query):
+    """Async variant of get_llm_response, awaiting the LLM call
+
+    Results should already be hydrated, formatting them then does no I/O.
+
+    Args:
+        unique_job_results: List of unique job results
+        original_query: Original user query
+
+    Returns:
+        Generated response text
+
+    Raises:
+        LLMError: If LLM response generation fails
+    """
+    validate_llm_request(unique_job_results, original_query)
+
     logger.info(f"Generating LLM response for {len(unique_job_results)} jobs")
 
     formatted_unique_jobs = format_job_for_response(unique_job_results)
@@ -55,41 +143,75 @@ def get_llm_response(unique_job_results, original_query):
 
     # Principle 2: Use specific exception handling for LLM API calls
     try:
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=config.LLM_TEMPERATURE,
-                max_output_tokens=config.LLM_MAX_TOKENS,
-            ),
+        response = await model.generate_content_async(
+            prompt, generation_config=generation_config()
         )
     except Exception as e:
         logger.error(f"LLM API call failed: {e}")
         raise LLMError(f"Failed to generate response: {str(e)}") from e
 
     elapsed = (datetime.now() - start_time).total_seconds()
+    return read_response_text(response, elapsed)
 
-    # Principle 3: Validate response before processing
-    if not response or not hasattr(response, "text"):
-        logger.error("Invalid LLM response structure")
-        raise LLMError("LLM returned invalid response structure")
 
-    if not response.text or not response.text.strip():
-        logger.error("LLM returned empty response")
-        raise LLMError("LLM returned empty response")
+async def stream_llm_response(unique_job_results, original_query):
+    """Generate the response from search results, yielding text as it arrives
 
-    response_text = response.text.strip()
+    Results should already be hydrated, formatting them then does no I/O.
 
-    logger.info(f"LLM response generated in {elapsed:.2f}s, {len(response_text)} chars")
-    logger.debug(f"Response preview: {response_text[:100]}...")
+    Args:
+        unique_job_results: List of unique job results
+        original_query: Original user query
 
-    return response_text
+    Yields:
+        Chunks of the generated response text
+
+    Raises:
+        LLMError: If LLM response generation fails, possibly after some
+            chunks were yielded
+    """
+    validate_llm_request(unique_job_results, original_query)
+
+    logger.info(f"Streaming LLM response for {len(unique_job_results)} jobs")
+
+    formatted_unique_jobs = format_job_for_response(unique_job_results)
+    prompt = prompt_for_llm_response(formatted_unique_jobs, original_query)
+
+    start_time = datetime.now()
+    length = 0
+
+    # Principle 2: Use specific exception handling for LLM API calls
+    try:
+        response = await model.generate_content_async(
+            prompt, generation_config=generation_config(), stream=True
+        )
+        async for chunk in response:
+            # Chunks without text, such as a final safety rating, are skipped
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+            if text:
+                length += len(text)
+                yield text
+    except Exception as e:
+        logger.error(f"LLM streaming call failed: {e}")
+        raise LLMError(f"Failed to generate response: {str(e)}") from e
+
+    # Principle 3: Validate response before finishing
+    if not length:
+        logger.error("LLM returned empty response")
+        raise LLMError("LLM returned empty response")
+
+    elapsed = (datetime.now() - start_time).total_seconds()
+    logger.info(f"LLM response streamed in {elapsed:.2f}s, {length} chars")
 
 
 def format_job_for_response(unique_job_results):
     """Format job results for LLM prompt
 
     Args:
-        unique_job_results: List of job results
+        unique_job_results: List of job results, hydrated
 
     Returns:
         Formatted string representation of jobs
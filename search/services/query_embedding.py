@@ -0,0 +1,286 @@
+"""Query embedding for hybrid search
+
+Queries are embedded with the same dense and sparse models as the indexed
+chunks, and sent to Qdrant as raw vectors. The models are loaded on first
+use and shared by every request. Vectors of recent queries are kept in an
+LRU cache, optionally pre-warmed with frequent queries at startup.
+
+Async callers go through a micro-batcher: queries arriving within a few
+milliseconds of each other are embedded together in one batched model
+call instead of one inference per request.
+"""
+
+import asyncio
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from fastembed import SparseTextEmbedding, TextEmbedding
+from qdrant_client import models
+
+from common.logger import get_logger
+from common.qdrant_config import QdrantConfig
+from common.ttl_cache import TTLCache
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+_dense_model: TextEmbedding | None = None
+_sparse_model: SparseTextEmbedding | None = None
+_lock = threading.Lock()
+
+# Query vectors keyed by (dense model, sparse model, normalized query)
+embedding_cache = TTLCache(config.QUERY_EMBEDDING_CACHE_SIZE)
+
+
+def get_query_models() -> tuple[TextEmbedding, SparseTextEmbedding]:
+    """Get the shared dense and sparse query models, loading them on first use
+
+    Returns:
+        Tuple of (dense model, sparse model)
+    """
+    global _dense_model, _sparse_model
+    if _dense_model is None or _sparse_model is None:
+        with _lock:
+            if _dense_model is None or _sparse_model is None:
+                logger.info(
+                    f"Loading query models {config.DENSE_MODEL} and "
+                    f"{config.SPARSE_MODEL}"
+                )
+                _dense_model = TextEmbedding(model_name=config.DENSE_MODEL)
+                _sparse_model = SparseTextEmbedding(model_name=config.SPARSE_MODEL)
+    return _dense_model, _sparse_model
+
+
+def normalize_query_text(query: str) -> str:
+    """Normalize a query for embedding
+
+    Both models ignore case and extra whitespace, so queries differing only
+    in those share their vectors.
+    """
+    return " ".join(query.split()).casefold()
+
+
+def embedding_key(text: str) -> tuple[str, str, str]:
+    """Cache key of a normalized query"""
+    return (config.DENSE_MODEL, config.SPARSE_MODEL, text)
+
+
+def to_query_vectors(dense, sparse) -> tuple[list[float], models.SparseVector]:
+    """Convert model outputs into vectors accepted by Qdrant"""
+    return dense.tolist(), models.SparseVector(
+        indices=sparse.indices.tolist(), values=sparse.values.tolist()
+    )
+
+
+def embed_query(query: str) -> tuple[list[float], models.SparseVector]:
+    """Embed a search query with the dense and sparse models
+
+    This is CPU-bound, async callers should run it in a worker thread.
+    Cached vectors are returned without running the models.
+
+    Args:
+        query: Search query string
+
+    Returns:
+        Tuple of (dense vector, sparse vector)
+    """
+    text = normalize_query_text(query)
+    key = embedding_key(text)
+    vectors = embedding_cache.get(key)
+    if vectors is not None:
+        return vectors
+
+    (vectors,) = embed_texts([text])
+    return vectors
+
+
+def embed_texts(texts: list[str]) -> list[tuple[list[float], models.SparseVector]]:
+    """Embed normalized queries in one batched call per model and cache them
+
+    Args:
+        texts: Normalized query texts
+
+    Returns:
+        Tuple of (dense vector, sparse vector) for each text
+    """
+    dense_model, sparse_model = get_query_models()
+    batch = [
+        to_query_vectors(dense, sparse)
+        for dense, sparse in zip(
+            dense_model.query_embed(texts), sparse_model.query_embed(texts)
+        )
+    ]
+    for text, vectors in zip(texts, batch):
+        embedding_cache.put(embedding_key(text), vectors)
+    return batch
+
+
+def embed_queries(
+    queries: list[str],
+) -> list[tuple[list[float], models.SparseVector]]:
+    """Embed many search queries, the uncached ones in a single batch
+
+    This is CPU-bound, async callers should run it in a worker thread.
+
+    Args:
+        queries: Search query strings
+
+    Returns:
+        Tuple of (dense vector, sparse vector) for each query, in order
+    """
+    texts = [normalize_query_text(query) for query in queries]
+    vectors = {text: embedding_cache.get(embedding_key(text)) for text in texts}
+    missing = [text for text, cached in vectors.items() if cached is None]
+    if missing:
+        vectors.update(zip(missing, embed_texts(missing)))
+    return [vectors[text] for text in texts]
+
+
+class QueryEmbeddingBatcher:
+    """Embeds the queries of concurrent requests in shared batches
+
+    A query waits at most max_wait seconds for others to join its batch,
+    and a batch is embedded as soon as it holds max_batch_size distinct
+    queries. One batch runs at a time: queries arriving meanwhile form the
+    next batch, so batches grow with the load. Must be used from a single
+    event loop.
+
+    Args:
+        max_batch_size: Maximum number of distinct queries per batch
+        max_wait: Seconds the first query of a batch waits for others
+    """
+
+    def __init__(self, max_batch_size: int, max_wait: float):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.batches = 0
+        self.embedded = 0
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: asyncio.Task | None = None
+
+    async def embed(self, query: str) -> tuple[list[float], models.SparseVector]:
+        """Embed a query in the next batch
+
+        Args:
+            query: Search query string
+
+        Returns:
+            Tuple of (dense vector, sparse vector)
+        """
+        text = normalize_query_text(query)
+        vectors = embedding_cache.get(embedding_key(text))
+        if vectors is not None:
+            return vectors
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(text, []).append(future)
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Start embedding the pending queries, unless a batch is running"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._running is not None or not self._pending:
+            # The running batch flushes the pending queries when it ends
+            return
+        texts = list(self._pending)[: self.max_batch_size]
+        batch = {text: self._pending.pop(text) for text in texts}
+        self._running = asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch: dict[str, list[asyncio.Future]]) -> None:
+        """Embed one batch and resolve the futures of its callers"""
+        try:
+            results = await asyncio.to_thread(embed_texts, list(batch))
+        except Exception as e:
+            logger.error(f"Batched query embedding failed: {e}")
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+        else:
+            self.batches += 1
+            self.embedded += len(batch)
+            for futures, vectors in zip(batch.values(), results):
+                for future in futures:
+                    # Callers may have been cancelled meanwhile
+                    if not future.done():
+                        future.set_result(vectors)
+        finally:
+            self._running = None
+            if self._pending:
+                self._flush()
+
+    def stats(self) -> dict:
+        """Number of batches and queries embedded, and the mean batch size"""
+        return {
+            "batches": self.batches,
+            "embedded": self.embedded,
+            "mean_batch_size": self.embedded / self.batches if self.batches else 0.0,
+        }
+
+
+batcher = QueryEmbeddingBatcher(
+    config.QUERY_EMBEDDING_BATCH_SIZE, config.QUERY_EMBEDDING_BATCH_WAIT
+)
+
+
+async def embed_query_async(query: str) -> tuple[list[float], models.SparseVector]:
+    """Embed a search query without blocking the event loop
+
+    Concurrent queries share batched model calls unless
+    QUERY_EMBEDDING_BATCH_WAIT is 0.
+
+    Args:
+        query: Search query string
+
+    Returns:
+        Tuple of (dense vector, sparse vector)
+    """
+    if config.QUERY_EMBEDDING_BATCH_WAIT <= 0:
+        return await asyncio.to_thread(embed_query, query)
+    return await batcher.embed(query)
+
+
+def warm_query_embeddings(queries: Iterable[str]) -> int:
+    """Embed queries in batches and cache their vectors
+
+    Args:
+        queries: Frequent search queries
+
+    Returns:
+        Number of distinct queries embedded
+    """
+    texts = list(dict.fromkeys(filter(None, map(normalize_query_text, queries))))
+    if not texts:
+        return 0
+    embed_texts(texts)
+    logger.info(f"Warmed query embedding cache with {len(texts)} queries")
+    return len(texts)
+
+
+def prewarm_query_embeddings() -> int:
+    """Warm the query embedding cache from QUERY_EMBEDDING_WARMUP_PATH
+
+    Returns:
+        Number of distinct queries embedded, 0 if no file is configured
+    """
+    if not config.QUERY_EMBEDDING_WARMUP_PATH:
+        return 0
+    path = Path(config.QUERY_EMBEDDING_WARMUP_PATH)
+    # Principle 2: A missing warm-up file only makes the first queries slower
+    try:
+        queries = path.read_text(encoding="utf-8").splitlines()
+    except OSError as e:
+        logger.warning(f"Could not read warm-up queries from {path}: {e}")
+        return 0
+    return warm_query_embeddings(queries)
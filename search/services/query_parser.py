@@ -1,5 +1,6 @@
 """Query parsing and filter extraction using LLM"""
 
+import copy
 import json
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
@@ -7,15 +8,20 @@ from typing import Any, Dict, Optional
 import google.generativeai as genai
 
 from common.logger import get_logger
+from common.ttl_cache import TTLCache
 from search.config import SearchConfig
+from search.services.llm_client import create_model
+from search.services.rule_parser import parse_with_rules
 
 config = SearchConfig()
 logger = get_logger(
     __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
 )
 
-genai.configure(api_key=config.GEMINI_API_KEY)
-model = genai.GenerativeModel(config.LLM_MODEL)
+model = create_model()
+
+# Parsed queries keyed by normalized query, date ranges kept relative
+parse_cache = TTLCache(config.QUERY_PARSE_CACHE_SIZE, config.QUERY_PARSE_CACHE_TTL)
 
 
 def build_parsing_prompt(query):
@@ -207,9 +213,12 @@ def build_parsing_prompt(query):
     return prompt
 
 
-def extract_json_from_response(response_text: str) -> Optional[Dict[str, Any]]:
+def extract_parsed_query(response_text: str) -> Optional[Dict[str, Any]]:
     """
-    Extract JSON object from LLM response
+    Extract JSON object from LLM response, keeping relative date ranges
+
+    A date range stays as {"days": n}, so the result can be cached and
+    resolved against the current time whenever it is used.
 
     Args:
         response_text: LLM response text
@@ -230,34 +239,13 @@ def extract_json_from_response(response_text: str) -> Optional[Dict[str, Any]]:
 
             # Clean up filters (remove null values)
             if "filters" in result:
-                # Handle date_range conversion
+                date_range_input = result["filters"].get("date_range")
                 if (
-                    "date_range" in result["filters"]
-                    and result["filters"]["date_range"]
+                    isinstance(date_range_input, dict)
+                    and "days" in date_range_input
+                    and not date_range_input["days"]
                 ):
-                    date_range_input = result["filters"]["date_range"]
-                    if (
-                        isinstance(date_range_input, dict)
-                        and "days" in date_range_input
-                    ):
-                        days = date_range_input["days"]
-                        if days:
-                            # Calculate date range
-                            now = datetime.now(timezone.utc)
-                            past_date = now - timedelta(days=days)
-
-                            # Convert to RFC 3339 format with 'Z' suffix to match data format
-                            result["filters"]["date_range"] = {
-                                "gte": past_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                                "lte": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                                "gt": None,
-                                "lt": None,
-                            }
-                            logger.debug(
-                                f"converted date_range to proper format from last {days} days"
-                            )
-                        else:
-                            result["filters"]["date_range"] = None
+                    result["filters"]["date_range"] = None
 
                 # Remove null values
                 result["filters"] = {
@@ -277,6 +265,162 @@ def extract_json_from_response(response_text: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def resolve_relative_dates(parsed_query: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a relative date range into timestamps ending now
+
+    Args:
+        parsed_query: Parsed query, possibly with a {"days": n} date range
+
+    Returns:
+        Copy of the parsed query with the date range as gte/lte timestamps
+    """
+    result = copy.deepcopy(parsed_query)
+    filters = result.get("filters") or {}
+    date_range_input = filters.get("date_range")
+    if isinstance(date_range_input, dict) and date_range_input.get("days"):
+        days = date_range_input["days"]
+        # Calculate date range, to the minute so that repeated queries
+        # share their filters and cached results
+        now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        past_date = now - timedelta(days=days)
+
+        # Convert to RFC 3339 format with 'Z' suffix to match data format
+        filters["date_range"] = {
+            "gte": past_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "lte": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "gt": None,
+            "lt": None,
+        }
+        logger.debug(f"converted date_range to proper format from last {days} days")
+    return result
+
+
+def extract_json_from_response(response_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract JSON object from LLM response
+
+    Args:
+        response_text: LLM response text
+
+    Returns:
+        Parsed JSON dict with date ranges as timestamps, or None
+    """
+    result = extract_parsed_query(response_text)
+    return resolve_relative_dates(result) if result else result
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query into its parse cache key"""
+    return " ".join(query.split()).casefold()
+
+
+def generation_config():
+    """Generation settings of the query parsing LLM call"""
+    return genai.types.GenerationConfig(
+        temperature=config.LLM_TEMPERATURE,
+        max_output_tokens=config.LLM_MAX_TOKENS,
+    )
+
+
+def read_parsed_query(response):
+    """Extract the parsed query from an LLM response
+
+    Args:
+        response: LLM response to the parsing prompt
+
+    Returns:
+        Dictionary with semantic_query and filters, date ranges kept
+        relative, or None if unusable
+    """
+    # Principle 3: Check response validity before processing
+    if not response or not hasattr(response, "text"):
+        logger.warning("Invalid LLM response structure")
+        return None
+
+    if not response.text or not response.text.strip():
+        logger.warning("Empty LLM response text")
+        return None
+
+    result = extract_parsed_query(response.text)
+
+    if result:
+        logger.info("Query parsed successfully")
+        logger.debug(f"Parsed result: {result}")
+    else:
+        logger.warning("Failed to parse LLM response, will use original query")
+
+    return result
+
+
+def cache_parsed_query(cache_key, parsed_query):
+    """Cache a successfully parsed query and resolve its date range
+
+    Args:
+        cache_key: Normalized query
+        parsed_query: Parsed query with relative date ranges, or None
+
+    Returns:
+        Parsed query with date ranges as timestamps, or None
+    """
+    if not parsed_query:
+        return None
+    parse_cache.put(cache_key, parsed_query)
+    return resolve_relative_dates(parsed_query)
+
+
+def is_parsable(query) -> bool:
+    """Check that a query has something to parse"""
+    # Principle 3: Validate inputs to prevent exceptions
+    if not query or not query.strip():
+        logger.warning("Empty query provided to parser")
+        return False
+    return True
+
+
+def parse_without_llm(query):
+    """Parse a query by rules or from the parse cache
+
+    Shared by the sync and async parsers, which only differ in how they
+    call the LLM.
+
+    Args:
+        query: Natural language search query, not empty
+
+    Returns:
+        Parsed query with date ranges as timestamps, or None if the LLM
+        has to parse it
+    """
+    parsed = parse_with_rules(query)
+    if parsed is not None:
+        logger.info(f"Query parsed by rules: {query}")
+        return resolve_relative_dates(parsed)
+
+    cached = parse_cache.get(normalize_query(query))
+    if cached is not None:
+        logger.info(f"Parsed query found in cache: {query}")
+        return resolve_relative_dates(cached)
+
+    logger.info(f"Parsing query: {query}")
+    return None
+
+
+def read_llm_parse(query, response, start_time):
+    """Read, cache and resolve the LLM parse of a query
+
+    Args:
+        query: Natural language search query
+        response: LLM response to the parsing prompt
+        start_time: Time the LLM call started
+
+    Returns:
+        Parsed query with date ranges as timestamps, or None if unusable
+    """
+    elapsed = (datetime.now() - start_time).total_seconds()
+    logger.debug(f"LLM response received in {elapsed:.2f}s")
+    return cache_parsed_query(normalize_query(query), read_parsed_query(response))
+
+
 def convert_query_to_semantic_and_filter(query):
     """Convert natural language query to semantic query and filters
 
@@ -289,50 +433,61 @@ def convert_query_to_semantic_and_filter(query):
     Note:
         This function returns None on LLM failures to allow fallback to original query.
         It does not raise exceptions as query parsing is not critical to search.
+        Simple queries are parsed by rules without calling the LLM. Parsed
+        queries are cached by normalized query, failures are not.
     """
-    # Principle 3: Validate inputs to prevent exceptions
-    if not query or not query.strip():
-        logger.warning("Empty query provided to parser")
+    if not is_parsable(query):
         return None
 
-    logger.info(f"Parsing query: {query}")
-    prompt = build_parsing_prompt(query)
-    logger.debug("Sending query to LLM for parsing")
+    parsed = parse_without_llm(query)
+    if parsed is not None:
+        return parsed
 
+    logger.debug("Sending query to LLM for parsing")
     start_time = datetime.now()
 
     # Principle 2: Use specific exception handling for LLM API calls
     try:
         response = model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=config.LLM_TEMPERATURE,
-                max_output_tokens=config.LLM_MAX_TOKENS,
-            ),
+            build_parsing_prompt(query), generation_config=generation_config()
         )
     except Exception as e:
         # LLM failures should not break search - return None to use original query
         logger.warning(f"LLM API call failed during query parsing: {e}")
         return None
 
-    elapsed = (datetime.now() - start_time).total_seconds()
-    logger.debug(f"LLM response received in {elapsed:.2f}s")
+    return read_llm_parse(query, response, start_time)
 
-    # Principle 3: Check response validity before processing
-    if not response or not hasattr(response, "text"):
-        logger.warning("Invalid LLM response structure")
-        return None
 
-    if not response.text or not response.text.strip():
-        logger.warning("Empty LLM response text")
+async def convert_query_to_semantic_and_filter_async(query):
+    """Async variant of convert_query_to_semantic_and_filter
+
+    Awaits the LLM call instead of blocking a thread on it.
+
+    Args:
+        query: Natural language search query
+
+    Returns:
+        Dictionary with semantic_query and filters, or None on failure
+    """
+    if not is_parsable(query):
         return None
 
-    result = extract_json_from_response(response.text)
+    parsed = parse_without_llm(query)
+    if parsed is not None:
+        return parsed
 
-    if result:
-        logger.info("Query parsed successfully")
-        logger.debug(f"Parsed result: {result}")
-    else:
-        logger.warning("Failed to parse LLM response, will use original query")
+    logger.debug("Sending query to LLM for parsing")
+    start_time = datetime.now()
 
-    return result
+    # Principle 2: Use specific exception handling for LLM API calls
+    try:
+        response = await model.generate_content_async(
+            build_parsing_prompt(query), generation_config=generation_config()
+        )
+    except Exception as e:
+        # LLM failures should not break search - return None to use original query
+        logger.warning(f"LLM API call failed during query parsing: {e}")
+        return None
+
+    return read_llm_parse(query, response, start_time)
@@ -0,0 +1,150 @@
+"""Cache of ranked search results
+
+Results are keyed by the semantic query, the canonical form of the Qdrant
+filter and the number of results, and tagged with the ingestion version
+the setup script writes to the document store. When a new ingestion
+completes the version changes and every cached result is dropped.
+"""
+
+import sqlite3
+from typing import Any, List, Optional
+
+from qdrant_client import models
+
+from common.document_store import get_document_store, store_version
+from common.logger import get_logger
+from common.payload_fields import canonical_filter
+from common.ttl_cache import TTLCache
+from search.config import SearchConfig
+from search.services.query_parser import normalize_query
+
+config = SearchConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+
+# Store files version and the ingestion version read at that time
+_last_read = (None, None)
+
+
+def current_ingestion_version() -> str | None:
+    """Ingestion version recorded in the document store, None if unknown
+
+    The store is only queried when its files changed since the last read,
+    so most calls cost a few stats and no SQLite query on the event loop.
+    """
+    global _last_read
+    store = get_document_store()
+    files_version = store_version(store)
+    if files_version is None:
+        return None
+    if files_version == _last_read[0]:
+        return _last_read[1]
+    # Principle 2: Without a version, results are still cached until evicted
+    try:
+        version = store.ingestion_version()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not read the ingestion version: {e}")
+        return None
+    _last_read = (files_version, version)
+    return version
+
+
+class ResultCache:
+    """Ranked search results of the current ingestion version
+
+    Args:
+        max_size: Maximum number of cached results, 0 disables the cache
+        ttl: Seconds a result stays cached
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None):
+        self.cache = TTLCache(max_size, ttl)
+        self.version = None
+        self.invalidations = 0
+
+    def check_version(self) -> str | None:
+        """Drop every cached result if a new ingestion completed
+
+        Returns:
+            Current ingestion version
+        """
+        version = current_ingestion_version()
+        if version != self.version:
+            if self.version is not None or len(self.cache):
+                logger.info(f"Ingestion version changed to {version}, clearing results")
+                self.invalidations += 1
+            self.cache.clear()
+            self.version = version
+        return version
+
+    def key(self, semantic_query: str, filters: models.Filter | None, top: int):
+        """Cache key of a search, equal for searches with the same results
+
+        Args:
+            semantic_query: Semantic query searched for
+            filters: Qdrant filter of the search
+            top: Number of results
+
+        Returns:
+            Tuple of version, normalized query, canonical filter and top
+        """
+        return (
+            self.version,
+            normalize_query(semantic_query),
+            canonical_filter(filters),
+            top,
+        )
+
+    def get(
+        self, semantic_query: str, filters: models.Filter | None, top: int
+    ) -> Optional[List[Any]]:
+        """Look up the results of a search
+
+        Args:
+            semantic_query: Semantic query searched for
+            filters: Qdrant filter of the search
+            top: Number of results
+
+        Returns:
+            Copy of the cached results, or None
+        """
+        self.check_version()
+        results = self.cache.get(self.key(semantic_query, filters, top))
+        if results is None:
+            return None
+        logger.info(f"Search results found in cache: '{semantic_query}'")
+        return list(results)
+
+    def put(
+        self,
+        semantic_query: str,
+        filters: models.Filter | None,
+        top: int,
+        results: List[Any],
+    ) -> None:
+        """Cache the results of a search
+
+        Args:
+            semantic_query: Semantic query searched for
+            filters: Qdrant filter of the search
+            top: Number of results
+            results: Ranked unique results
+        """
+        self.cache.put(self.key(semantic_query, filters, top), list(results))
+
+    def stats(self) -> dict:
+        """Counters of the cache, with the ingestion version
+
+        Returns:
+            TTLCache stats plus version and invalidations
+        """
+        return {
+            **self.cache.stats(),
+            "version": self.version,
+            "invalidations": self.invalidations,
+        }
+
+
+result_cache = ResultCache(config.RESULT_CACHE_SIZE, config.RESULT_CACHE_TTL)
@@ -0,0 +1,441 @@
+"""Rule-based fast path of the query parser
+
+Simple queries such as "senior python developer in London" or "jobs from
+last week" are parsed locally. Job levels, categories, companies and
+locations are looked up in gazetteers built from the indexed job values,
+and relative dates in the phrase table the LLM prompt documents. The
+result has the structure the LLM parser returns, plus a confidence score,
+and queries the rules cannot fully account for are left to the LLM.
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from common.document_store import DocumentStore, get_document_store, store_version
+from common.logger import get_logger
+from common.payload_fields import (
+    LEVEL_ALIASES,
+    company_keywords,
+    location_keywords,
+    normalize_level,
+)
+from search.config import SearchConfig
+
+config = SearchConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+# Words, keeping names such as "c++", "c#", "node.js" and "at&t" whole
+WORD_PATTERN = re.compile(r"[^\W_]+(?:[&'.][^\W_]+)*[+#]*")
+
+# Values listed in the LLM parsing prompt, known even without a document store
+DEFAULT_LEVELS = ["Senior Level", "Mid Level", "Entry Level", "Internship"]
+DEFAULT_CATEGORIES = [
+    "Software Engineering",
+    "Data and Analytics",
+    "Design and UX",
+    "Sales",
+    "Project Management",
+    "Advertising and Marketing",
+    "General",
+]
+
+# Single words that name a category on their own
+CATEGORY_ALIASES = {
+    "software": "Software Engineering",
+    "analytics": "Data and Analytics",
+    "design": "Design and UX",
+    "designer": "Design and UX",
+    "ux": "Design and UX",
+    "marketing": "Advertising and Marketing",
+    "advertising": "Advertising and Marketing",
+}
+
+# Words dropped from the semantic query
+FILLER_WORDS = frozenset(
+    {
+        "a", "all", "an", "any", "around", "at", "based", "find", "for", "from",
+        "i", "in", "job", "jobs", "list", "looking", "me", "near", "need", "of",
+        "opening", "openings", "opportunities", "opportunity", "position",
+        "positions", "posted", "posting", "postings", "published", "role",
+        "roles", "search", "show", "some", "the", "vacancies", "vacancy",
+        "want", "with",
+    }
+)  # fmt: skip
+
+# Words too generic to identify a company, location or category by themselves
+GENERIC_WORDS = FILLER_WORDS | {"general", "and", "new", "technology", "group"}
+
+# Filters whose words also describe the role, and stay in the semantic query
+SEMANTIC_FIELDS = frozenset({"category"})
+
+# Words before a company name that make a weak company match certain
+COMPANY_CUES = frozenset({"at"})
+
+# Prepositions whose object must be recognized for the parse to be complete
+CONSTRAINT_WORDS = frozenset({"in", "at", "near", "around", "based"})
+
+# Words that change the meaning of a query in ways the rules cannot express
+NEGATION_WORDS = frozenset(
+    {"not", "no", "except", "excluding", "without", "non", "but", "or", "nor"}
+)
+
+# Relative date phrases, as documented in the parsing prompt
+NUMBER_WORDS = {
+    "a": 1,
+    "an": 1,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+    "twelve": 12,
+}
+UNIT_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+DATE_PREFIX = (
+    r"(?:(?:posted|published|listed)\s+)?"
+    r"(?:(?:in|from|within|during|over|for)\s+)?(?:the\s+)?"
+)
+NUMBER = rf"(\d+|{'|'.join(NUMBER_WORDS)})"
+# A year is only a date when a word says so: "sql server 2019" is a product
+YEAR_PREFIX = (
+    r"(?:(?:posted|published|listed)\s+(?:(?:in|since|during)\s+)?"
+    r"|(?:in|from|since|during)\s+)(?:the\s+year\s+)?"
+)
+YEAR_PATTERN = re.compile(r"20\d\d")
+# Matched against the query as typed, so their spans index the original text
+DATE_PATTERNS = [
+    (
+        "count",
+        re.compile(
+            rf"\b{DATE_PREFIX}(?:last|past)\s+{NUMBER}\s+(day|week|month|year)s?\b",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "unit",
+        re.compile(
+            rf"\b{DATE_PREFIX}(?:last|past|this)\s+(day|week|month|year)\b",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "recent",
+        re.compile(
+            rf"\b{DATE_PREFIX}(?:most\s+)?(?:recent|latest|newest)\b", re.IGNORECASE
+        ),
+    ),
+    ("today", re.compile(rf"\b{DATE_PREFIX}today\b", re.IGNORECASE)),
+    ("year", re.compile(rf"\b{YEAR_PREFIX}(20\d\d)\b", re.IGNORECASE)),
+]
+
+# Confidence penalties
+AMBIGUOUS_PENALTY = 0.5
+UNRESOLVED_PENALTY = 0.3
+MULTIPLE_DATES_PENALTY = 0.5
+WEAK_MATCH_PENALTY = 0.5
+# Semantic queries longer than this many words are less likely simple
+MAX_SIMPLE_WORDS = 6
+
+
+def tokenize(text: str) -> list[tuple[str, int, int]]:
+    """Split text into lowercase words with their character spans"""
+    return [
+        (match.group().casefold(), match.start(), match.end())
+        for match in WORD_PATTERN.finditer(text)
+    ]
+
+
+class Gazetteer:
+    """Phrases of the indexed job values, keyed by their words
+
+    A phrase maps to every (filter, value) pair it names, more than one
+    making it ambiguous. Weak phrases may just as well mean something else,
+    such as "python" for the Python Software Foundation.
+    """
+
+    def __init__(self):
+        self.phrases: dict[tuple[str, ...], set[tuple[str, str]]] = {}
+        self.weak: set[tuple[tuple[str, ...], str, str]] = set()
+        self.max_words = 1
+
+    def add(
+        self,
+        field: str,
+        phrase: str,
+        value: str,
+        min_length: int = 1,
+        weak: bool = False,
+    ) -> None:
+        """Add a phrase naming a filter value
+
+        Args:
+            field: Filter name, as in the LLM parser output
+            phrase: Text naming the value
+            value: Filter value the phrase stands for
+            min_length: Minimum length of a single-word phrase
+            weak: Whether the phrase names the value only in some queries
+        """
+        words = tuple(word for word, _, _ in tokenize(phrase))
+        if not words:
+            return
+        if len(words) == 1 and (
+            len(words[0]) < min_length or words[0] in GENERIC_WORDS
+        ):
+            return
+        self.phrases.setdefault(words, set()).add((field, value))
+        if weak:
+            self.weak.add((words, field, value))
+        self.max_words = max(self.max_words, len(words))
+
+    def longest_match(self, words: list[str], start: int):
+        """Find the longest phrase starting at a word
+
+        Args:
+            words: Words of the query
+            start: Position of the first word
+
+        Returns:
+            Tuple of (number of words, set of (field, value)), (0, None) if
+            no phrase starts there
+        """
+        for length in range(min(self.max_words, len(words) - start), 0, -1):
+            matches = self.phrases.get(tuple(words[start : start + length]))
+            if matches:
+                return length, matches
+        return 0, None
+
+
+def build_gazetteer(store: DocumentStore | None) -> Gazetteer:
+    """Build the gazetteer from the job values in the document store
+
+    Args:
+        store: Document store to read the values from, None for defaults only
+
+    Returns:
+        Gazetteer of levels, categories, companies and locations
+    """
+    values = {"Level": [], "category": [], "company": [], "location": []}
+    if store is not None:
+        # Principle 2: Without the store, only the default values are known
+        try:
+            for field in values:
+                values[field] = store.distinct_job_values(field)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read job values for the rule parser: {e}")
+
+    gazetteer = Gazetteer()
+
+    levels = {normalize_level(level): level for level in DEFAULT_LEVELS}
+    levels.update({normalize_level(level): level for level in values["Level"]})
+    for canonical, level in levels.items():
+        gazetteer.add("Level", canonical, level)
+    for alias, canonical in LEVEL_ALIASES.items():
+        gazetteer.add("Level", alias, levels.get(canonical, canonical))
+
+    for category in {*DEFAULT_CATEGORIES, *values["category"]}:
+        gazetteer.add("category", category, category)
+    for alias, category in CATEGORY_ALIASES.items():
+        gazetteer.add("category", alias, category)
+
+    # A leading part of a company name, or a name sharing words with a level
+    # or category, is as likely to describe the role: "python", "data"
+    role_words = {word for words in gazetteer.phrases for word in words} - GENERIC_WORDS
+    keywords = [company_keywords(company) for company in values["company"]]
+    names = {company[-1] for company in keywords if company}
+    for company in keywords:
+        for keyword in company:
+            weak = keyword not in names or not role_words.isdisjoint(keyword.split())
+            gazetteer.add("company", keyword, keyword, min_length=3, weak=weak)
+
+    for location in values["location"]:
+        for keyword in location_keywords(location):
+            gazetteer.add("location", keyword, keyword, min_length=3)
+
+    logger.info(f"Built rule parser gazetteer with {len(gazetteer.phrases)} phrases")
+    return gazetteer
+
+
+_gazetteer: Gazetteer | None = None
+_gazetteer_version = None
+_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Get the gazetteer, rebuilding it when the document store changed
+
+    Returns:
+        Gazetteer of the currently indexed job values
+    """
+    global _gazetteer, _gazetteer_version
+    store = get_document_store()
+    version = store_version(store)
+    if _gazetteer is None or version != _gazetteer_version:
+        with _lock:
+            if _gazetteer is None or version != _gazetteer_version:
+                _gazetteer = build_gazetteer(store if version else None)
+                _gazetteer_version = version
+    return _gazetteer
+
+
+def match_date_range(text: str, now: datetime):
+    """Find relative date phrases in a query
+
+    Args:
+        text: Query, in any case
+        now: Current time, for years given explicitly
+
+    Returns:
+        List of (days, start, end) for each date phrase found
+    """
+    found = []
+    for kind, pattern in DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            if any(
+                start < match.end() and match.start() < end for _, start, end in found
+            ):
+                continue
+            if kind == "count":
+                number = match.group(1).casefold()
+                count = int(number) if number.isdigit() else NUMBER_WORDS[number]
+                days = count * UNIT_DAYS[match.group(2).casefold()]
+            elif kind == "unit":
+                days = UNIT_DAYS[match.group(1).casefold()]
+            elif kind == "recent":
+                days = 7
+            elif kind == "today":
+                days = 1
+            else:
+                year = int(match.group(1))
+                if year > now.year:
+                    continue
+                days = (now - datetime(year, 1, 1, tzinfo=timezone.utc)).days + 1
+            if days > 0:
+                found.append((days, match.start(), match.end()))
+    return found
+
+
+def parse_query(query: str) -> Dict[str, Any]:
+    """Parse a query with the rules, whatever the confidence
+
+    Args:
+        query: Natural language search query
+
+    Returns:
+        Dictionary with semantic_query, filters (date ranges as
+        {"days": n}) and a confidence between 0 and 1
+    """
+    # Words are casefolded one by one, casefolding the whole query can
+    # change its length and shift the spans used to slice it
+    tokens = tokenize(query)
+    words = [word for word, _, _ in tokens]
+    consumed = [False] * len(tokens)
+    kept = [False] * len(tokens)
+    filters: Dict[str, Any] = {}
+    confidence = 1.0
+
+    if NEGATION_WORDS.intersection(words):
+        confidence = 0.0
+
+    date_ranges = match_date_range(query, datetime.now(timezone.utc))
+    if date_ranges:
+        if len(date_ranges) > 1:
+            confidence *= MULTIPLE_DATES_PENALTY
+        filters["date_range"] = {"days": date_ranges[0][0]}
+        for i, (_, token_start, token_end) in enumerate(tokens):
+            if any(
+                start <= token_start and token_end <= end
+                for _, start, end in date_ranges
+            ):
+                consumed[i] = True
+
+    # A year without a date word may still be meant as one
+    if any(
+        YEAR_PATTERN.fullmatch(word) and not used
+        for (word, _, _), used in zip(tokens, consumed)
+    ):
+        confidence *= AMBIGUOUS_PENALTY
+
+    gazetteer = get_gazetteer()
+    i = 0
+    while i < len(words):
+        if consumed[i]:
+            i += 1
+            continue
+        length, matches = gazetteer.longest_match(words, i)
+        if not length or any(consumed[i : i + length]):
+            i += 1
+            continue
+        fields = {field for field, _ in matches}
+        if len(matches) > 1 or any(field in filters for field in fields):
+            # The phrase names several values, or a field was already set
+            confidence *= AMBIGUOUS_PENALTY
+        else:
+            field, value = next(iter(matches))
+            filters[field] = value
+            phrase = tuple(words[i : i + length])
+            if (phrase, field, value) in gazetteer.weak and (
+                i == 0 or words[i - 1] not in COMPANY_CUES
+            ):
+                confidence *= WEAK_MATCH_PENALTY
+            kept[i : i + length] = [field in SEMANTIC_FIELDS] * length
+        consumed[i : i + length] = [True] * length
+        i += length
+
+    # A location or company after "in" or "at" that no gazetteer knows
+    for i, word in enumerate(words[:-1]):
+        if word in CONSTRAINT_WORDS and not consumed[i + 1]:
+            if words[i + 1] not in FILLER_WORDS:
+                confidence *= UNRESOLVED_PENALTY
+                break
+
+    semantic_words = [
+        query[start:end]
+        for (word, start, end), used, keep in zip(tokens, consumed, kept)
+        if (keep or not used) and word not in FILLER_WORDS
+    ]
+    if len(semantic_words) > MAX_SIMPLE_WORDS:
+        confidence *= MAX_SIMPLE_WORDS / len(semantic_words)
+
+    return {
+        "semantic_query": " ".join(semantic_words) or "jobs",
+        "filters": filters,
+        "confidence": confidence,
+    }
+
+
+def parse_with_rules(query: str) -> Optional[Dict[str, Any]]:
+    """Parse a query locally if the rules are confident enough
+
+    Args:
+        query: Natural language search query
+
+    Returns:
+        Parsed query with relative date ranges, or None when the LLM
+        should parse it
+    """
+    if not config.RULE_PARSER_ENABLED:
+        return None
+
+    # Principle 2: A rule parser failure only means the LLM parses the query
+    try:
+        parsed = parse_query(query)
+    except Exception as e:
+        logger.warning(f"Rule parser failed on '{query}': {e}")
+        return None
+
+    if parsed["confidence"] < config.RULE_PARSER_MIN_CONFIDENCE:
+        logger.debug(
+            f"Rule parser confidence {parsed['confidence']:.2f} too low for '{query}'"
+        )
+        return None
+    return parsed
@@ -1,14 +1,33 @@
 """Main search service orchestrating query processing and response generation"""
 
-from typing import Any, List, Tuple
+import asyncio
+import threading
+from typing import Any, AsyncIterator, List, Optional, Tuple
 
+from common.document_store import hydrate_payloads
 from common.logger import get_logger
 from common.utils import find_unique_results, sort_results_by_score
 from search.config import SearchConfig
 from search.exceptions import LLMError, SearchError, VectorDatabaseError
-from search.services.llm_service import get_llm_response
-from search.services.query_parser import convert_query_to_semantic_and_filter
-from search.services.vector_search import create_filter_object, search
+from search.services.llm_service import (
+    get_llm_response,
+    get_llm_response_async,
+    stream_llm_response,
+)
+from search.services.query_embedding import embed_queries
+from search.services.query_parser import (
+    convert_query_to_semantic_and_filter,
+    convert_query_to_semantic_and_filter_async,
+    normalize_query,
+)
+from search.services.result_cache import result_cache
+from search.services.rule_parser import FILLER_WORDS, tokenize
+from search.services.vector_search import (
+    create_filter_object,
+    search,
+    search_async,
+    search_batch_async,
+)
 
 config = SearchConfig()
 logger = get_logger(
@@ -16,6 +35,212 @@ logger = get_logger(
 )
 
 
+def validate_search_request(query: str, top: int) -> int:
+    """Check a search request
+
+    Args:
+        query: The search query string
+        top: Maximum number of results to return
+
+    Returns:
+        The number of results to return, defaulted if invalid
+
+    Raises:
+        SearchError: If the query is empty
+    """
+    # Principle 3: Validate inputs to prevent exceptions
+    if not query or not query.strip():
+        logger.error("Empty query provided to search service")
+        raise SearchError("Query cannot be empty")
+
+    if top <= 0:
+        logger.warning(f"Invalid top value {top}, using default 3")
+        top = 3
+
+    logger.info(f"Processing search query: '{query}' (top={top})")
+    return top
+
+
+def get_semantic_query_and_filters(parsed_query, query: str) -> Tuple[str, Any]:
+    """Turn a parsed query into the semantic query and Qdrant filters
+
+    Args:
+        parsed_query: Output of the query parser, None if parsing failed
+        query: Original query, used when parsing failed
+
+    Returns:
+        Tuple of (semantic_query, filters)
+    """
+    if not parsed_query:
+        logger.warning("Query parsing failed, using original query")
+        semantic_query = query
+        filters = None
+    else:
+        semantic_query = parsed_query.get("semantic_query", query)
+        filter_dict = parsed_query.get("filters", {})
+        filters = create_filter_object(filter_dict) if filter_dict else None
+
+    logger.debug(f"Semantic query: {semantic_query}")
+    logger.debug(f"Filters: {filter_dict if parsed_query else 'None'}")
+    return semantic_query, filters
+
+
+def validate_search_results(results) -> List[Any]:
+    """Check the results of a vector search
+
+    Args:
+        results: Scored points returned by vector search
+
+    Returns:
+        The results, unchanged
+
+    Raises:
+        SearchError: If the search results are invalid
+    """
+    # Principle 3: Validate results before processing
+    if results is None:
+        logger.error("Vector search returned None")
+        raise SearchError("Search operation returned invalid results")
+
+    if not isinstance(results, list):
+        logger.error(f"Invalid search results type: {type(results)}")
+        raise SearchError("Search operation returned invalid result type")
+
+    return results
+
+
+def select_top_results(results, top: int) -> List[Any]:
+    """Keep the best chunk of each job and the top jobs by score
+
+    Used for batch searches, whose chunk level points are not grouped by
+    job in Qdrant.
+
+    Args:
+        results: Scored points returned by vector search
+        top: Maximum number of results to return
+
+    Returns:
+        Top unique job results, highest score first
+
+    Raises:
+        SearchError: If the search results are invalid
+    """
+    validate_search_results(results)
+
+    # Get unique results
+    unique_jobs = find_unique_results(results)
+    sorted_results = sort_results_by_score(unique_jobs)
+
+    # Limit to requested top results
+    final_results = sorted_results[:top]
+
+    logger.info(f"Found {len(final_results)} unique job results")
+    return final_results
+
+
+def generate_fallback_response(results: List[Any], query: str) -> str:
+    """Generate a simple fallback response when LLM fails
+
+    Args:
+        results: Search results
+        query: Original query
+
+    Returns:
+        Fallback response string
+    """
+    count = len(results)
+    if count == 0:
+        return f"No jobs found matching '{query}'."
+    elif count == 1:
+        return f"Found 1 job matching '{query}'. Please review the results below."
+    else:
+        return f"Found {count} jobs matching '{query}'. The results are sorted by relevance."
+
+
+def equivalent_queries(semantic_query: str, query: str) -> bool:
+    """Check whether a parsed semantic query searches for the raw query's words
+
+    Args:
+        semantic_query: Semantic query from the parser
+        query: Original query
+
+    Returns:
+        True if both have the same words, ignoring case and filler words
+    """
+
+    def content_words(text):
+        return {word for word, _, _ in tokenize(text)} - FILLER_WORDS
+
+    return content_words(semantic_query) == content_words(query)
+
+
+def discard_task(task: asyncio.Task) -> None:
+    """Cancel a task whose result is no longer needed"""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        # Retrieve the exception so it is not reported as unhandled
+        task.exception()
+
+
+# Parses that missed their deadline, referenced until they finish
+background_tasks: set[asyncio.Task] = set()
+
+
+def finish_in_background(task: asyncio.Task) -> None:
+    """Let a task run to completion without awaiting it"""
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+class SpeculationStats:
+    """Counts how often speculative searches are used
+
+    A hit means the speculative results were served, a miss that the
+    parsed query needed another search.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.deadline_exceeded = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit: bool, deadline_exceeded: bool = False) -> None:
+        """Count one speculative search
+
+        Args:
+            hit: Whether its results were served
+            deadline_exceeded: Whether query parsing missed its deadline
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.deadline_exceeded += deadline_exceeded
+
+    def stats(self) -> dict:
+        """Counters and hit rate of the speculative searches
+
+        Returns:
+            Dictionary with speculated, hits, misses, hit_rate and
+            deadline_exceeded
+        """
+        with self._lock:
+            speculated = self.hits + self.misses
+            return {
+                "speculated": speculated,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / speculated if speculated else 0.0,
+                "deadline_exceeded": self.deadline_exceeded,
+            }
+
+
+speculation_stats = SpeculationStats()
+
+
 class SearchService:
     """Service class to handle job search business logic"""
 
@@ -39,62 +264,33 @@ class SearchService:
             SearchError: If search operation fails
             VectorDatabaseError: If vector database operation fails
         """
-        # Principle 3: Validate inputs to prevent exceptions
-        if not query or not query.strip():
-            self.logger.error("Empty query provided to search service")
-            raise SearchError("Query cannot be empty")
-
-        if top <= 0:
-            self.logger.warning(f"Invalid top value {top}, using default 3")
-            top = 3
-
-        self.logger.info(f"Processing search query: '{query}' (top={top})")
+        top = validate_search_request(query, top)
 
         # Parse query into semantic search and filters
         # Query parser handles its own exceptions
         parsed_query = convert_query_to_semantic_and_filter(query)
+        semantic_query, filters = get_semantic_query_and_filters(parsed_query, query)
 
-        if not parsed_query:
-            self.logger.warning("Query parsing failed, using original query")
-            semantic_query = query
-            filters = None
-        else:
-            semantic_query = parsed_query.get("semantic_query", query)
-            filter_dict = parsed_query.get("filters", {})
-            filters = create_filter_object(filter_dict) if filter_dict else None
-
-        self.logger.debug(f"Semantic query: {semantic_query}")
-        self.logger.debug(f"Filters: {filter_dict if parsed_query else 'None'}")
-
-        # Principle 2: Use specific exception handling, not catch-all
-        try:
-            # Perform search - can raise VectorDatabaseError
-            results = search(semantic_query, filters=filters, limit=top * 3)
-        except VectorDatabaseError:
-            # Re-raise specific vector database errors
-            raise
-        except Exception as e:
-            # Only catch truly unexpected errors
-            self.logger.error(f"Unexpected error during vector search: {e}")
-            raise SearchError(f"Search operation failed: {str(e)}") from e
+        final_results = result_cache.get(semantic_query, filters, top)
+        if final_results is None:
+            # Principle 2: Use specific exception handling, not catch-all
+            try:
+                # Perform search - can raise VectorDatabaseError
+                results = search(semantic_query, filters=filters, limit=top)
+            except VectorDatabaseError:
+                # Re-raise specific vector database errors
+                raise
+            except Exception as e:
+                # Only catch truly unexpected errors
+                self.logger.error(f"Unexpected error during vector search: {e}")
+                raise SearchError(f"Search operation failed: {str(e)}") from e
 
-        # Principle 3: Validate results before processing
-        if results is None:
-            self.logger.error("Vector search returned None")
-            raise SearchError("Search operation returned invalid results")
+            final_results = validate_search_results(results)
+            self.logger.info(f"Found {len(final_results)} unique job results")
+            result_cache.put(semantic_query, filters, top, final_results)
 
-        if not isinstance(results, list):
-            self.logger.error(f"Invalid search results type: {type(results)}")
-            raise SearchError("Search operation returned invalid result type")
-
-        # Get unique results
-        unique_jobs = find_unique_results(results)
-        sorted_results = sort_results_by_score(unique_jobs)
-
-        # Limit to requested top results
-        final_results = sorted_results[:top]
-
-        self.logger.info(f"Found {len(final_results)} unique job results")
+        # Text and job details are read from the document store after ranking
+        hydrate_payloads(final_results)
 
         # Generate LLM response - use fallback on failure
         try:
@@ -119,13 +315,340 @@ class SearchService:
         Returns:
             Fallback response string
         """
-        count = len(results)
-        if count == 0:
-            return f"No jobs found matching '{query}'."
-        elif count == 1:
-            return f"Found 1 job matching '{query}'. Please review the results below."
+        return generate_fallback_response(results, query)
+
+
+class AsyncSearchService:
+    """Async variant of SearchService
+
+    Every LLM and Qdrant call is awaited, so one worker serves many
+    concurrent requests that mostly wait on I/O instead of holding a
+    threadpool thread each.
+    """
+
+    def __init__(self):
+        self.logger = logger
+
+    async def search_jobs_and_generate_response(
+        self, query: str, top: int
+    ) -> Tuple[List[Any], str]:
+        """
+        Search for jobs based on query and generate AI-powered response.
+
+        Args:
+            query: The search query string
+            top: Maximum number of results to return
+
+        Returns:
+            Tuple of (job_results, llm_response)
+
+        Raises:
+            SearchError: If search operation fails
+            VectorDatabaseError: If vector database operation fails
+        """
+        final_results = await self.find_jobs(query, top)
+        llm_response = await self.generate_response(final_results, query)
+        return final_results, llm_response
+
+    async def search_jobs_batch(
+        self, queries: List[Tuple[str, int, bool]]
+    ) -> List[Tuple[List[Any], Optional[str]]]:
+        """
+        Search for many queries at once, sharing parsing, embedding and Qdrant.
+
+        Distinct queries are parsed concurrently, the semantic queries
+        missing from the result cache are embedded in one batch and sent to
+        Qdrant in a single query_batch_points call, and all results are
+        hydrated with one document store lookup.
+
+        Args:
+            queries: (query, top, summarize) of each search
+
+        Returns:
+            Tuple of (job_results, llm_response) for each query, in order,
+            llm_response None when summarize is False
+
+        Raises:
+            SearchError: If search operation fails
+            VectorDatabaseError: If vector database operation fails
+        """
+        tops = [validate_search_request(query, top) for query, top, _ in queries]
+        limiter = asyncio.Semaphore(config.BATCH_CONCURRENCY)
+
+        # Identical queries are parsed once, at most BATCH_CONCURRENCY at a time
+        distinct_queries = {
+            normalize_query(query): query for query, _, _ in reversed(queries)
+        }
+
+        async def parse(query):
+            async with limiter:
+                # Query parser handles its own exceptions
+                return await convert_query_to_semantic_and_filter_async(query)
+
+        parsed_queries = dict(
+            zip(
+                distinct_queries,
+                await asyncio.gather(*map(parse, distinct_queries.values())),
+            )
+        )
+        searches = [
+            get_semantic_query_and_filters(
+                parsed_queries[normalize_query(query)], query
+            )
+            for query, _, _ in queries
+        ]
+
+        final_results = [
+            result_cache.get(semantic_query, filters, top)
+            for (semantic_query, filters), top in zip(searches, tops)
+        ]
+        # Searches with the same results are sent once
+        missing = {}
+        for i, results in enumerate(final_results):
+            if results is None:
+                key = result_cache.key(*searches[i], tops[i])
+                missing.setdefault(key, []).append(i)
+        if missing:
+            first = [indices[0] for indices in missing.values()]
+            query_vectors = await asyncio.to_thread(
+                embed_queries, [searches[i][0] for i in first]
+            )
+            # Batch queries cannot be grouped by job in Qdrant, so chunks
+            # are overfetched and deduplicated here
+            batch_results = await self._await_search(
+                search_batch_async(
+                    [
+                        (vectors, searches[i][1], tops[i] * 3)
+                        for vectors, i in zip(query_vectors, first)
+                    ]
+                )
+            )
+            for indices, results in zip(missing.values(), batch_results):
+                i = indices[0]
+                top_results = select_top_results(results, tops[i])
+                result_cache.put(*searches[i], tops[i], top_results)
+                for j in indices:
+                    final_results[j] = list(top_results)
+
+        # The document store is a local file, read off the event loop
+        await asyncio.to_thread(
+            hydrate_payloads, [point for results in final_results for point in results]
+        )
+
+        async def summarize(results, query, wanted):
+            if not wanted:
+                return None
+            async with limiter:
+                return await self.generate_response(results, query)
+
+        llm_responses = await asyncio.gather(
+            *(
+                summarize(results, query, wanted)
+                for results, (query, _, wanted) in zip(final_results, queries)
+            )
+        )
+        self.logger.info(f"Processed batch of {len(queries)} queries")
+        return list(zip(final_results, llm_responses))
+
+    async def generate_response(self, results: List[Any], query: str) -> str:
+        """Generate the AI-powered response to found jobs
+
+        Args:
+            results: Job results from find_jobs
+            query: Original query
+
+        Returns:
+            LLM response, or the fallback response if the LLM fails
+        """
+        # Generate LLM response - use fallback on failure
+        try:
+            return await get_llm_response_async(results, query)
+        except LLMError as e:
+            # Principle 2: Don't control flow with exceptions, but provide fallback
+            self.logger.warning(f"LLM response generation failed: {e}, using fallback")
+        except Exception as e:
+            self.logger.error(f"Unexpected error in LLM response: {e}")
+        return generate_fallback_response(results, query)
+
+    async def find_jobs(self, query: str, top: int) -> List[Any]:
+        """
+        Search for jobs based on query, without generating a response.
+
+        Args:
+            query: The search query string
+            top: Maximum number of results to return
+
+        Returns:
+            Top unique job results with their payloads hydrated
+
+        Raises:
+            SearchError: If search operation fails
+            VectorDatabaseError: If vector database operation fails
+        """
+        top = validate_search_request(query, top)
+
+        final_results = await self._find_results(query, top)
+
+        # The document store is a local file, read off the event loop
+        await asyncio.to_thread(hydrate_payloads, final_results)
+        return final_results
+
+    async def stream_response(
+        self, results: List[Any], query: str
+    ) -> AsyncIterator[str]:
+        """Stream the AI-powered response to found jobs
+
+        If the LLM fails before producing any text the fallback response
+        is yielded instead, if it fails later the response ends early.
+
+        Args:
+            results: Job results from find_jobs
+            query: Original query
+
+        Yields:
+            Chunks of the response text
+        """
+        streamed = False
+        try:
+            async for chunk in stream_llm_response(results, query):
+                streamed = True
+                yield chunk
+        except Exception as e:
+            # Principle 2: Don't control flow with exceptions, but provide fallback
+            if streamed:
+                self.logger.warning(f"LLM response stream interrupted: {e}")
+                return
+            self.logger.warning(f"LLM response generation failed: {e}, using fallback")
+            yield generate_fallback_response(results, query)
+
+    async def _find_results(self, query: str, top: int) -> List[Any]:
+        """Parse the query and search, speculatively while the LLM parses
+
+        The rule parser and the parse cache answer without awaiting
+        anything, so their queries are searched once parsed. Otherwise a
+        search on the raw query starts alongside the parsing LLM call, and
+        its results are served if the parsed query has no filters and the
+        same words, or if parsing misses its deadline. A parse that misses
+        its deadline keeps running and fills the parse cache, so repeats of
+        the query are parsed at once.
+
+        Args:
+            query: Original query
+            top: Maximum number of results to return
+
+        Returns:
+            Top unique job results
+
+        Raises:
+            SearchError: If search operation fails
+            VectorDatabaseError: If vector database operation fails
+        """
+        # Query parser handles its own exceptions
+        parse_task = asyncio.create_task(
+            convert_query_to_semantic_and_filter_async(query)
+        )
+        # Let the parser run until its first await
+        await asyncio.sleep(0)
+
+        if not config.SPECULATIVE_SEARCH_ENABLED or parse_task.done():
+            parsed_query = await parse_task
+            semantic_query, filters = get_semantic_query_and_filters(
+                parsed_query, query
+            )
+            return await self._search_top(semantic_query, filters, top)
+
+        speculative_task = asyncio.create_task(search_async(query, limit=top))
+        deadline_exceeded = False
+        try:
+            parsed_query = await asyncio.wait_for(
+                asyncio.shield(parse_task), config.SPECULATIVE_PARSE_DEADLINE
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                f"Query parsing exceeded {config.SPECULATIVE_PARSE_DEADLINE}s, "
+                "using the speculative search"
+            )
+            finish_in_background(parse_task)
+            parsed_query = None
+            deadline_exceeded = True
+        except asyncio.CancelledError:
+            finish_in_background(parse_task)
+            discard_task(speculative_task)
+            raise
+
+        if deadline_exceeded:
+            semantic_query, filters = query, None
         else:
-            return f"Found {count} jobs matching '{query}'. The results are sorted by relevance."
+            semantic_query, filters = get_semantic_query_and_filters(
+                parsed_query, query
+            )
+        hit = filters is None and equivalent_queries(semantic_query, query)
+        speculation_stats.record(hit, deadline_exceeded)
+        self.logger.info(
+            f"Speculative search {'hit' if hit else 'miss'}, "
+            f"hit rate {speculation_stats.stats()['hit_rate']:.0%}"
+        )
+
+        if hit:
+            # Cached under the raw query it searched: the parsed query only
+            # has the same content words, and embeds differently
+            return await self._search_top(query, None, top, speculative_task)
+        discard_task(speculative_task)
+        return await self._search_top(semantic_query, filters, top)
+
+    async def _search_top(
+        self, semantic_query: str, filters, top: int, speculative_task=None
+    ) -> List[Any]:
+        """Get the top results of a search, from the result cache if possible
+
+        Args:
+            semantic_query: Semantic query to search for
+            filters: Qdrant filter, or None
+            top: Maximum number of results to return
+            speculative_task: Search already running for these results
+
+        Returns:
+            Top unique job results
+
+        Raises:
+            SearchError: If search operation fails
+            VectorDatabaseError: If vector database operation fails
+        """
+        final_results = result_cache.get(semantic_query, filters, top)
+        if final_results is not None:
+            if speculative_task is not None:
+                discard_task(speculative_task)
+            return final_results
+
+        results = await self._await_search(
+            speculative_task or search_async(semantic_query, filters=filters, limit=top)
+        )
+        final_results = validate_search_results(results)
+        self.logger.info(f"Found {len(final_results)} unique job results")
+        result_cache.put(semantic_query, filters, top, final_results)
+        return final_results
+
+    async def _await_search(self, pending_search) -> List[Any]:
+        """Await a vector search, wrapping unexpected errors
+
+        Args:
+            pending_search: Coroutine or task of search_async
+
+        Returns:
+            Scored points from vector search
+
+        Raises:
+            SearchError: If search operation fails
+            VectorDatabaseError: If vector database operation fails
+        """
+        # Principle 2: Use specific exception handling, not catch-all
+        try:
+            return await pending_search
+        except VectorDatabaseError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error during vector search: {e}")
+            raise SearchError(f"Search operation failed: {str(e)}") from e
 
 
 def get_search_service() -> SearchService:
@@ -135,3 +658,12 @@ def get_search_service() -> SearchService:
         SearchService instance
     """
     return SearchService()
+
+
+def get_async_search_service() -> AsyncSearchService:
+    """Dependency injection function for AsyncSearchService
+
+    Returns:
+        AsyncSearchService instance
+    """
+    return AsyncSearchService()
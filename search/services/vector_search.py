@@ -5,9 +5,15 @@ from datetime import datetime
 from qdrant_client import models
 
 from common.logger import get_logger
+from common.payload_fields import (
+    FILTER_FIELDS,
+    PUBLISHED_FIELD,
+    normalize_filter_value,
+)
 from common.qdrant_config import QdrantConfig
-from data_ingestion.qdrant_client import client, collection_name
 from search.exceptions import VectorDatabaseError
+from search.services.query_embedding import embed_query, embed_query_async
+from vector_backend.factory import get_backend
 
 config = QdrantConfig()
 logger = get_logger(
@@ -39,11 +45,11 @@ def create_filter_object(filter_dict):
     for key, value in filter_dict.items():
         if value:
             try:
-                # Handle datetime range for publication_date
+                # Handle datetime range on the parsed publication timestamp
                 if key == "date_range" and isinstance(value, dict):
                     conditions.append(
                         models.FieldCondition(
-                            key="publication_date",
+                            key=PUBLISHED_FIELD,
                             range=models.DatetimeRange(
                                 gt=value.get("gt"),
                                 gte=value.get("gte"),
@@ -52,15 +58,27 @@ def create_filter_object(filter_dict):
                             ),
                         )
                     )
-                else:
-                    # Regular field matching for other fields
-                    logger.debug(f"Adding filter: {key} = {value}")
+                elif key in FILTER_FIELDS:
+                    # Exact match on the canonical keywords written at ingestion
+                    keywords = normalize_filter_value(key, value)
+                    if not keywords:
+                        logger.warning(
+                            f"Ignoring filter {key}={value}: no usable value"
+                        )
+                        continue
+                    logger.debug(f"Adding filter: {FILTER_FIELDS[key]} = {keywords}")
                     conditions.append(
                         models.FieldCondition(
-                            key=key,
-                            match=models.MatchPhrase(phrase=value),
+                            key=FILTER_FIELDS[key],
+                            match=(
+                                models.MatchValue(value=keywords[0])
+                                if len(keywords) == 1
+                                else models.MatchAny(any=keywords)
+                            ),
                         )
                     )
+                else:
+                    logger.warning(f"Ignoring filter on unknown field {key}")
             except Exception as e:
                 # Principle 2: Don't fail entire operation for one bad filter
                 logger.warning(f"Failed to add filter {key}={value}: {e}")
@@ -75,15 +93,59 @@ def create_filter_object(filter_dict):
 
 
 def search(query: str, filters=None, limit=5) -> list[models.ScoredPoint]:
-    """Perform hybrid search on vector database
+    """Perform hybrid search on the vector backend
+
+    Args:
+        query: Search query string
+        filters: Optional filter object
+        limit: Maximum number of jobs
+
+    Returns:
+        Best scoring chunk of up to limit distinct jobs, highest score first
+
+    Raises:
+        VectorDatabaseError: If search operation fails
+    """
+    # Principle 3: Validate inputs to prevent exceptions
+    if not query or not query.strip():
+        logger.warning("Empty query provided to vector search")
+        return []
+
+    if limit <= 0:
+        logger.warning(f"Invalid limit {limit}, using default of 5")
+        limit = 5
+
+    logger.info(f"Searching for: '{query}', limit: {limit}")
+    start_time = datetime.now()
+
+    # Principle 2: Use specific exception handling for backend operations
+    try:
+        points = get_backend().search(embed_query(query), filters, limit)
+    except VectorDatabaseError:
+        raise
+    except Exception as e:
+        logger.error(f"Vector database query failed: {e}")
+        raise VectorDatabaseError(f"Search operation failed: {str(e)}") from e
+
+    elapsed = (datetime.now() - start_time).total_seconds()
+    logger.info(f"Found {len(points)} job(s) in {elapsed:.2f}s")
+    return points
+
+
+async def search_async(query: str, filters=None, limit=5) -> list[models.ScoredPoint]:
+    """Async variant of search, awaiting the backend's async search
+
+    The query is embedded in a worker thread, batched with the queries of
+    concurrent requests, so the event loop keeps serving other requests
+    meanwhile.
 
     Args:
         query: Search query string
         filters: Optional filter object
-        limit: Maximum number of results
+        limit: Maximum number of jobs
 
     Returns:
-        List of scored points from search
+        Best scoring chunk of up to limit distinct jobs, highest score first
 
     Raises:
         VectorDatabaseError: If search operation fails
@@ -100,38 +162,80 @@ def search(query: str, filters=None, limit=5) -> list[models.ScoredPoint]:
     logger.info(f"Searching for: '{query}', limit: {limit}")
     start_time = datetime.now()
 
-    # Principle 2: Use specific exception handling for Qdrant operations
+    # Principle 2: Use specific exception handling for backend operations
     try:
-        response = client.query_points(
-            collection_name=collection_name,
-            prefetch=[
-                models.Prefetch(
-                    query=models.Document(text=query, model=config.SPARSE_MODEL),
-                    using="sparse",
-                    limit=20,
-                ),
-                models.Prefetch(
-                    query=models.Document(text=query, model=config.DENSE_MODEL),
-                    using="dense",
-                    limit=20,
-                ),
-            ],
-            query=models.FusionQuery(fusion=models.Fusion.RRF),
-            query_filter=filters,
-            limit=limit,
-        )
+        query_vectors = await embed_query_async(query)
+        points = await get_backend().search_async(query_vectors, filters, limit)
+    except VectorDatabaseError:
+        raise
     except Exception as e:
         logger.error(f"Vector database query failed: {e}")
         raise VectorDatabaseError(f"Search operation failed: {str(e)}") from e
 
     elapsed = (datetime.now() - start_time).total_seconds()
+    logger.info(f"Found {len(points)} job(s) in {elapsed:.2f}s")
+    return points
 
-    # Principle 3: Validate response structure
-    if not response or not hasattr(response, "points"):
-        logger.error("Invalid response from Qdrant: missing 'points' attribute")
-        raise VectorDatabaseError("Vector database returned invalid response")
 
-    results_count = len(response.points)
-    logger.info(f"Found {results_count} result(s) in {elapsed:.2f}s")
+def search_batch(searches) -> list[list[models.ScoredPoint]]:
+    """Run many hybrid searches in one backend request
 
-    return response.points
+    Args:
+        searches: (query vectors, filter object or None, limit) of each
+            search, the vectors from embed_queries
+
+    Returns:
+        List of scored points for each search, in order
+
+    Raises:
+        VectorDatabaseError: If search operation fails
+    """
+    if not searches:
+        return []
+
+    start_time = datetime.now()
+
+    # Principle 2: Use specific exception handling for backend operations
+    try:
+        results = get_backend().search_batch(searches)
+    except VectorDatabaseError:
+        raise
+    except Exception as e:
+        logger.error(f"Vector database batch query failed: {e}")
+        raise VectorDatabaseError(f"Search operation failed: {str(e)}") from e
+
+    elapsed = (datetime.now() - start_time).total_seconds()
+    logger.info(f"Ran {len(searches)} searches in one batch in {elapsed:.2f}s")
+    return results
+
+
+async def search_batch_async(searches) -> list[list[models.ScoredPoint]]:
+    """Async variant of search_batch, awaiting the backend's async search
+
+    Args:
+        searches: (query vectors, filter object or None, limit) of each
+            search, the vectors from embed_queries
+
+    Returns:
+        List of scored points for each search, in order
+
+    Raises:
+        VectorDatabaseError: If search operation fails
+    """
+    if not searches:
+        return []
+
+    start_time = datetime.now()
+
+    # Principle 2: Use specific exception handling for backend operations
+    try:
+        results = await get_backend().search_batch_async(searches)
+    except VectorDatabaseError:
+        raise
+    except Exception as e:
+        logger.error(f"Vector database batch query failed: {e}")
+        raise VectorDatabaseError(f"Search operation failed: {str(e)}") from e
+
+    elapsed = (datetime.now() - start_time).total_seconds()
+    logger.info(f"Ran {len(searches)} searches in one batch in {elapsed:.2f}s")
+    return results
@@ -0,0 +1 @@
+"""Tests of the job search application"""
@@ -0,0 +1,13 @@
+"""Shared test setup
+
+Settings are read from the environment when modules are imported, so the
+required ones get harmless values before any test module imports the
+application. Qdrant runs in its local in-memory mode.
+"""
+
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("QDRANT_API_KEY", "test-key")
+os.environ["QDRANT_LOCATION"] = ":memory:"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
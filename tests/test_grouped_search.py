@@ -0,0 +1,154 @@
+"""Grouped searches return the requested number of distinct jobs
+
+One job whose chunks all rank above every other job fills the default
+prefetch depth on its own, so the search has to prefetch deeper.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from qdrant_client import models
+
+from vector_backend import qdrant_backend
+from vector_backend.base import prefetch_depth
+from vector_backend.numpy_index import NumpyCollection, NumpyIndex
+
+DIMENSION = 8
+DOMINANT_CHUNKS = 100
+OTHER_JOBS = 10
+
+
+def query_vectors():
+    dense = np.zeros(DIMENSION, np.float32)
+    dense[0] = 1.0
+    return dense.tolist(), models.SparseVector(indices=[7], values=[1.0])
+
+
+@pytest.fixture
+def dominated_index(tmp_path):
+    """Collection where one job's chunks outrank every other job"""
+    rng = np.random.default_rng(0)
+    collection = NumpyCollection(DIMENSION)
+    for i in range(DOMINANT_CHUNKS):
+        dense = np.zeros(DIMENSION, np.float32)
+        dense[0] = 1.0
+        dense[1:] = rng.normal(0, 0.01, DIMENSION - 1)
+        collection.upsert(
+            f"big-{i}",
+            {"chunk_id": "big", "chunk_index": i},
+            dense,
+            (np.array([7]), np.array([5.0 + rng.random()], np.float32)),
+        )
+    for job in range(OTHER_JOBS):
+        dense = rng.normal(0, 1, DIMENSION).astype(np.float32)
+        dense[0] = 0.5
+        collection.upsert(
+            f"job-{job}",
+            {"chunk_id": f"job-{job}", "chunk_index": 0},
+            dense,
+            (np.array([7]), np.array([1.0], np.float32)),
+        )
+    collection.save(tmp_path / "collection")
+    return NumpyIndex(tmp_path / "collection")
+
+
+def test_dominant_job_fills_default_prefetch(dominated_index):
+    assert prefetch_depth(5) < DOMINANT_CHUNKS
+
+
+def test_numpy_search_returns_limit_distinct_jobs(dominated_index):
+    points = dominated_index.search(query_vectors(), None, 5)
+
+    job_ids = [point.payload["chunk_id"] for point in points]
+    assert len(job_ids) == 5
+    assert len(set(job_ids)) == 5
+    assert job_ids[0] == "big"
+
+
+def test_numpy_search_stops_when_no_more_jobs_match(dominated_index):
+    points = dominated_index.search(query_vectors(), None, OTHER_JOBS + 5)
+
+    assert len(points) == OTHER_JOBS + 1
+
+
+class FakeClient:
+    """Grouping Qdrant client whose prefetches honour their limit
+
+    The local in-memory mode prefetches every point of grouped queries,
+    which would hide the problem.
+    """
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.depths = []
+
+    def pool(self, request):
+        depth = request["prefetch"][0].limit
+        self.depths.append(depth)
+        groups = {}
+        for rank, job in enumerate(self.jobs[:depth]):
+            if job not in groups and len(groups) < request["limit"]:
+                groups[job] = SimpleNamespace(
+                    hits=[
+                        models.ScoredPoint(
+                            id=rank,
+                            version=0,
+                            score=1 / (rank + 2),
+                            payload={"chunk_id": job},
+                        )
+                    ]
+                )
+        return SimpleNamespace(groups=list(groups.values()))
+
+    def query_points_groups(self, **request):
+        return self.pool(request)
+
+    def count(self, **kwargs):
+        return SimpleNamespace(count=len(self.jobs))
+
+
+class FakeAsyncClient(FakeClient):
+    async def query_points_groups(self, **request):
+        return self.pool(request)
+
+    async def count(self, **kwargs):
+        return SimpleNamespace(count=len(self.jobs))
+
+
+def ranked_jobs():
+    return ["big"] * DOMINANT_CHUNKS + [f"job-{job}" for job in range(OTHER_JOBS)]
+
+
+def test_qdrant_search_prefetches_deeper_for_missing_jobs(monkeypatch):
+    client = FakeClient(ranked_jobs())
+    monkeypatch.setattr(qdrant_backend, "get_client", lambda: client)
+
+    points = qdrant_backend.QdrantBackend().search(query_vectors(), None, 5)
+
+    assert len({point.payload["chunk_id"] for point in points}) == 5
+    assert client.depths[0] == prefetch_depth(5)
+    assert client.depths == sorted(client.depths)
+
+
+def test_qdrant_search_stops_at_matching_points(monkeypatch):
+    client = FakeClient(ranked_jobs())
+    monkeypatch.setattr(qdrant_backend, "get_client", lambda: client)
+
+    points = qdrant_backend.QdrantBackend().search(query_vectors(), None, 20)
+
+    assert len(points) == OTHER_JOBS + 1
+    assert client.depths == [prefetch_depth(20), len(ranked_jobs())]
+
+
+def test_qdrant_search_async_prefetches_deeper(monkeypatch):
+    client = FakeAsyncClient(ranked_jobs())
+    monkeypatch.setattr(qdrant_backend, "get_async_client", lambda: client)
+    monkeypatch.setattr(qdrant_backend.config, "QDRANT_LOCATION", "http://qdrant")
+
+    points = asyncio.run(
+        qdrant_backend.QdrantBackend().search_async(query_vectors(), None, 5)
+    )
+
+    assert len({point.payload["chunk_id"] for point in points}) == 5
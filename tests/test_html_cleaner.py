@@ -0,0 +1,65 @@
+"""HTML cleaning against BeautifulSoup"""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from common import html_cleaner
+from common.html_cleaner import HtmlCleaner, clean_html
+
+# Markup handled without BeautifulSoup
+PARSED_CASES = [
+    "plain text",
+    "",
+    "   \n  ",
+    "<p>Python <b>developer</b></p><p>Remote</p>",
+    "<ul>\n  <li>One</li>\n  <li>Two</li>\n</ul>",
+    "<p>Unclosed <b>bold <i>italic</p> after",
+    "<div><p>Stray</span> end tag</div>",
+    "Salary &gt; 50k &amp; bonus &#8364; &#x20AC;",
+    "<pre>  keep\n    indent  </pre><p>  </p>",
+    "<textarea>\n</textarea> <pre>\t</pre>",
+    "<p>Before<![CDATA[ <b>raw</b> ]]>after</p>",
+    "<script>var a = '<p>';</script><p>Visible</p>",
+    "<style>p { color: red }</style>Text<script><![CDATA[kept]]></script>",
+    "<p title='a > b'>Quoted</p>",
+    "Line<br>break<br/>and<img src=x.png>image",
+    "<!-- comment --><p>After comment</p>",
+    "<!DOCTYPE html><html><body>Body</body></html>",
+    "<?php echo 1 ?><p>Processing instruction</p>",
+    "<ruby>Kanji<rt>reading</rt><rp>(</rp></ruby>",
+]
+
+# Markup whose decoding is delegated to BeautifulSoup
+FALLBACK_CASES = [
+    "Tom &amp Jerry",
+    "AT&T &copy 2024",
+    "R&D &notanentity; team",
+    "Trailing <b",
+    "a < b and c > d",
+]
+
+
+def soup_text(description):
+    return BeautifulSoup(description, "html.parser").get_text(separator=" ")
+
+
+@pytest.mark.parametrize("description", PARSED_CASES + FALLBACK_CASES)
+def test_matches_beautifulsoup(description):
+    assert clean_html(description) == soup_text(description)
+
+
+@pytest.mark.parametrize("description", PARSED_CASES)
+def test_parses_without_beautifulsoup(monkeypatch, description):
+    def no_soup(description):
+        raise AssertionError("fell back to BeautifulSoup")
+
+    monkeypatch.setattr(html_cleaner, "remove_html_tags", no_soup)
+    assert clean_html(description) == soup_text(description)
+
+
+def test_worker_pool_preserves_order():
+    descriptions = [f"<p>Job {i} &amp; <b>team</b></p>" for i in range(200)]
+    with HtmlCleaner(workers=2) as cleaner:
+        cleaned = cleaner.clean(descriptions)
+
+    assert cleaned == [soup_text(description) for description in descriptions]
@@ -0,0 +1,60 @@
+"""Document store reads of the async search path"""
+
+import asyncio
+import threading
+
+from qdrant_client import models
+
+from common import document_store
+from search.routers.search import build_job_results
+from search.services import search_service
+from search.services.llm_service import format_job_for_response
+
+
+def slim_point(job_id, score=0.5):
+    return models.ScoredPoint(
+        id=1, version=0, score=score, payload={"chunk_id": job_id, "chunk_index": 0}
+    )
+
+
+def test_find_jobs_hydrates_off_the_event_loop(monkeypatch):
+    points = [slim_point("job-1"), slim_point("job-2")]
+    threads = []
+
+    async def find_results(self, query, top):
+        return points
+
+    def hydrate(results):
+        threads.append(threading.get_ident())
+        for point in results:
+            point.payload["text"] = "hydrated"
+        return results
+
+    monkeypatch.setattr(
+        search_service.AsyncSearchService, "_find_results", find_results
+    )
+    monkeypatch.setattr(search_service, "hydrate_payloads", hydrate)
+
+    async def find_jobs():
+        results = await search_service.AsyncSearchService().find_jobs("python", 2)
+        return results, threading.get_ident()
+
+    results, loop_thread = asyncio.run(find_jobs())
+
+    assert [point.payload["text"] for point in results] == ["hydrated"] * 2
+    assert threads and loop_thread not in threads
+
+
+def test_formatting_hydrated_results_reads_no_store(monkeypatch):
+    def no_store():
+        raise AssertionError("document store read while formatting results")
+
+    monkeypatch.setattr(document_store, "get_document_store", no_store)
+    point = slim_point("job-1")
+    point.payload.update(text="Python developer", job_title="Developer")
+
+    jobs = build_job_results([point])
+    prompt = format_job_for_response([point])
+
+    assert jobs[0].job_title == "Developer"
+    assert "Python developer" in prompt
@@ -0,0 +1,68 @@
+"""Change detection of jobs with and without chunks"""
+
+import pandas as pd
+
+from common.document_store import DocumentStore
+from data_ingestion.incremental import IncrementalSync
+from data_ingestion.vector_database_setup import iter_job_chunks
+
+
+class FakeCleaner:
+    """Cleaner returning descriptions unchanged"""
+
+    def clean(self, descriptions):
+        return descriptions
+
+
+def make_jobs():
+    return pd.DataFrame(
+        {
+            "ID": ["job-1", "job-2"],
+            "Job Title": ["Developer", "Designer"],
+            "Job Description": ["Write Python services for the data team", ""],
+        }
+    )
+
+
+def run(existing_hashes, store):
+    """Chunk the changed jobs and record the chunkless ones like the setup"""
+    sync = IncrementalSync(existing_hashes)
+    chunks = list(iter_job_chunks([make_jobs()], FakeCleaner(), sync))
+    store.add_chunks(chunks)
+    store.add_chunkless_jobs(sync.chunkless_hashes())
+    return sync, chunks
+
+
+def test_chunkless_job_is_skipped_next_run(tmp_path):
+    store = DocumentStore(tmp_path / "documents.sqlite", writable=True)
+    sync, chunks = run({}, store)
+
+    assert {chunk["metadata"]["chunk_id"] for chunk in chunks} == {"job-1"}
+    assert set(store.chunkless_job_hashes()) == {"job-2"}
+
+    # The vector database only holds the hash of the job with chunks
+    existing_hashes = {"job-1": sync.changed_hashes["job-1"]}
+    existing_hashes.update(store.chunkless_job_hashes())
+    sync, chunks = run(existing_hashes, store)
+
+    assert chunks == []
+    assert sync.changed_hashes == {}
+    assert sync.unchanged_count == 2
+
+
+def test_job_gaining_chunks_stops_being_chunkless(tmp_path):
+    store = DocumentStore(tmp_path / "documents.sqlite", writable=True)
+    store.add_chunkless_jobs({"job-2": "old"})
+
+    jobs = make_jobs()
+    jobs.loc[1, "Job Description"] = "Design the product pages"
+    sync = IncrementalSync(store.chunkless_job_hashes())
+    store.add_chunks(iter_job_chunks([jobs], FakeCleaner(), sync))
+    store.add_chunkless_jobs(sync.chunkless_hashes())
+
+    assert store.chunkless_job_hashes() == {}
+    assert set(store.job_ids()) == {"job-1", "job-2"}
+
+
+def test_missing_store_has_no_chunkless_jobs(tmp_path):
+    assert DocumentStore(tmp_path / "missing.sqlite").chunkless_job_hashes() == {}
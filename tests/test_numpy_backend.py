@@ -0,0 +1,144 @@
+"""Ingestion into the in-process NumPy backend"""
+
+import numpy as np
+import pytest
+from qdrant_client import models
+
+from vector_backend import numpy_backend
+from vector_backend.numpy_backend import NumpyBackend
+from vector_backend.numpy_index import NumpyCollection, NumpyIndex, delete_points
+from vector_backend.uploader import UploadCheckpoint
+
+DIMENSION = 8
+JOBS = 12
+CHUNKS_PER_JOB = 3
+BATCH_SIZE = 6
+
+
+def make_batches(content_hash="v1"):
+    """Embedded batches of the chunks of every job"""
+    rng = np.random.default_rng(0)
+    chunks = [
+        {
+            "text": f"chunk {index} of job {job}",
+            "metadata": {
+                "chunk_id": f"job-{job}",
+                "chunk_index": index,
+                "content_hash": content_hash,
+            },
+        }
+        for job in range(JOBS)
+        for index in range(CHUNKS_PER_JOB)
+    ]
+    batches = []
+    for start in range(0, len(chunks), BATCH_SIZE):
+        batch = chunks[start : start + BATCH_SIZE]
+        dense = rng.normal(size=(len(batch), DIMENSION)).astype(np.float32)
+        sparse = [
+            (np.array([j % 5, 10 + j % 3]), np.array([1.0, 0.5], np.float32))
+            for j in range(start, start + len(batch))
+        ]
+        batches.append((batch, dense, sparse))
+    return batches
+
+
+def interrupted(batches, after):
+    """Yield a number of batches, then fail like a crashed run"""
+    yield from batches[:after]
+    raise RuntimeError("interrupted")
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(numpy_backend.config, "NUMPY_FLUSH_POINTS", 10)
+    backend = NumpyBackend(tmp_path / "index")
+    backend.index_dir.mkdir()
+    NumpyCollection(DIMENSION).save(backend.collection_path("jobs_v1"))
+    return backend
+
+
+def stored_points(backend):
+    index = NumpyIndex(backend.collection_path("jobs_v1"))
+    return {
+        (payload["chunk_id"], payload["chunk_index"]): payload["content_hash"]
+        for payload in index.payloads
+    }
+
+
+def test_upload_stores_every_chunk(backend):
+    stored = backend.upload_embedded_chunks(make_batches(), None, None, "jobs_v1")
+
+    assert stored == JOBS * CHUNKS_PER_JOB
+    assert len(stored_points(backend)) == JOBS * CHUNKS_PER_JOB
+
+
+def test_interrupted_upload_resumes_after_last_save(backend, tmp_path):
+    checkpoint = UploadCheckpoint(tmp_path / "checkpoint.json", "run")
+    checkpoint.start({}, "jobs_v1")
+    with pytest.raises(RuntimeError):
+        backend.upload_embedded_chunks(
+            interrupted(make_batches(), 3), checkpoint, None, "jobs_v1"
+        )
+    # Saved every 10 points, so the first two batches of 6 are on disk
+    assert len(stored_points(backend)) == 2 * BATCH_SIZE
+
+    checkpoint = UploadCheckpoint(tmp_path / "checkpoint.json", "run")
+    assert checkpoint.resume() == {}
+    stored = backend.upload_embedded_chunks(make_batches(), checkpoint, None, "jobs_v1")
+
+    assert stored == JOBS * CHUNKS_PER_JOB - 2 * BATCH_SIZE
+    assert len(stored_points(backend)) == JOBS * CHUNKS_PER_JOB
+
+
+def test_delete_job_points(backend):
+    backend.upload_embedded_chunks(make_batches(), None, None, "jobs_v1")
+
+    backend.delete_job_points(["job-0", "job-5"], "jobs_v1")
+
+    jobs = {job for job, _ in stored_points(backend)}
+    assert jobs == {f"job-{job}" for job in range(JOBS)} - {"job-0", "job-5"}
+
+
+def test_delete_stale_job_points(backend):
+    backend.upload_embedded_chunks(make_batches(), None, None, "jobs_v1")
+    changed = make_batches("v2")[0]
+    # Job 0 now has a single chunk
+    backend.upload_embedded_chunks(
+        [(changed[0][:1], changed[1][:1], changed[2][:1])], None, None, "jobs_v1"
+    )
+
+    backend.delete_stale_job_points({"job-0": "v2"}, "jobs_v1")
+
+    points = stored_points(backend)
+    assert [key for key in points if key[0] == "job-0"] == [("job-0", 0)]
+    assert points[("job-0", 0)] == "v2"
+    assert len(points) == JOBS * CHUNKS_PER_JOB - 2
+
+
+def test_deleted_points_are_not_found(backend):
+    backend.upload_embedded_chunks(make_batches(), None, None, "jobs_v1")
+    path = backend.collection_path("jobs_v1")
+    dense, sparse = (
+        make_batches()[0][1][0],
+        models.SparseVector(indices=[0, 10], values=[1.0, 1.0]),
+    )
+
+    delete_points(path, lambda payload: payload["chunk_id"] == "job-0")
+
+    index = NumpyIndex(path)
+    points = index.search((dense.tolist(), sparse), None, JOBS)
+    assert {point.payload["chunk_id"] for point in points} == {
+        f"job-{job}" for job in range(1, JOBS)
+    }
+    # Posting lists only reference remaining points
+    assert index.term_points.max() < index.size
+    assert np.all(np.diff(index.indptr) > 0)
+
+
+def test_delete_without_match_keeps_files(backend):
+    backend.upload_embedded_chunks(make_batches(), None, None, "jobs_v1")
+    path = backend.collection_path("jobs_v1")
+    inode = path.stat().st_ino
+
+    assert delete_points(path, lambda payload: False) == 0
+    assert path.stat().st_ino == inode
@@ -0,0 +1,25 @@
+"""Canonical payload fields of the job chunks"""
+
+import pytest
+
+from common.payload_fields import parse_timestamp
+
+
+@pytest.mark.parametrize(
+    "value, timestamp",
+    [
+        ("2025-09-20T10:00:00Z", "2025-09-20T10:00:00Z"),
+        ("2025-09-20T12:00:00+02:00", "2025-09-20T10:00:00Z"),
+        ("2025-09-20", "2025-09-20T00:00:00Z"),
+        ("April 5, 2025", "2025-04-05T00:00:00Z"),
+        ("Apr 5, 2025", "2025-04-05T00:00:00Z"),
+        ("5 April 2025", "2025-04-05T00:00:00Z"),
+    ],
+)
+def test_parse_timestamp(value, timestamp):
+    assert parse_timestamp(value) == timestamp
+
+
+@pytest.mark.parametrize("value", ["04/05/2025", "13/04/2025", "soon", "", None])
+def test_ambiguous_or_invalid_dates_are_rejected(value):
+    assert parse_timestamp(value) is None
@@ -0,0 +1,71 @@
+"""LLM query parsing, sync and async"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from search.services import query_parser
+
+RESPONSE = (
+    '{"semantic_query": "frontend developer", "filters": {"date_range": {"days": 7}}}'
+)
+
+
+class FakeModel:
+    """LLM answering every parsing prompt with the same JSON"""
+
+    def __init__(self, text=RESPONSE):
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None):
+        self.calls += 1
+        return SimpleNamespace(text=self.text)
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        return self.generate_content(prompt, generation_config)
+
+
+def parse_sync(query):
+    return query_parser.convert_query_to_semantic_and_filter(query)
+
+
+def parse_async(query):
+    return asyncio.run(query_parser.convert_query_to_semantic_and_filter_async(query))
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(query_parser, "model", model)
+    monkeypatch.setattr(query_parser, "parse_with_rules", lambda query: None)
+    query_parser.parse_cache.clear()
+    yield model
+    query_parser.parse_cache.clear()
+
+
+@pytest.mark.parametrize("parse", [parse_sync, parse_async])
+def test_parse_resolves_dates_and_caches(model, parse):
+    parsed = parse("Frontend  developer, recent")
+    cached = parse("frontend developer, RECENT")
+
+    assert parsed["semantic_query"] == "frontend developer"
+    assert set(parsed["filters"]["date_range"]) == {"gte", "lte", "gt", "lt"}
+    assert cached == parsed
+    assert model.calls == 1
+
+
+@pytest.mark.parametrize("parse", [parse_sync, parse_async])
+def test_unusable_response_is_not_cached(model, parse):
+    model.text = "no json here"
+
+    assert parse("frontend developer") is None
+    assert parse("frontend developer") is None
+    assert model.calls == 2
+
+
+@pytest.mark.parametrize("parse", [parse_sync, parse_async])
+def test_empty_query(model, parse):
+    assert parse("   ") is None
+    assert model.calls == 0
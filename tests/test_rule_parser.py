@@ -0,0 +1,106 @@
+"""Rule-based parsing of simple queries"""
+
+import pytest
+
+from search.services import rule_parser
+
+
+class FakeStore:
+    """Document store holding only the distinct job values"""
+
+    def __init__(self, **values):
+        self.values = values
+
+    def distinct_job_values(self, field):
+        return self.values.get(field, [])
+
+
+@pytest.fixture
+def gazetteer(monkeypatch):
+    gazetteer = rule_parser.build_gazetteer(
+        FakeStore(
+            company=["Google", "Leapfrog Technology Inc."],
+            location=["London, UK", "San Francisco, CA"],
+        )
+    )
+    monkeypatch.setattr(rule_parser, "get_gazetteer", lambda: gazetteer)
+    return gazetteer
+
+
+def test_simple_query(gazetteer):
+    parsed = rule_parser.parse_query("Senior Python developer in London")
+
+    assert parsed["semantic_query"] == "Python developer"
+    assert parsed["filters"] == {"Level": "Senior Level", "location": "london"}
+    assert parsed["confidence"] == 1.0
+
+
+def test_relative_date(gazetteer):
+    parsed = rule_parser.parse_query("Data scientist jobs posted in the Last 30 Days")
+
+    assert parsed["semantic_query"] == "Data scientist"
+    assert parsed["filters"] == {"date_range": {"days": 30}}
+
+
+def test_casefolding_keeps_spans_of_the_query(gazetteer):
+    # "ß" casefolds to "ss" and "İ" to two characters, shifting later words
+    parsed = rule_parser.parse_query("Straße İİ engineer in London")
+
+    assert parsed["semantic_query"] == "Straße İİ engineer"
+    assert parsed["filters"] == {"location": "london"}
+
+
+def test_negation_leaves_query_to_llm(gazetteer):
+    parsed = rule_parser.parse_query("remote jobs except sales")
+
+    assert parsed["confidence"] == 0.0
+
+
+@pytest.mark.parametrize(
+    "query", ["python jobs posted in 2024", "python jobs since 2024", "python in 2024"]
+)
+def test_year_after_date_word(gazetteer, query):
+    parsed = rule_parser.parse_query(query)
+
+    assert parsed["semantic_query"] == "python"
+    assert "date_range" in parsed["filters"]
+    assert parsed["confidence"] == 1.0
+
+
+def test_year_without_date_word_is_not_a_date(gazetteer):
+    parsed = rule_parser.parse_query("SQL Server 2019 dba")
+
+    assert parsed["semantic_query"] == "SQL Server 2019 dba"
+    assert parsed["filters"] == {}
+    assert parsed["confidence"] < rule_parser.config.RULE_PARSER_MIN_CONFIDENCE
+
+
+@pytest.fixture
+def role_word_companies(monkeypatch):
+    gazetteer = rule_parser.build_gazetteer(
+        FakeStore(company=["Python Software Foundation", "Data Inc", "Google"])
+    )
+    monkeypatch.setattr(rule_parser, "get_gazetteer", lambda: gazetteer)
+    return gazetteer
+
+
+@pytest.mark.parametrize("query", ["python developer", "data engineer"])
+def test_company_keyword_describing_the_role(role_word_companies, query):
+    parsed = rule_parser.parse_query(query)
+
+    assert parsed["confidence"] < rule_parser.config.RULE_PARSER_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize(
+    "query, company",
+    [
+        ("developer jobs at Google", "google"),
+        ("jobs at Python Software Foundation", "python software foundation"),
+        ("engineer at Data", "data"),
+    ],
+)
+def test_company_name(role_word_companies, query, company):
+    parsed = rule_parser.parse_query(query)
+
+    assert parsed["filters"] == {"company": company}
+    assert parsed["confidence"] == 1.0
@@ -0,0 +1,99 @@
+"""Speculative search on the raw query while the LLM parses it"""
+
+import asyncio
+
+import pytest
+
+from search.config import SearchConfig
+from search.services import result_cache as result_cache_module
+from search.services import search_service
+from search.services.result_cache import ResultCache
+from search.services.search_service import AsyncSearchService, SpeculationStats
+
+QUERY = "Python developer"
+
+
+class FakeSearch:
+    """Vector search recording the queries it was asked for"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, query, filters=None, limit=3):
+        self.calls.append((query, filters))
+        await asyncio.sleep(0.01)
+        return [f"result of {query}"]
+
+
+@pytest.fixture
+def search(monkeypatch):
+    search = FakeSearch()
+    monkeypatch.setattr(search_service, "search_async", search)
+    monkeypatch.setattr(search_service, "result_cache", ResultCache(16))
+    monkeypatch.setattr(search_service, "speculation_stats", SpeculationStats())
+    monkeypatch.setattr(result_cache_module, "current_ingestion_version", lambda: "v1")
+    monkeypatch.setattr(search_service.config, "SPECULATIVE_SEARCH_ENABLED", True)
+    monkeypatch.setattr(search_service.config, "SPECULATIVE_PARSE_DEADLINE", 1.0)
+    return search
+
+
+def parse_after(monkeypatch, delay, parsed_query):
+    async def parse(query):
+        await asyncio.sleep(delay)
+        return parsed_query
+
+    monkeypatch.setattr(
+        search_service, "convert_query_to_semantic_and_filter_async", parse
+    )
+
+
+def find_results(query=QUERY, top=3):
+    return asyncio.run(AsyncSearchService()._find_results(query, top))
+
+
+def test_disabled_by_default():
+    assert SearchConfig.model_fields["SPECULATIVE_SEARCH_ENABLED"].default is False
+
+
+def test_disabled_searches_the_parsed_query_only(monkeypatch, search):
+    monkeypatch.setattr(search_service.config, "SPECULATIVE_SEARCH_ENABLED", False)
+    parse_after(monkeypatch, 0.01, {"semantic_query": "python developer"})
+
+    assert find_results() == ["result of python developer"]
+    assert search.calls == [("python developer", None)]
+    assert search_service.speculation_stats.stats()["speculated"] == 0
+
+
+def test_hit_serves_and_caches_the_raw_query_search(monkeypatch, search):
+    parse_after(monkeypatch, 0.02, {"semantic_query": "python developer"})
+
+    assert find_results() == [f"result of {QUERY}"]
+    assert search.calls == [(QUERY, None)]
+    assert search_service.result_cache.get(QUERY, None, 3) == [f"result of {QUERY}"]
+    assert search_service.speculation_stats.stats()["hits"] == 1
+
+
+def test_filters_miss_and_search_again(monkeypatch, search):
+    parse_after(
+        monkeypatch,
+        0.02,
+        {"semantic_query": "python developer", "filters": {"location": "Berlin"}},
+    )
+
+    assert find_results() == ["result of python developer"]
+    assert search.calls[0] == (QUERY, None)
+    assert search.calls[1][0] == "python developer"
+    assert search.calls[1][1] is not None
+    assert search_service.speculation_stats.stats()["misses"] == 1
+
+
+def test_deadline_miss_serves_the_raw_query_search(monkeypatch, search):
+    monkeypatch.setattr(search_service.config, "SPECULATIVE_PARSE_DEADLINE", 0.05)
+    warnings = []
+    monkeypatch.setattr(search_service.logger, "warning", warnings.append)
+    parse_after(monkeypatch, 0.5, {"semantic_query": "backend engineer"})
+
+    assert find_results() == [f"result of {QUERY}"]
+    assert search.calls == [(QUERY, None)]
+    assert search_service.speculation_stats.stats()["deadline_exceeded"] == 1
+    assert any("exceeded" in warning for warning in warnings)
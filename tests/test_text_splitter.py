@@ -0,0 +1,61 @@
+"""Word count text splitting against langchain"""
+
+import pytest
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from data_ingestion.text_splitter import WordCountTextSplitter
+
+TEXTS = [
+    "",
+    "one",
+    "   ",
+    "short text well under the chunk size",
+    " ".join(f"word{i}" for i in range(60)),
+    "\n\n".join(
+        "\n".join(" ".join(f"p{p}l{line}w{w}" for w in range(7)) for line in range(3))
+        for p in range(5)
+    ),
+    "Responsibilities:\n\n- Build services\n- Review code\n\n\n\nRequirements:\n"
+    + "Python " * 30,
+    # Words longer than any chunk can only be split by characters
+    "x" * 50 + " " + "y" * 10 + " tail words here",
+    "a b\tc d e　f " * 8,
+]
+
+
+def langchain_splitter(chunk_size, chunk_overlap, separators=None):
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=separators,
+        length_function=lambda text: len(text.split()),
+    )
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(5, 0), (5, 2), (8, 8), (1, 0)])
+@pytest.mark.parametrize("text", TEXTS)
+def test_matches_langchain(text, chunk_size, chunk_overlap):
+    expected = langchain_splitter(chunk_size, chunk_overlap).split_text(text)
+
+    assert WordCountTextSplitter(chunk_size, chunk_overlap).split_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "separators", [["\n", ""], [""], [" "], ["--", " ", ""], ["\n\n", "\n"]]
+)
+@pytest.mark.parametrize("text", TEXTS)
+def test_custom_separators_match_langchain(text, separators):
+    expected = langchain_splitter(4, 1, separators).split_text(text)
+
+    assert WordCountTextSplitter(4, 1, separators).split_text(text) == expected
+
+
+def test_split_texts_splits_each_text():
+    splitter = WordCountTextSplitter(5, 1)
+
+    assert splitter.split_texts(TEXTS) == [splitter.split_text(text) for text in TEXTS]
+
+
+def test_overlap_larger_than_chunk_size():
+    with pytest.raises(ValueError):
+        WordCountTextSplitter(chunk_size=3, chunk_overlap=4)
@@ -0,0 +1 @@
+"""Vector backends - Storage and hybrid search of the job chunk vectors"""
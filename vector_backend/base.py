@@ -0,0 +1,248 @@
+"""Interface shared by the vector backends
+
+A backend stores the dense and sparse vectors of the job chunks with
+their slim payloads, and answers the hybrid queries of search. Ingestion
+builds versioned collections through it and switches search to a new
+version once it is complete, so neither the setup script nor search
+depends on where the vectors live.
+
+Filters are Qdrant Filter objects, query vectors the (dense, sparse) pairs
+of embed_query and results Qdrant ScoredPoints, whatever the backend.
+"""
+
+import re
+import uuid
+from abc import ABC, abstractmethod
+from datetime import UTC, datetime
+
+from qdrant_client import models
+
+from common.document_store import slim_payload
+from common.payload_fields import canonical_fields
+from common.qdrant_config import QdrantConfig
+
+config = QdrantConfig()
+
+# Name search queries, an alias of the live collection version
+collection_name = config.COLLECTION_NAME
+
+# Payload field identifying the job a chunk belongs to
+JOB_ID_FIELD = "chunk_id"
+
+# Growth of the prefetch depth between attempts of a grouped search
+PREFETCH_GROWTH_FACTOR = 4
+
+VERSION_PATTERN = re.compile(rf"{re.escape(collection_name)}_v\d{{14}}")
+
+# Namespace for deterministic point ids, so re-ingesting a chunk overwrites it
+POINT_ID_NAMESPACE = uuid.UUID("6f1c2a53-8b0e-4c55-9a51-2f3d8e7b9c10")
+
+
+def collection_version_name() -> str:
+    """Name of a new collection version, ordered by creation time"""
+    return f"{collection_name}_v{datetime.now(UTC):%Y%m%d%H%M%S}"
+
+
+def get_point_id(job_id, chunk_index):
+    """Build the deterministic point id of a job chunk
+
+    Args:
+        job_id: Job id the chunk belongs to
+        chunk_index: Position of the chunk within the job description
+
+    Returns:
+        Point id as a UUID string
+    """
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{job_id}:{chunk_index}"))
+
+
+def get_point_payload(chunk, document_store=None):
+    """Build the payload of a job chunk
+
+    Args:
+        chunk: Chunk with text and metadata
+        document_store: Optional document store holding the chunk texts and
+            job details, which are then left out of the payload
+
+    Returns:
+        Payload dictionary
+    """
+    if document_store is not None:
+        return slim_payload(chunk)
+    return {
+        "text": chunk["text"],
+        **chunk["metadata"],
+        **canonical_fields(chunk["metadata"]),
+    }
+
+
+def prefetch_depth(limit: int) -> int:
+    """Number of candidates each branch of the hybrid query returns
+
+    Grows with the requested limit, as a job spans several chunks. It is
+    not capped by the number of points matching the filter: a filtered
+    branch never returns more points than match anyway, and the estimated
+    count of a filter on correlated fields falls well below the real one.
+
+    Args:
+        limit: Maximum number of results of the query
+
+    Returns:
+        Prefetch limit, never below the requested limit
+    """
+    depth = max(config.PREFETCH_MIN_LIMIT, limit * config.PREFETCH_DEPTH_FACTOR)
+    return max(min(depth, config.PREFETCH_MAX_LIMIT), limit)
+
+
+def deeper_prefetch_depth(depth: int, available: int | None) -> int | None:
+    """Prefetch depth of the retry of a grouped search that found too few jobs
+
+    A job with many matching chunks can fill the prefetched candidates, so
+    grouping leaves fewer jobs than requested. The retry prefetches more,
+    until the candidates cover every point that can match.
+
+    Args:
+        depth: Prefetch depth of the previous attempt
+        available: Number of points matching the filter, None if unknown
+
+    Returns:
+        Larger depth, None if the previous attempt already covered every
+        matching point or reached GROUPED_PREFETCH_MAX_LIMIT
+    """
+    ceiling = config.GROUPED_PREFETCH_MAX_LIMIT
+    if available is not None:
+        ceiling = min(ceiling, available)
+    if depth >= ceiling:
+        return None
+    return min(depth * PREFETCH_GROWTH_FACTOR, ceiling)
+
+
+class VectorBackend(ABC):
+    """Storage and hybrid search of the job chunk vectors
+
+    Subclasses implement every abstract method, so a backend missing one
+    fails when it is created. The async search variants default to the
+    sync ones, which suits in-process backends.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def search(
+        self, query_vectors, filters: models.Filter | None, limit: int
+    ) -> list[models.ScoredPoint]:
+        """Fuse dense and sparse rankings and keep the best chunk per job
+
+        Args:
+            query_vectors: Dense and sparse vectors of the query
+            filters: Optional filter object
+            limit: Maximum number of jobs
+
+        Returns:
+            Best scoring chunk of up to limit distinct jobs, highest score first
+        """
+
+    @abstractmethod
+    def search_batch(self, searches) -> list[list[models.ScoredPoint]]:
+        """Run many hybrid searches at once, without grouping by job
+
+        Args:
+            searches: (query vectors, filter object or None, limit) of each
+                search
+
+        Returns:
+            List of scored chunks for each search, in order
+        """
+
+    @abstractmethod
+    def count(self, filters: models.Filter | None) -> int | None:
+        """Number of points matching a filter, possibly estimated
+
+        Args:
+            filters: Optional filter object
+
+        Returns:
+            Number of matching points, None without filter or if unknown
+        """
+
+    async def search_async(
+        self, query_vectors, filters: models.Filter | None, limit: int
+    ) -> list[models.ScoredPoint]:
+        """Async variant of search"""
+        return self.search(query_vectors, filters, limit)
+
+    async def search_batch_async(self, searches) -> list[list[models.ScoredPoint]]:
+        """Async variant of search_batch"""
+        return self.search_batch(searches)
+
+    @abstractmethod
+    def get_live_collection(self) -> str | None:
+        """Name of the collection version search queries, None if none"""
+
+    @abstractmethod
+    def collection_exists(self, name: str) -> bool:
+        """Check whether a collection version exists"""
+
+    @abstractmethod
+    def new_collection_version(self) -> str:
+        """Create an empty collection version and return its name"""
+
+    @abstractmethod
+    def fetch_job_content_hashes(self, target_collection: str) -> dict[str, str]:
+        """Content hash of every job stored in a collection, keyed by job id"""
+
+    @abstractmethod
+    def has_unhashed_points(self, target_collection: str) -> bool:
+        """Check whether a collection holds points without a content hash"""
+
+    @abstractmethod
+    def upload_embedded_chunks(
+        self, embedded_batches, checkpoint, document_store, target_collection: str
+    ) -> int:
+        """Store embedded chunks, replacing chunks with the same point id
+
+        Args:
+            embedded_batches: Iterable of (chunk batch, dense vectors, sparse
+                vectors) tuples
+            checkpoint: Optional upload checkpoint to record progress in and
+                resume from
+            document_store: Optional document store receiving the chunk texts
+            target_collection: Collection to upload to
+
+        Returns:
+            Number of chunks uploaded
+        """
+
+    @abstractmethod
+    def create_field_indexes(self, target_collection: str) -> None:
+        """Index the payload fields search filters on"""
+
+    @abstractmethod
+    def wait_until_indexed(self, target_collection: str) -> None:
+        """Wait until a collection is ready to be searched"""
+
+    @abstractmethod
+    def warm_collection(self, target_collection: str) -> None:
+        """Load a collection so its first live queries are fast"""
+
+    @abstractmethod
+    def switch_alias(self, target_collection: str) -> None:
+        """Point search at a collection version in one atomic operation"""
+
+    @abstractmethod
+    def delete_old_versions(self) -> list[str]:
+        """Delete collection versions beyond COLLECTION_VERSIONS_KEPT
+
+        Returns:
+            Names of the deleted versions
+        """
+
+    @abstractmethod
+    def delete_job_points(self, job_ids, target_collection: str) -> None:
+        """Delete every chunk of the given jobs"""
+
+    @abstractmethod
+    def delete_stale_job_points(
+        self, content_hashes: dict[str, str], target_collection: str
+    ) -> None:
+        """Delete chunks of changed jobs whose content hash is outdated"""
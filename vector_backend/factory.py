@@ -0,0 +1,59 @@
+"""Selection of the vector backend configured by VECTOR_BACKEND"""
+
+import threading
+
+from common.exception import ConfigurationError
+from common.logger import get_logger
+from common.qdrant_config import QdrantConfig
+from vector_backend.base import VectorBackend
+from vector_backend.numpy_backend import NumpyBackend
+from vector_backend.qdrant_backend import QdrantBackend
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+BACKENDS: dict[str, type[VectorBackend]] = {
+    QdrantBackend.name: QdrantBackend,
+    NumpyBackend.name: NumpyBackend,
+}
+
+_backend: VectorBackend | None = None
+_lock = threading.Lock()
+
+
+def create_backend(name: str) -> VectorBackend:
+    """Create a vector backend by name
+
+    Args:
+        name: Backend name, a key of BACKENDS
+
+    Returns:
+        New backend instance
+
+    Raises:
+        ConfigurationError: If no backend has this name
+    """
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ConfigurationError(
+            f"Unknown vector backend '{name}', expected one of {list(BACKENDS)}"
+        ) from None
+    return backend_class()
+
+
+def get_backend() -> VectorBackend:
+    """Get the shared vector backend, creating it on first use
+
+    Returns:
+        Backend selected by VECTOR_BACKEND
+    """
+    global _backend
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _backend = create_backend(config.VECTOR_BACKEND)
+                logger.info(f"Using the {config.VECTOR_BACKEND} vector backend")
+    return _backend
@@ -0,0 +1,229 @@
+"""In-process vector backend on memory-mapped NumPy collections
+
+Each collection version is a directory under NUMPY_INDEX_DIR, written by
+ingestion and memory-mapped by search, so single-node deployments and
+tests search without any external service. A small alias file names the
+version search reads and is replaced atomically, like the Qdrant alias.
+Search reopens the live collection when the alias or the collection
+directory changes on disk.
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from common.collection_profiles import DENSE_VECTOR_SIZE
+from common.logger import get_logger
+from common.qdrant_config import QdrantConfig
+from search.exceptions import VectorDatabaseError
+from vector_backend.base import (
+    JOB_ID_FIELD,
+    VERSION_PATTERN,
+    VectorBackend,
+    collection_name,
+    collection_version_name,
+    get_point_id,
+    get_point_payload,
+)
+from vector_backend.numpy_index import (
+    POINTS_FILE,
+    NumpyCollection,
+    NumpyIndex,
+    delete_points,
+)
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+
+class NumpyBackend(VectorBackend):
+    """Vector backend searching collections in process
+
+    Args:
+        index_dir: Directory of the collections, defaults to NUMPY_INDEX_DIR
+    """
+
+    name = "numpy"
+
+    def __init__(self, index_dir: str | Path | None = None):
+        self.index_dir = Path(index_dir or config.NUMPY_INDEX_DIR)
+        self.alias_path = self.index_dir / f"{collection_name}.alias"
+        self._index: NumpyIndex | None = None
+        self._index_key = None
+        self._lock = threading.Lock()
+
+    def collection_path(self, name: str) -> Path:
+        return self.index_dir / name
+
+    def live_index(self) -> NumpyIndex:
+        """Open the live collection, again if it changed on disk
+
+        Returns:
+            Index of the collection the alias points at
+
+        Raises:
+            VectorDatabaseError: If no collection was ingested yet
+        """
+        version = self.get_live_collection()
+        if version is None:
+            raise VectorDatabaseError(
+                f"No collection found in {self.index_dir}, run the setup script"
+            )
+        # Saving a collection replaces its directory, changing its inode
+        stat = self.collection_path(version).stat()
+        key = (version, stat.st_ino, stat.st_mtime_ns)
+        if key != self._index_key:
+            with self._lock:
+                if key != self._index_key:
+                    self._index = NumpyIndex(self.collection_path(version))
+                    self._index_key = key
+        return self._index
+
+    def search(self, query_vectors, filters, limit):
+        return self.live_index().search(query_vectors, filters, limit)
+
+    def search_batch(self, searches):
+        return self.live_index().search_batch(searches)
+
+    def count(self, filters) -> int | None:
+        if filters is None:
+            return None
+        return self.live_index().count(filters)
+
+    def get_live_collection(self) -> str | None:
+        try:
+            return self.alias_path.read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def collection_exists(self, name: str) -> bool:
+        return (self.collection_path(name) / POINTS_FILE).exists()
+
+    def new_collection_version(self) -> str:
+        version_name = collection_version_name()
+        logger.info(f"Creating new collection: {version_name}")
+        NumpyCollection(DENSE_VECTOR_SIZE).save(self.collection_path(version_name))
+        return version_name
+
+    def fetch_job_content_hashes(self, target_collection: str) -> dict[str, str]:
+        index = NumpyIndex(self.collection_path(target_collection))
+        hashes = {
+            str(payload.get(JOB_ID_FIELD)): payload.get("content_hash")
+            for payload in index.payloads
+            if payload.get("chunk_index") == 0
+        }
+        logger.info(
+            f"Found {len(hashes)} jobs already in collection {target_collection}"
+        )
+        return hashes
+
+    def has_unhashed_points(self, target_collection: str) -> bool:
+        index = NumpyIndex(self.collection_path(target_collection))
+        return any(payload.get("content_hash") is None for payload in index.payloads)
+
+    def upload_embedded_chunks(
+        self, embedded_batches, checkpoint, document_store, target_collection
+    ) -> int:
+        """Store embedded chunks, saving the collection every NUMPY_FLUSH_POINTS
+
+        Each save is recorded in the checkpoint, so a resumed run skips the
+        chunks saved before it stopped. Dense vectors of saved points stay
+        memory-mapped.
+        """
+        path = self.collection_path(target_collection)
+        collection = NumpyCollection.load(path)
+        position = flushed = 0
+        pending = skipped = 0
+
+        def flush():
+            collection.save(path)
+            if checkpoint is not None:
+                checkpoint.mark_completed(flushed, position)
+
+        for chunks, dense, sparse in embedded_batches:
+            if document_store is not None:
+                document_store.add_chunks(chunks)
+            for i, chunk in enumerate(chunks):
+                if checkpoint is not None and checkpoint.is_completed(position):
+                    skipped += 1
+                else:
+                    metadata = chunk["metadata"]
+                    collection.upsert(
+                        get_point_id(metadata["chunk_id"], metadata["chunk_index"]),
+                        get_point_payload(chunk, document_store),
+                        dense[i],
+                        sparse[i],
+                    )
+                    pending += 1
+                position += 1
+            if pending >= config.NUMPY_FLUSH_POINTS:
+                flush()
+                flushed, pending = position, 0
+        if pending:
+            flush()
+        if skipped:
+            logger.info(f"Skipped {skipped} chunks stored before the checkpoint")
+        logger.info(f"Successfully stored all {position - skipped} chunks in {path}")
+        return position - skipped
+
+    def create_field_indexes(self, target_collection: str) -> None:
+        # Filter bitmaps are built from the payloads when a collection is opened
+        logger.info("Payload fields are indexed when the collection is opened")
+
+    def wait_until_indexed(self, target_collection: str) -> None:
+        # Collections are complete as soon as they are saved
+        pass
+
+    def warm_collection(self, target_collection: str) -> None:
+        NumpyIndex(self.collection_path(target_collection)).warm()
+        logger.info(f"Warmed collection {target_collection}")
+
+    def switch_alias(self, target_collection: str) -> None:
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        staging = self.alias_path.with_name(f"{self.alias_path.name}.tmp")
+        staging.write_text(target_collection)
+        os.replace(staging, self.alias_path)
+        logger.info(f"Alias {collection_name} now points at {target_collection}")
+
+    def delete_old_versions(self) -> list[str]:
+        keep = config.COLLECTION_VERSIONS_KEPT
+        live_collection = self.get_live_collection()
+        versions = sorted(
+            (
+                path.name
+                for path in self.index_dir.iterdir()
+                if path.is_dir()
+                and VERSION_PATTERN.fullmatch(path.name)
+                and path.name != live_collection
+            ),
+            reverse=True,
+        )
+        deleted = versions[max(keep - 1, 0) :]
+        for version_name in deleted:
+            shutil.rmtree(self.collection_path(version_name))
+            logger.info(f"Deleted old collection version {version_name}")
+        return deleted
+
+    def delete_job_points(self, job_ids, target_collection: str) -> None:
+        job_ids = {str(job_id) for job_id in job_ids}
+        deleted = delete_points(
+            self.collection_path(target_collection),
+            lambda payload: str(payload.get(JOB_ID_FIELD)) in job_ids,
+        )
+        logger.info(f"Deleted {deleted} points of {len(job_ids)} jobs")
+
+    def delete_stale_job_points(self, content_hashes, target_collection) -> None:
+        def is_stale(payload):
+            job_id = str(payload.get(JOB_ID_FIELD))
+            return (
+                job_id in content_hashes
+                and payload.get("content_hash") != content_hashes[job_id]
+            )
+
+        deleted = delete_points(self.collection_path(target_collection), is_stale)
+        logger.info(
+            f"Deleted {deleted} stale chunks of {len(content_hashes)} changed jobs"
+        )
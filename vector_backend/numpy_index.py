@@ -0,0 +1,654 @@
+"""In-process hybrid search over memory-mapped NumPy arrays
+
+A collection is a directory of .npy files and one JSON file:
+
+- dense.npy: float32 matrix of the L2 normalized dense vectors, one row
+  per point, so cosine similarity is a single matrix-vector product
+- sparse_terms.npy, sparse_indptr.npy, sparse_points.npy and
+  sparse_weights.npy: the BM25 term weights as a CSR matrix with one row
+  per term, that is the posting lists of an inverted index
+- points.json: id and payload of each point
+
+Arrays are memory-mapped, so opening a collection copies nothing and the
+page cache is shared by every process serving it. Filters are evaluated
+as packed bitmaps of the payload values, and the dense and sparse rankings
+are fused with reciprocal rank fusion and grouped by job, scoring like the
+Qdrant backend.
+"""
+
+import json
+import shutil
+import threading
+from collections import defaultdict
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+import numpy as np
+from qdrant_client import models
+
+from common.logger import get_logger
+from common.qdrant_config import QdrantConfig
+from common.ttl_cache import TTLCache
+from search.exceptions import VectorDatabaseError
+from vector_backend.base import JOB_ID_FIELD, deeper_prefetch_depth, prefetch_depth
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+DENSE_FILE = "dense.npy"
+POINTS_FILE = "points.json"
+SPARSE_FILES = {
+    "terms": "sparse_terms.npy",
+    "indptr": "sparse_indptr.npy",
+    "points": "sparse_points.npy",
+    "weights": "sparse_weights.npy",
+}
+
+# Rank constant of reciprocal rank fusion, the one Qdrant uses
+RRF_K = 2
+
+# Below this fraction of matching points, only their dense rows are scored
+DENSE_SUBSET_FRACTION = 0.1
+
+# Bitmaps of (field, value) pairs kept for the next filters
+BITMAP_CACHE_SIZE = 4096
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, highest first
+
+    Args:
+        scores: 1D array of scores
+        k: Number of positions to return
+
+    Returns:
+        Array of at most k positions into scores
+    """
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    # Sorted so equal scores keep the order of their positions
+    candidates = np.sort(np.argpartition(-scores, k - 1)[:k])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def reciprocal_rank_fusion(rankings: list[np.ndarray]) -> list[tuple[int, float]]:
+    """Fuse rankings by the reciprocal of each point's rank
+
+    Args:
+        rankings: Point positions of each ranking, best first
+
+    Returns:
+        (position, fused score) pairs, highest score first, ties in order
+        of first appearance
+    """
+    fused: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, position in enumerate(ranking.tolist()):
+            fused[position] = fused.get(position, 0.0) + 1.0 / (rank + RRF_K)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+def to_datetime64(value) -> np.datetime64:
+    """Convert a payload or filter timestamp to a UTC datetime64
+
+    Args:
+        value: RFC 3339 string, datetime or date, naive values being UTC
+
+    Returns:
+        datetime64 in seconds, NaT if the value is missing or invalid
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return np.datetime64("NaT")
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(UTC).replace(tzinfo=None)
+        return np.datetime64(value, "s")
+    if isinstance(value, date):
+        return np.datetime64(value, "s")
+    return np.datetime64("NaT")
+
+
+def json_value(value):
+    """JSON value of NumPy scalars found in payloads"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Payload value of type {type(value).__name__} is not JSON")
+
+
+def build_inverted_index(
+    sparse_vectors: list[tuple[np.ndarray, np.ndarray]],
+) -> dict[str, np.ndarray]:
+    """Transpose per point sparse vectors into term posting lists
+
+    Args:
+        sparse_vectors: (term indices, weights) of each point
+
+    Returns:
+        Arrays of SPARSE_FILES: sorted term ids, row offsets, and the point
+        positions and weights of each term, by point position
+    """
+    lengths = np.array([len(indices) for indices, _ in sparse_vectors], np.int64)
+    if not lengths.sum():
+        return {
+            "terms": np.zeros(0, np.int64),
+            "indptr": np.zeros(1, np.int64),
+            "points": np.zeros(0, np.int32),
+            "weights": np.zeros(0, np.float32),
+        }
+    points = np.repeat(np.arange(len(sparse_vectors), dtype=np.int32), lengths)
+    terms = np.concatenate([indices for indices, _ in sparse_vectors]).astype(np.int64)
+    weights = np.concatenate([values for _, values in sparse_vectors])
+    order = np.lexsort((points, terms))
+    unique_terms, starts = np.unique(terms[order], return_index=True)
+    return {
+        "terms": unique_terms,
+        "indptr": np.append(starts, len(order)).astype(np.int64),
+        "points": points[order],
+        "weights": weights[order].astype(np.float32),
+    }
+
+
+def write_collection(
+    path: Path, dense: np.ndarray, sparse: dict[str, np.ndarray], records: list[dict]
+) -> None:
+    """Write the files of a collection, replacing the previous version of it
+
+    Files are written to a sibling directory which then takes the place
+    of the old one, so readers never open a half-written collection.
+    Readers that already mapped the old files keep using them until
+    they reload.
+
+    Args:
+        path: Collection directory
+        dense: Normalized dense vectors, one row per point
+        sparse: Arrays of SPARSE_FILES
+        records: Id and payload of each point
+    """
+    staging = path.with_name(f"{path.name}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    np.save(staging / DENSE_FILE, dense)
+    for name, file in SPARSE_FILES.items():
+        np.save(staging / file, sparse[name])
+    (staging / POINTS_FILE).write_text(json.dumps(records, default=json_value))
+
+    previous = path.with_name(f"{path.name}.old")
+    shutil.rmtree(previous, ignore_errors=True)
+    if path.exists():
+        path.rename(previous)
+    staging.rename(path)
+    shutil.rmtree(previous, ignore_errors=True)
+
+
+def delete_points(path: Path, predicate) -> int:
+    """Delete the points of a saved collection whose payload matches
+
+    Rows are dropped from the saved arrays, without loading the collection
+    point by point, and nothing is written when no point matches.
+
+    Args:
+        path: Collection directory
+        predicate: Function of a payload, True to delete the point
+
+    Returns:
+        Number of deleted points
+    """
+    records = json.loads((path / POINTS_FILE).read_text())
+    keep = np.array([not predicate(record["payload"]) for record in records], bool)
+    deleted = len(records) - int(np.count_nonzero(keep))
+    if not deleted:
+        return 0
+
+    dense = np.load(path / DENSE_FILE, mmap_mode="r")[keep]
+    sparse = {name: np.load(path / file) for name, file in SPARSE_FILES.items()}
+    kept_entries = keep[sparse["points"]]
+    # Positions of the remaining points, and the posting lists they are in
+    positions = np.cumsum(keep) - 1
+    rows = np.repeat(np.arange(len(sparse["terms"])), np.diff(sparse["indptr"]))
+    counts = np.bincount(rows[kept_entries], minlength=len(sparse["terms"]))
+    write_collection(
+        path,
+        dense,
+        {
+            "terms": sparse["terms"][counts > 0],
+            "indptr": np.append(0, np.cumsum(counts[counts > 0])).astype(np.int64),
+            "points": positions[sparse["points"][kept_entries]].astype(np.int32),
+            "weights": sparse["weights"][kept_entries],
+        },
+        [record for record, kept in zip(records, keep) if kept],
+    )
+    return deleted
+
+
+class NumpyCollection:
+    """Mutable in-memory copy of a collection, used by ingestion
+
+    Points are kept by id in insertion order, so uploading a point again
+    replaces it in place, and the collection is written out in one go.
+
+    Args:
+        dimension: Size of the dense vectors
+    """
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.points: dict[str, tuple[dict, np.ndarray, tuple]] = {}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @classmethod
+    def load(cls, path: Path) -> "NumpyCollection":
+        """Read a collection written by save
+
+        Args:
+            path: Collection directory
+
+        Returns:
+            Collection holding every point, dense vectors memory-mapped
+        """
+        records = json.loads((path / POINTS_FILE).read_text())
+        # Empty files cannot be memory-mapped
+        dense = np.load(path / DENSE_FILE, mmap_mode="r" if records else None)
+        sparse = {name: np.load(path / file) for name, file in SPARSE_FILES.items()}
+
+        # Regroup the posting lists by point
+        row_terms = np.repeat(sparse["terms"], np.diff(sparse["indptr"]))
+        order = np.argsort(sparse["points"], kind="stable")
+        splits = np.searchsorted(sparse["points"][order], np.arange(1, len(records)))
+        point_terms = np.split(row_terms[order], splits)
+        point_weights = np.split(sparse["weights"][order], splits)
+
+        collection = cls(dense.shape[1])
+        for i, record in enumerate(records):
+            collection.points[record["id"]] = (
+                record["payload"],
+                dense[i],
+                (point_terms[i], point_weights[i]),
+            )
+        return collection
+
+    def upsert(
+        self,
+        point_id: str,
+        payload: dict,
+        dense: np.ndarray,
+        sparse: tuple[np.ndarray, np.ndarray],
+    ) -> None:
+        """Add a point, replacing the point with the same id"""
+        self.points[point_id] = (payload, dense, sparse)
+
+    def delete(self, predicate) -> int:
+        """Delete the points whose payload matches a predicate
+
+        Args:
+            predicate: Function of a payload, True to delete the point
+
+        Returns:
+            Number of deleted points
+        """
+        deleted = [
+            point_id
+            for point_id, (payload, _, _) in self.points.items()
+            if predicate(payload)
+        ]
+        for point_id in deleted:
+            del self.points[point_id]
+        return len(deleted)
+
+    def save(self, path: Path) -> None:
+        """Write the collection, replacing the previous version of it
+
+        The dense vectors are then memory-mapped from the written files, so
+        saving often keeps ingestion memory low.
+
+        Args:
+            path: Collection directory
+        """
+        points = list(self.points.items())
+        dense = np.zeros((len(points), self.dimension), np.float32)
+        for i, (_, (_, vector, _)) in enumerate(points):
+            dense[i] = vector
+        norms = np.linalg.norm(dense, axis=1, keepdims=True)
+        np.divide(dense, norms, out=dense, where=norms > 0)
+        write_collection(
+            path,
+            dense,
+            build_inverted_index([point[1][2] for point in points]),
+            [
+                {"id": point_id, "payload": payload}
+                for point_id, (payload, _, _) in points
+            ],
+        )
+        if points:
+            mapped = np.load(path / DENSE_FILE, mmap_mode="r")
+            for i, (point_id, (payload, _, sparse)) in enumerate(points):
+                self.points[point_id] = (payload, mapped[i], sparse)
+        logger.info(f"Saved {len(points)} points to {path}")
+
+
+class NumpyIndex:
+    """Read-only collection answering hybrid queries
+
+    Args:
+        path: Collection directory written by NumpyCollection.save
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        records = json.loads((self.path / POINTS_FILE).read_text())
+        self.ids = [record["id"] for record in records]
+        self.payloads = [record["payload"] for record in records]
+        self.size = len(records)
+
+        # Empty files cannot be memory-mapped
+        mmap_mode = "r" if self.size else None
+        self.dense = np.load(self.path / DENSE_FILE, mmap_mode=mmap_mode)
+        self.terms, self.indptr, self.term_points, self.term_weights = (
+            np.load(self.path / SPARSE_FILES[name], mmap_mode=mmap_mode)
+            for name in ("terms", "indptr", "points", "weights")
+        )
+
+        # BM25 inverse document frequency of each term, as Qdrant's IDF
+        # modifier computes it over every point with a sparse vector
+        frequencies = np.diff(self.indptr).astype(np.float32)
+        self.idf = np.log((self.size - frequencies + 0.5) / (frequencies + 0.5) + 1)
+
+        self._postings: dict[str, dict] = {}
+        self._timestamps: dict[str, np.ndarray] = {}
+        self._bitmaps = TTLCache(BITMAP_CACHE_SIZE)
+        self._lock = threading.Lock()
+        logger.info(f"Opened collection {self.path.name} with {self.size} points")
+
+    def warm(self) -> None:
+        """Read every array once so the first queries do not wait on disk"""
+        for array in (self.dense, self.term_points, self.term_weights):
+            if len(array):
+                np.asarray(array).sum()
+
+    def search(
+        self, query_vectors, filters: models.Filter | None, limit: int, group=True
+    ) -> list[models.ScoredPoint]:
+        """Fuse the dense and sparse rankings of a query
+
+        Args:
+            query_vectors: Dense and sparse vectors of the query
+            filters: Optional filter object
+            limit: Maximum number of results
+            group: Keep only the best chunk of each job
+
+        Returns:
+            Scored points, highest fused score first
+        """
+        dense, sparse = query_vectors
+        mask = self.filter_mask(filters)
+        matching = self.size if mask is None else int(np.count_nonzero(mask))
+        if not matching or limit <= 0:
+            return []
+
+        dense = np.asarray(dense, np.float32)
+        depth = prefetch_depth(limit)
+        while True:
+            fused = reciprocal_rank_fusion(
+                [
+                    self.sparse_ranking(sparse, mask, depth),
+                    self.dense_ranking(dense, mask, depth),
+                ]
+            )
+            points = self.scored_points(fused, limit, group)
+            # Jobs with many chunks can fill the candidates, prefetch more
+            if not group or len(points) == limit:
+                return points
+            depth = deeper_prefetch_depth(depth, matching)
+            if depth is None:
+                return points
+
+    def search_batch(self, searches) -> list[list[models.ScoredPoint]]:
+        """Run many searches, without grouping by job
+
+        Args:
+            searches: (query vectors, filter object or None, limit) of each
+                search
+
+        Returns:
+            List of scored points for each search, in order
+        """
+        return [
+            self.search(query_vectors, filters, limit, group=False)
+            for query_vectors, filters, limit in searches
+        ]
+
+    def count(self, filters: models.Filter | None) -> int:
+        """Exact number of points matching a filter"""
+        mask = self.filter_mask(filters)
+        return self.size if mask is None else int(np.count_nonzero(mask))
+
+    def dense_ranking(
+        self, query: np.ndarray, mask: np.ndarray | None, depth: int
+    ) -> np.ndarray:
+        """Rank points by cosine similarity to the dense query vector
+
+        Args:
+            query: Dense query vector
+            mask: Points allowed by the filter, None for every point
+            depth: Number of points to rank
+
+        Returns:
+            Positions of the best points, best first
+        """
+        norm = np.linalg.norm(query)
+        if not norm:
+            return np.zeros(0, np.int64)
+        query = query / norm
+
+        if mask is None:
+            return top_k(self.dense @ query, depth)
+        candidates = np.flatnonzero(mask)
+        if len(candidates) < self.size * DENSE_SUBSET_FRACTION:
+            scores = self.dense[candidates] @ query
+        else:
+            scores = (self.dense @ query)[candidates]
+        return candidates[top_k(scores, depth)]
+
+    def sparse_ranking(
+        self, query: models.SparseVector, mask: np.ndarray | None, depth: int
+    ) -> np.ndarray:
+        """Rank the points sharing a term with the query by BM25 score
+
+        Args:
+            query: Sparse query vector
+            mask: Points allowed by the filter, None for every point
+            depth: Number of points to rank
+
+        Returns:
+            Positions of the best points, best first
+        """
+        indices = np.asarray(query.indices, np.int64)
+        values = np.asarray(query.values, np.float32)
+        rows = np.searchsorted(self.terms, indices)
+        found = rows < len(self.terms)
+        found[found] = self.terms[rows[found]] == indices[found]
+        if not found.any():
+            return np.zeros(0, np.int64)
+
+        scores = np.zeros(self.size, np.float32)
+        touched = np.zeros(self.size, bool)
+        for row, value in zip(rows[found], values[found]):
+            start, end = self.indptr[row], self.indptr[row + 1]
+            points = self.term_points[start:end]
+            scores[points] += value * self.idf[row] * self.term_weights[start:end]
+            touched[points] = True
+
+        if mask is not None:
+            touched &= mask
+        candidates = np.flatnonzero(touched)
+        return candidates[top_k(scores[candidates], depth)]
+
+    def scored_points(
+        self, fused: list[tuple[int, float]], limit: int, group: bool
+    ) -> list[models.ScoredPoint]:
+        """Turn fused positions into scored points
+
+        Payloads are copied, as search fills them in with document texts.
+
+        Args:
+            fused: (position, score) pairs, best first
+            limit: Maximum number of points
+            group: Keep only the best chunk of each job
+
+        Returns:
+            Scored points, best first
+        """
+        points = []
+        seen_jobs = set()
+        for position, score in fused:
+            payload = self.payloads[position]
+            if group:
+                job_id = payload.get(JOB_ID_FIELD)
+                if job_id in seen_jobs:
+                    continue
+                seen_jobs.add(job_id)
+            points.append(
+                models.ScoredPoint(
+                    id=self.ids[position],
+                    version=0,
+                    score=score,
+                    payload=dict(payload),
+                )
+            )
+            if len(points) == limit:
+                break
+        return points
+
+    def filter_mask(self, filters: models.Filter | None) -> np.ndarray | None:
+        """Points matching a filter
+
+        Args:
+            filters: Optional filter object
+
+        Returns:
+            Boolean array over the points, None if there is no condition
+        """
+        if filters is None or not (filters.must or filters.should or filters.must_not):
+            return None
+        bitmap = self.filter_bitmap(filters)
+        return np.unpackbits(bitmap, count=self.size).astype(bool)
+
+    def filter_bitmap(self, filters: models.Filter) -> np.ndarray:
+        """Packed bitmap of the points matching a filter
+
+        Raises:
+            VectorDatabaseError: If the filter uses an unsupported clause
+        """
+        if filters.min_should is not None:
+            raise VectorDatabaseError("The numpy backend does not support min_should")
+
+        bitmap = self.full_bitmap()
+        for condition in as_list(filters.must):
+            bitmap &= self.condition_bitmap(condition)
+        should = as_list(filters.should)
+        if should:
+            any_bitmap = np.zeros_like(bitmap)
+            for condition in should:
+                any_bitmap |= self.condition_bitmap(condition)
+            bitmap &= any_bitmap
+        for condition in as_list(filters.must_not):
+            bitmap &= ~self.condition_bitmap(condition)
+        return bitmap & self.full_bitmap()
+
+    def condition_bitmap(self, condition) -> np.ndarray:
+        """Packed bitmap of the points matching one condition
+
+        Raises:
+            VectorDatabaseError: If the condition is not supported
+        """
+        if isinstance(condition, models.Filter):
+            return self.filter_bitmap(condition)
+        if not isinstance(condition, models.FieldCondition):
+            raise VectorDatabaseError(
+                f"The numpy backend does not support {type(condition).__name__}"
+            )
+
+        match = condition.match
+        if isinstance(match, models.MatchValue):
+            return self.value_bitmap(condition.key, match.value).copy()
+        if isinstance(match, models.MatchAny):
+            bitmap = np.zeros_like(self.full_bitmap())
+            for value in match.any:
+                bitmap |= self.value_bitmap(condition.key, value)
+            return bitmap
+        if isinstance(match, models.MatchExcept):
+            bitmap = self.full_bitmap()
+            for value in match.except_:
+                bitmap &= ~self.value_bitmap(condition.key, value)
+            return bitmap
+        if isinstance(condition.range, models.DatetimeRange):
+            return self.range_bitmap(condition.key, condition.range)
+        raise VectorDatabaseError(
+            f"The numpy backend does not support the condition on {condition.key}"
+        )
+
+    def full_bitmap(self) -> np.ndarray:
+        """Packed bitmap of every point"""
+        return np.packbits(np.ones(self.size, bool))
+
+    def value_bitmap(self, field: str, value) -> np.ndarray:
+        """Packed bitmap of the points whose payload field has a value
+
+        Bitmaps are cached, the caller must not modify them in place.
+        """
+        key = (field, value)
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            bits = np.zeros(self.size, bool)
+            bits[self.postings(field).get(value, [])] = True
+            bitmap = np.packbits(bits)
+            self._bitmaps.put(key, bitmap)
+        return bitmap
+
+    def postings(self, field: str) -> dict:
+        """Positions of the points holding each value of a payload field"""
+        postings = self._postings.get(field)
+        if postings is None:
+            with self._lock:
+                postings = defaultdict(list)
+                for position, payload in enumerate(self.payloads):
+                    for value in as_list(payload.get(field)):
+                        postings[value].append(position)
+                postings = dict(postings)
+                self._postings[field] = postings
+        return postings
+
+    def range_bitmap(self, field: str, bounds: models.DatetimeRange) -> np.ndarray:
+        """Packed bitmap of the points whose timestamp is within bounds"""
+        timestamps = self._timestamps.get(field)
+        if timestamps is None:
+            timestamps = np.array(
+                [to_datetime64(payload.get(field)) for payload in self.payloads],
+                dtype="datetime64[s]",
+            )
+            self._timestamps[field] = timestamps
+
+        # NaT compares false, so points without a timestamp never match
+        bits = ~np.isnat(timestamps)
+        if bounds.gt is not None:
+            bits &= timestamps > to_datetime64(bounds.gt)
+        if bounds.gte is not None:
+            bits &= timestamps >= to_datetime64(bounds.gte)
+        if bounds.lt is not None:
+            bits &= timestamps < to_datetime64(bounds.lt)
+        if bounds.lte is not None:
+            bits &= timestamps <= to_datetime64(bounds.lte)
+        return np.packbits(bits)
+
+
+def as_list(value) -> list:
+    """Wrap a single value in a list, None giving an empty one"""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
@@ -0,0 +1,431 @@
+"""Qdrant vector backend
+
+Chunks live in versioned Qdrant collections behind the COLLECTION_NAME
+alias. Hybrid queries prefetch sparse and dense candidates, fuse them with
+reciprocal rank fusion and group the fused points by job on the server.
+Ingestion operations are those of vector_backend.qdrant_ingestion.
+"""
+
+import asyncio
+
+from qdrant_client import models
+
+from common.collection_profiles import get_profile
+from common.logger import get_logger
+from common.payload_fields import canonical_filter
+from common.qdrant_config import QdrantConfig
+from common.qdrant_connection import get_async_client, get_client
+from common.ttl_cache import TTLCache
+from search.exceptions import VectorDatabaseError
+from vector_backend import qdrant_ingestion
+from vector_backend.base import (
+    JOB_ID_FIELD,
+    VectorBackend,
+    collection_name,
+    deeper_prefetch_depth,
+    prefetch_depth,
+)
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+# Profile the live collection was created with
+collection_profile = get_profile(config.COLLECTION_PROFILE)
+
+# Estimated number of points matching a filter, keyed by its canonical form
+filter_count_cache = TTLCache(
+    config.FILTER_COUNT_CACHE_SIZE, config.FILTER_COUNT_CACHE_TTL
+)
+
+
+def estimate_filter_matches(filters) -> int | None:
+    """Estimate how many points of the collection match a filter
+
+    Uses the cardinality estimate of the payload indexes, which is cheap
+    and needs no scan, and caches it for a few minutes.
+
+    Args:
+        filters: Optional filter object
+
+    Returns:
+        Estimated number of matching points, None without filter or if
+        the estimate failed
+    """
+    if filters is None:
+        return None
+    key = canonical_filter(filters)
+    matching = filter_count_cache.get(key)
+    if matching is not None:
+        return matching
+
+    # Principle 2: The search still runs without the estimate
+    try:
+        response = get_client().count(
+            collection_name=collection_name, count_filter=filters, exact=False
+        )
+    except Exception as e:
+        logger.warning(f"Could not estimate filter selectivity: {e}")
+        return None
+
+    filter_count_cache.put(key, response.count)
+    logger.info(f"Filters match about {response.count} point(s)")
+    return response.count
+
+
+async def estimate_filter_matches_async(filters) -> int | None:
+    """Async variant of estimate_filter_matches, on the async client
+
+    Args:
+        filters: Optional filter object
+
+    Returns:
+        Estimated number of matching points, None without filter or if
+        the estimate failed
+    """
+    if filters is None:
+        return None
+    key = canonical_filter(filters)
+    matching = filter_count_cache.get(key)
+    if matching is not None:
+        return matching
+
+    # Principle 2: The search still runs without the estimate
+    try:
+        response = await get_async_client().count(
+            collection_name=collection_name, count_filter=filters, exact=False
+        )
+    except Exception as e:
+        logger.warning(f"Could not estimate filter selectivity: {e}")
+        return None
+
+    filter_count_cache.put(key, response.count)
+    logger.info(f"Filters match about {response.count} point(s)")
+    return response.count
+
+
+def count_matching_points(filters) -> int | None:
+    """Count exactly how many points of the collection match a filter
+
+    Only grouped searches that found too few jobs need it, to know whether
+    a deeper prefetch can find more.
+
+    Args:
+        filters: Optional filter object
+
+    Returns:
+        Number of matching points, None if the count failed
+    """
+    # Principle 2: Without a count, retries stop at GROUPED_PREFETCH_MAX_LIMIT
+    try:
+        return (
+            get_client()
+            .count(collection_name=collection_name, count_filter=filters, exact=True)
+            .count
+        )
+    except Exception as e:
+        logger.warning(f"Could not count matching points: {e}")
+        return None
+
+
+async def count_matching_points_async(filters) -> int | None:
+    """Async variant of count_matching_points"""
+    # Principle 2: Without a count, retries stop at GROUPED_PREFETCH_MAX_LIMIT
+    try:
+        response = await get_async_client().count(
+            collection_name=collection_name, count_filter=filters, exact=True
+        )
+    except Exception as e:
+        logger.warning(f"Could not count matching points: {e}")
+        return None
+    return response.count
+
+
+def dense_search_params(matching: int | None = None) -> models.SearchParams | None:
+    """Dense search parameters, exhaustive for very selective filters
+
+    HNSW graph traversal loses recall when few points match the filter,
+    while scoring each of them is cheap.
+
+    Args:
+        matching: Estimated number of points matching the filter
+
+    Returns:
+        SearchParams of the collection profile, exact if few points match
+    """
+    params = collection_profile.search_params()
+    if matching is None or matching > config.PREFETCH_EXACT_THRESHOLD:
+        return params
+    if params is None:
+        return models.SearchParams(exact=True)
+    return params.model_copy(update={"exact": True})
+
+
+def build_search_request(
+    query_vectors, filters, limit, matching=None, depth=None
+) -> dict:
+    """Build the hybrid query sent to Qdrant
+
+    The filter is applied inside both prefetches, so every candidate they
+    return can be fused, and again at the fusion stage.
+
+    Args:
+        query_vectors: Dense and sparse vectors of the query
+        filters: Optional filter object
+        limit: Maximum number of results
+        matching: Estimated number of points matching the filter, only used
+            to choose exact dense search
+        depth: Prefetch depth, defaults to prefetch_depth(limit)
+
+    Returns:
+        Keyword arguments for query_points
+    """
+    dense, sparse = query_vectors
+    depth = depth or prefetch_depth(limit)
+    logger.debug(f"Prefetch depth {depth} for limit {limit}, {matching} matching")
+    return {
+        "collection_name": collection_name,
+        "prefetch": [
+            models.Prefetch(query=sparse, using="sparse", filter=filters, limit=depth),
+            models.Prefetch(
+                query=dense,
+                using="dense",
+                filter=filters,
+                limit=depth,
+                params=dense_search_params(matching),
+            ),
+        ],
+        "query": models.FusionQuery(fusion=models.Fusion.RRF),
+        "query_filter": filters,
+        "limit": limit,
+    }
+
+
+def build_batch_request(
+    query_vectors, filters, limit, matching=None
+) -> models.QueryRequest:
+    """Build one hybrid query of a query_batch_points call
+
+    Args:
+        query_vectors: Dense and sparse vectors of the query
+        filters: Optional filter object
+        limit: Maximum number of results
+        matching: Estimated number of points matching the filter
+
+    Returns:
+        QueryRequest equivalent to the query_points call of build_search_request
+    """
+    request = build_search_request(query_vectors, filters, limit, matching)
+    return models.QueryRequest(
+        prefetch=request["prefetch"],
+        query=request["query"],
+        filter=request["query_filter"],
+        limit=limit,
+        with_payload=True,
+    )
+
+
+def build_group_request(
+    query_vectors, filters, limit, matching=None, depth=None
+) -> dict:
+    """Build the hybrid query returning the best chunk of distinct jobs
+
+    Qdrant groups the fused points by job and keeps one point per group,
+    so each job appears once and no chunks are fetched only to be dropped.
+
+    Args:
+        query_vectors: Dense and sparse vectors of the query
+        filters: Optional filter object
+        limit: Maximum number of jobs
+        matching: Estimated number of points matching the filter
+        depth: Prefetch depth, defaults to prefetch_depth(limit)
+
+    Returns:
+        Keyword arguments for query_points_groups
+    """
+    return {
+        **build_search_request(query_vectors, filters, limit, matching, depth),
+        "group_by": JOB_ID_FIELD,
+        "group_size": 1,
+        "with_payload": True,
+    }
+
+
+def read_groups_response(response) -> list[models.ScoredPoint]:
+    """Validate a grouped Qdrant response and return the best point of each job
+
+    Args:
+        response: Response of query_points_groups
+
+    Returns:
+        List of scored points, one per job, highest score first
+
+    Raises:
+        VectorDatabaseError: If the response is invalid
+    """
+    # Principle 3: Validate response structure
+    if not response or not hasattr(response, "groups"):
+        logger.error("Invalid response from Qdrant: missing 'groups' attribute")
+        raise VectorDatabaseError("Vector database returned invalid response")
+
+    return [group.hits[0] for group in response.groups if group.hits]
+
+
+def read_batch_response(responses, count) -> list[list[models.ScoredPoint]]:
+    """Validate the responses of a batch search and return their points
+
+    Args:
+        responses: Responses of query_batch_points
+        count: Number of queries sent
+
+    Returns:
+        List of scored points for each query, in request order
+
+    Raises:
+        VectorDatabaseError: If the responses are invalid
+    """
+    # Principle 3: Validate response structure
+    if not isinstance(responses, list) or len(responses) != count:
+        logger.error("Invalid batch response from Qdrant: wrong number of responses")
+        raise VectorDatabaseError("Vector database returned invalid response")
+    if not all(hasattr(response, "points") for response in responses):
+        logger.error("Invalid response from Qdrant: missing 'points' attribute")
+        raise VectorDatabaseError("Vector database returned invalid response")
+
+    return [response.points for response in responses]
+
+
+class QdrantBackend(VectorBackend):
+    """Vector backend on a Qdrant server, or its local in-memory mode"""
+
+    name = "qdrant"
+
+    def search(self, query_vectors, filters, limit) -> list[models.ScoredPoint]:
+        matching = estimate_filter_matches(filters)
+        depth = prefetch_depth(limit)
+        points = read_groups_response(
+            get_client().query_points_groups(
+                **build_group_request(query_vectors, filters, limit, matching, depth)
+            )
+        )
+        if len(points) < limit:
+            available = count_matching_points(filters)
+            while len(points) < limit:
+                depth = deeper_prefetch_depth(depth, available)
+                if depth is None:
+                    break
+                logger.info(f"Found {len(points)} of {limit} jobs, prefetching {depth}")
+                points = read_groups_response(
+                    get_client().query_points_groups(
+                        **build_group_request(
+                            query_vectors, filters, limit, matching, depth
+                        )
+                    )
+                )
+        return points
+
+    async def search_async(
+        self, query_vectors, filters, limit
+    ) -> list[models.ScoredPoint]:
+        # The local in-memory mode gives each client its own storage, so only
+        # the sync client sees the indexed data
+        if config.QDRANT_LOCATION == ":memory:":
+            return await asyncio.to_thread(self.search, query_vectors, filters, limit)
+
+        matching = await estimate_filter_matches_async(filters)
+        depth = prefetch_depth(limit)
+        points = read_groups_response(
+            await get_async_client().query_points_groups(
+                **build_group_request(query_vectors, filters, limit, matching, depth)
+            )
+        )
+        if len(points) < limit:
+            available = await count_matching_points_async(filters)
+            while len(points) < limit:
+                depth = deeper_prefetch_depth(depth, available)
+                if depth is None:
+                    break
+                logger.info(f"Found {len(points)} of {limit} jobs, prefetching {depth}")
+                points = read_groups_response(
+                    await get_async_client().query_points_groups(
+                        **build_group_request(
+                            query_vectors, filters, limit, matching, depth
+                        )
+                    )
+                )
+        return points
+
+    def search_batch(self, searches) -> list[list[models.ScoredPoint]]:
+        responses = get_client().query_batch_points(
+            collection_name=collection_name,
+            requests=[
+                build_batch_request(*search, estimate_filter_matches(search[1]))
+                for search in searches
+            ],
+        )
+        return read_batch_response(responses, len(searches))
+
+    async def search_batch_async(self, searches) -> list[list[models.ScoredPoint]]:
+        if config.QDRANT_LOCATION == ":memory:":
+            return await asyncio.to_thread(self.search_batch, searches)
+
+        matching = await asyncio.gather(
+            *(estimate_filter_matches_async(filters) for _, filters, _ in searches)
+        )
+        responses = await get_async_client().query_batch_points(
+            collection_name=collection_name,
+            requests=[
+                build_batch_request(*search, count)
+                for search, count in zip(searches, matching)
+            ],
+        )
+        return read_batch_response(responses, len(searches))
+
+    def count(self, filters) -> int | None:
+        return estimate_filter_matches(filters)
+
+    def get_live_collection(self) -> str | None:
+        return qdrant_ingestion.get_live_collection()
+
+    def collection_exists(self, name: str) -> bool:
+        return get_client().collection_exists(name)
+
+    def new_collection_version(self) -> str:
+        return qdrant_ingestion.new_collection_version()
+
+    def fetch_job_content_hashes(self, target_collection: str) -> dict[str, str]:
+        return qdrant_ingestion.fetch_job_content_hashes(target_collection)
+
+    def has_unhashed_points(self, target_collection: str) -> bool:
+        return qdrant_ingestion.has_unhashed_points(target_collection)
+
+    def upload_embedded_chunks(
+        self, embedded_batches, checkpoint, document_store, target_collection
+    ) -> int:
+        return qdrant_ingestion.upload_embedded_chunks(
+            embedded_batches, checkpoint, document_store, target_collection
+        )
+
+    def create_field_indexes(self, target_collection: str) -> None:
+        field_names = list(qdrant_ingestion.PAYLOAD_INDEXES)
+        qdrant_ingestion.create_field_indexes(field_names, target_collection)
+        logger.info(f"Created index for fields: {field_names}")
+
+    def wait_until_indexed(self, target_collection: str) -> None:
+        qdrant_ingestion.wait_until_indexed(target_collection)
+
+    def warm_collection(self, target_collection: str) -> None:
+        qdrant_ingestion.warm_collection(target_collection)
+
+    def switch_alias(self, target_collection: str) -> None:
+        qdrant_ingestion.switch_alias(target_collection)
+
+    def delete_old_versions(self) -> list[str]:
+        return qdrant_ingestion.delete_old_versions()
+
+    def delete_job_points(self, job_ids, target_collection: str) -> None:
+        qdrant_ingestion.delete_job_points(job_ids, target_collection)
+
+    def delete_stale_job_points(self, content_hashes, target_collection) -> None:
+        qdrant_ingestion.delete_stale_job_points(content_hashes, target_collection)
@@ -0,0 +1,443 @@
+"""Qdrant collection operations of the ingestion pipeline
+
+The Qdrant backend builds, indexes and switches collection versions with
+these, so search does not depend on the ingestion package.
+"""
+
+import time
+
+from qdrant_client import models
+
+from common.collection_profiles import get_profile
+from common.exception import DataIngestionError
+from common.logger import get_logger
+from common.payload_fields import (
+    CATEGORY_FIELD,
+    COMPANY_FIELD,
+    LEVEL_FIELD,
+    LOCATION_FIELD,
+    PUBLISHED_FIELD,
+)
+from common.qdrant_config import QdrantConfig
+from common.qdrant_connection import get_client
+from vector_backend.base import (
+    VERSION_PATTERN,
+    collection_name,
+    collection_version_name,
+    get_point_id,
+    get_point_payload,
+)
+from vector_backend.uploader import BatchUploader
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+collection_profile = get_profile(config.COLLECTION_PROFILE)
+
+
+def new_collection_version():
+    """Create an empty collection for a new version of the index
+
+    Returns:
+        Name of the versioned collection
+    """
+    version_name = collection_version_name()
+    logger.info(
+        f"Creating new collection: {version_name} "
+        f"with profile {config.COLLECTION_PROFILE}"
+    )
+    get_client().create_collection(
+        collection_name=version_name,
+        **collection_profile.create_collection_kwargs(),
+    )
+    return version_name
+
+
+def get_live_collection():
+    """Find the collection that search currently queries
+
+    Returns:
+        Name of the collection behind the alias, the collection itself if
+        it predates aliases, or None if there is no index yet
+    """
+    for alias in get_client().get_aliases().aliases:
+        if alias.alias_name == collection_name:
+            return alias.collection_name
+    if get_client().collection_exists(collection_name):
+        return collection_name
+    return None
+
+
+def wait_until_indexed(target_collection, timeout=None, poll_interval=1.0):
+    """Wait until a collection has finished optimizing and indexing
+
+    A grey collection has optimizations pending until an update triggers
+    them, so they are triggered with an empty optimizer update.
+
+    Args:
+        target_collection: Collection to wait for
+        timeout: Seconds to wait, defaults to INDEXING_TIMEOUT
+        poll_interval: Seconds between status checks
+
+    Raises:
+        DataIngestionError: If the collection is not green in time
+    """
+    timeout = config.INDEXING_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    previous_status = None
+    while True:
+        status = get_client().get_collection(target_collection).status
+        if status == models.CollectionStatus.GREEN:
+            break
+        if status == models.CollectionStatus.RED or time.monotonic() > deadline:
+            raise DataIngestionError(
+                f"Collection {target_collection} is {status.value} after "
+                f"{timeout}s of indexing, not switching to it"
+            )
+        if (
+            status == models.CollectionStatus.GREY
+            and previous_status != models.CollectionStatus.GREY
+        ):
+            logger.info(f"Triggering pending optimizations of {target_collection}")
+            get_client().update_collection(
+                collection_name=target_collection,
+                optimizers_config=models.OptimizersConfigDiff(),
+            )
+        previous_status = status
+        time.sleep(poll_interval)
+    logger.info(f"Collection {target_collection} is fully indexed")
+
+
+def warm_collection(target_collection, queries=None):
+    """Run queries against a collection so its first live queries are fast
+
+    Queries reuse the vectors of stored points, so the HNSW graph, quantized
+    vectors and sparse index are paged in without embedding anything.
+
+    Args:
+        target_collection: Collection to warm
+        queries: Number of warm-up queries, defaults to WARMUP_QUERIES
+    """
+    queries = config.WARMUP_QUERIES if queries is None else queries
+    if queries <= 0:
+        return
+    points, _ = get_client().scroll(
+        collection_name=target_collection,
+        limit=queries,
+        with_payload=False,
+        with_vectors=True,
+    )
+    for point in points:
+        get_client().query_points(
+            collection_name=target_collection,
+            prefetch=[
+                models.Prefetch(query=point.vector["sparse"], using="sparse", limit=20),
+                models.Prefetch(
+                    query=point.vector["dense"],
+                    using="dense",
+                    limit=20,
+                    params=collection_profile.search_params(),
+                ),
+            ],
+            query=models.FusionQuery(fusion=models.Fusion.RRF),
+            limit=5,
+        )
+    logger.info(f"Warmed collection {target_collection} with {len(points)} queries")
+
+
+def switch_alias(target_collection):
+    """Point the search alias at a collection in one atomic operation
+
+    A collection that predates aliases and carries the alias name is
+    deleted first, which is the only moment search has no collection.
+
+    Args:
+        target_collection: Collection search should query from now on
+    """
+    operations = []
+    live_collection = get_live_collection()
+    if live_collection == collection_name:
+        logger.warning(
+            f"Replacing collection {collection_name} by an alias of the same name"
+        )
+        get_client().delete_collection(collection_name)
+    elif live_collection is not None:
+        operations.append(
+            models.DeleteAliasOperation(
+                delete_alias=models.DeleteAlias(alias_name=collection_name)
+            )
+        )
+    operations.append(
+        models.CreateAliasOperation(
+            create_alias=models.CreateAlias(
+                collection_name=target_collection, alias_name=collection_name
+            )
+        )
+    )
+    get_client().update_collection_aliases(change_aliases_operations=operations)
+    logger.info(f"Alias {collection_name} now points at {target_collection}")
+
+
+def delete_old_versions(keep=None):
+    """Delete old versioned collections, never the live one
+
+    Args:
+        keep: Number of versions to keep including the live one, defaults
+            to COLLECTION_VERSIONS_KEPT
+
+    Returns:
+        Names of the deleted versions
+    """
+    keep = config.COLLECTION_VERSIONS_KEPT if keep is None else keep
+    live_collection = get_live_collection()
+    versions = sorted(
+        (
+            collection.name
+            for collection in get_client().get_collections().collections
+            if VERSION_PATTERN.fullmatch(collection.name)
+            and collection.name != live_collection
+        ),
+        reverse=True,
+    )
+    deleted = versions[max(keep - 1, 0) :]
+    for version_name in deleted:
+        get_client().delete_collection(version_name)
+        logger.info(f"Deleted old collection version {version_name}")
+    return deleted
+
+
+# Payload index of each filterable field. Filter values are canonical
+# keywords, so exact keyword indexes replace full-text ones. Fields only
+# read by ingestion keep their index on disk, and category, which most
+# filtered searches use, lays out the storage by tenant.
+PAYLOAD_INDEXES = {
+    "chunk_id": models.KeywordIndexParams(
+        type=models.KeywordIndexType.KEYWORD, on_disk=True
+    ),
+    "chunk_index": models.IntegerIndexParams(
+        type=models.IntegerIndexType.INTEGER, lookup=True, range=False
+    ),
+    CATEGORY_FIELD: models.KeywordIndexParams(
+        type=models.KeywordIndexType.KEYWORD, is_tenant=True
+    ),
+    LEVEL_FIELD: models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD),
+    COMPANY_FIELD: models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD),
+    LOCATION_FIELD: models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD),
+    PUBLISHED_FIELD: models.DatetimeIndexParams(
+        type=models.DatetimeIndexType.DATETIME, is_principal=True
+    ),
+}
+
+
+def fetch_job_content_hashes(target_collection=collection_name, page_size=1000):
+    """Fetch the content hash of every job stored in the collection
+
+    Only the first chunk of each job is read, without vectors.
+
+    Args:
+        target_collection: Collection to read from
+        page_size: Number of points per scroll request
+
+    Returns:
+        Dictionary of content hashes keyed by job id
+    """
+    hashes = {}
+    offset = None
+    while True:
+        points, offset = get_client().scroll(
+            collection_name=target_collection,
+            scroll_filter=models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key="chunk_index", match=models.MatchValue(value=0)
+                    )
+                ]
+            ),
+            limit=page_size,
+            offset=offset,
+            with_payload=["chunk_id", "content_hash"],
+            with_vectors=False,
+        )
+        for point in points:
+            hashes[str(point.payload.get("chunk_id"))] = point.payload.get(
+                "content_hash"
+            )
+        if offset is None:
+            break
+    logger.info(f"Found {len(hashes)} jobs already in collection {target_collection}")
+    return hashes
+
+
+def has_unhashed_points(target_collection=collection_name):
+    """Check whether a collection holds points without a content hash
+
+    Collections built before incremental ingestion have random point ids
+    and no content hashes, so their points can neither be matched to jobs
+    nor replaced by an incremental run.
+
+    Args:
+        target_collection: Collection to check
+
+    Returns:
+        True if at least one point has no content hash
+    """
+    points, _ = get_client().scroll(
+        collection_name=target_collection,
+        scroll_filter=models.Filter(
+            must=[
+                models.IsEmptyCondition(
+                    is_empty=models.PayloadField(key="content_hash")
+                )
+            ]
+        ),
+        limit=1,
+        with_payload=False,
+        with_vectors=False,
+    )
+    return bool(points)
+
+
+def delete_job_points(job_ids, target_collection=collection_name, batch_size=1000):
+    """Delete every chunk of the given jobs
+
+    Args:
+        job_ids: Ids of the jobs to delete
+        target_collection: Collection to delete from
+        batch_size: Number of job ids per delete request
+    """
+    job_ids = list(job_ids)
+    for i in range(0, len(job_ids), batch_size):
+        get_client().delete(
+            collection_name=target_collection,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key="chunk_id",
+                            match=models.MatchAny(any=job_ids[i : i + batch_size]),
+                        )
+                    ]
+                )
+            ),
+        )
+    logger.info(f"Deleted points of {len(job_ids)} jobs")
+
+
+def delete_stale_job_points(
+    content_hashes, target_collection=collection_name, batch_size=1000
+):
+    """Delete chunks left over from a previous version of changed jobs
+
+    Chunks of the current version carry the new content hash, so any chunk
+    of these jobs with a different hash belongs to an older version.
+
+    Args:
+        content_hashes: New content hash of each changed job, keyed by job id
+        target_collection: Collection to delete from
+        batch_size: Number of job ids per delete request
+    """
+    job_ids = list(content_hashes)
+    for i in range(0, len(job_ids), batch_size):
+        batch = job_ids[i : i + batch_size]
+        get_client().delete(
+            collection_name=target_collection,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key="chunk_id", match=models.MatchAny(any=batch)
+                        )
+                    ],
+                    must_not=[
+                        models.FieldCondition(
+                            key="content_hash",
+                            match=models.MatchAny(
+                                any=[content_hashes[job_id] for job_id in batch]
+                            ),
+                        )
+                    ],
+                )
+            ),
+        )
+    logger.info(f"Deleted stale chunks of {len(job_ids)} changed jobs")
+
+
+def iter_points(embedded_batches, document_store=None):
+    """Build the points of embedded chunks
+
+    Args:
+        embedded_batches: Iterable of (chunk batch, dense vectors, sparse
+            vectors) tuples
+        document_store: Optional document store receiving the chunk texts
+            and job details, which are then left out of the payloads
+
+    Yields:
+        Points with raw dense and sparse vectors and the chunk payload
+    """
+    for chunks, dense, sparse in embedded_batches:
+        if document_store is not None:
+            document_store.add_chunks(chunks)
+        for i, chunk in enumerate(chunks):
+            yield models.PointStruct(
+                id=get_point_id(
+                    chunk["metadata"]["chunk_id"], chunk["metadata"]["chunk_index"]
+                ),
+                vector={
+                    "dense": dense[i].tolist(),
+                    "sparse": models.SparseVector(
+                        indices=sparse[i][0].tolist(),
+                        values=sparse[i][1].tolist(),
+                    ),
+                },
+                payload=get_point_payload(chunk, document_store),
+            )
+
+
+def upload_embedded_chunks(
+    embedded_batches,
+    checkpoint=None,
+    document_store=None,
+    target_collection=collection_name,
+):
+    """Upload already embedded chunks with parallel, retried batches
+
+    Args:
+        embedded_batches: Iterable of (chunk batch, dense vectors, sparse
+            vectors) tuples
+        checkpoint: Optional upload checkpoint to record progress in and
+            resume from
+        document_store: Optional document store receiving the chunk texts
+        target_collection: Collection to upload to
+
+    Returns:
+        Number of chunks uploaded
+    """
+    # The in-memory local mode is not thread-safe
+    workers = 1 if config.QDRANT_LOCATION == ":memory:" else config.UPLOAD_WORKERS
+    logger.info(
+        f"Starting upload with {workers} batches in flight, "
+        f"up to {config.UPLOAD_MAX_BATCH_BYTES} bytes per batch"
+    )
+    uploader = BatchUploader(
+        get_client(), target_collection, checkpoint, workers=workers
+    )
+    total_chunks = uploader.upload(iter_points(embedded_batches, document_store))
+    logger.info(f"Successfully uploaded all {total_chunks} chunks to Qdrant")
+    return total_chunks
+
+
+def create_field_indexes(field_names, target_collection=collection_name):
+    """Create payload indexes for filterable fields
+
+    Args:
+        field_names: List of field names to index, keys of PAYLOAD_INDEXES
+        target_collection: Collection to create the indexes in
+    """
+    for field_name in field_names:
+        get_client().create_payload_index(
+            collection_name=target_collection,
+            field_name=field_name,
+            field_schema=PAYLOAD_INDEXES[field_name],
+        )
@@ -0,0 +1,325 @@
+"""Parallel, resumable upload of points to Qdrant
+
+Points are grouped into batches bounded by their estimated payload size,
+upserted by a pool of threads with a bounded number of batches in flight,
+and retried with exponential backoff. Completed ranges of the point
+stream are recorded in a checkpoint file, so an interrupted upload can
+resume where it stopped instead of starting over.
+"""
+
+import json
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from qdrant_client import QdrantClient, models
+
+from common.exception import DataIngestionError
+from common.logger import get_logger
+from common.qdrant_config import QdrantConfig
+
+config = QdrantConfig()
+logger = get_logger(
+    __name__, config.LOG_LEVEL, config.LOG_TO_CONSOLE, config.LOG_TO_FILE
+)
+
+# Rough size of a float and of a sparse (index, value) pair once serialized
+FLOAT_BYTES = 20
+SPARSE_PAIR_BYTES = 32
+
+# Throughput is logged at most this often, in seconds
+REPORT_INTERVAL = 5.0
+
+
+def estimate_point_bytes(point: models.PointStruct) -> int:
+    """Estimate the request size of a point
+
+    Args:
+        point: Point to upload
+
+    Returns:
+        Approximate number of bytes the point adds to an upsert request
+    """
+    size = len(json.dumps(point.payload or {}, default=str))
+    for vector in (point.vector or {}).values():
+        if isinstance(vector, models.SparseVector):
+            size += len(vector.indices) * SPARSE_PAIR_BYTES
+        else:
+            size += len(vector) * FLOAT_BYTES
+    return size
+
+
+class UploadCheckpoint:
+    """Records which ranges of the point stream were uploaded
+
+    The checkpoint belongs to one run, identified by a key that hashes
+    everything the point stream depends on. Resuming is only possible with
+    the same key. The content hashes the run started from are saved with it,
+    so a resumed incremental run rebuilds the exact same point stream, along
+    with the collection the run uploads to.
+
+    Args:
+        path: Checkpoint file
+        run_key: Identifier of the run
+    """
+
+    def __init__(self, path: str | Path, run_key: str):
+        self.path = Path(path)
+        self.hashes_path = self.path.with_name(f"{self.path.stem}_hashes.json")
+        self.run_key = run_key
+        self.collection: str | None = None
+        self.completed: list[list[int]] = []
+        self._lock = threading.Lock()
+
+    def start(
+        self, existing_hashes: dict[str, str], collection: str | None = None
+    ) -> None:
+        """Start a new run, discarding any previous checkpoint
+
+        Args:
+            existing_hashes: Content hashes the run compares jobs against
+            collection: Collection the run uploads to
+        """
+        self.completed = []
+        self.collection = collection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write(self.hashes_path, existing_hashes)
+        self.save()
+
+    def resume(self) -> dict[str, str] | None:
+        """Load the checkpoint of an interrupted run
+
+        Returns:
+            Content hashes the run started from, or None if there is no
+            checkpoint for this run
+        """
+        if not self.path.exists() or not self.hashes_path.exists():
+            logger.warning("No upload checkpoint found, starting from scratch")
+            return None
+
+        state = json.loads(self.path.read_text())
+        if state.get("run_key") != self.run_key:
+            logger.warning(
+                "Upload checkpoint belongs to a different run (data or settings "
+                "changed), starting from scratch"
+            )
+            return None
+
+        self.completed = state["completed"]
+        self.collection = state.get("collection")
+        uploaded = sum(end - start for start, end in self.completed)
+        logger.info(f"Resuming upload, {uploaded} points already uploaded")
+        return json.loads(self.hashes_path.read_text())
+
+    def mark_completed(self, start: int, end: int) -> None:
+        """Record that points [start, end) of the stream were uploaded
+
+        Args:
+            start: Position of the first point of the batch
+            end: Position after the last point of the batch
+        """
+        with self._lock:
+            ranges = sorted([*self.completed, [start, end]])
+            merged = [ranges[0]]
+            for range_start, range_end in ranges[1:]:
+                if range_start <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], range_end)
+                else:
+                    merged.append([range_start, range_end])
+            self.completed = merged
+            self.save()
+
+    def is_completed(self, position: int) -> bool:
+        """Check whether a point of the stream was already uploaded"""
+        return any(start <= position < end for start, end in self.completed)
+
+    def save(self) -> None:
+        self._write(
+            self.path,
+            {
+                "run_key": self.run_key,
+                "collection": self.collection,
+                "completed": self.completed,
+            },
+        )
+
+    def clear(self) -> None:
+        """Remove the checkpoint once the run has completed"""
+        self.path.unlink(missing_ok=True)
+        self.hashes_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _write(path: Path, data) -> None:
+        # Replace the file atomically so a crash never leaves it truncated
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(data))
+        temp_path.replace(path)
+
+
+class BatchUploader:
+    """Upserts a stream of points with parallel, size-bounded batches
+
+    Args:
+        client: Qdrant client
+        collection_name: Collection to upload to
+        checkpoint: Optional checkpoint, recording and skipping completed
+            ranges of the stream
+        workers: Number of batches uploaded in parallel
+        max_batch_bytes: Estimated request size at which a batch is closed
+        max_batch_points: Maximum number of points per batch
+        max_retries: Number of retries of a failed batch
+        retry_backoff: Delay before the first retry, in seconds, doubled at
+            every further retry
+    """
+
+    def __init__(
+        self,
+        client: QdrantClient,
+        collection_name: str,
+        checkpoint: UploadCheckpoint | None = None,
+        workers: int | None = None,
+        max_batch_bytes: int | None = None,
+        max_batch_points: int | None = None,
+        max_retries: int | None = None,
+        retry_backoff: float | None = None,
+    ):
+        self.client = client
+        self.collection_name = collection_name
+        self.checkpoint = checkpoint
+        self.workers = workers or config.UPLOAD_WORKERS
+        self.max_batch_bytes = max_batch_bytes or config.UPLOAD_MAX_BATCH_BYTES
+        self.max_batch_points = max_batch_points or config.UPLOAD_MAX_BATCH_POINTS
+        self.max_retries = (
+            config.UPLOAD_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.retry_backoff = (
+            config.UPLOAD_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        )
+        self._lock = threading.Lock()
+        self._uploaded = 0
+        self._started_at = 0.0
+        self._last_report = 0.0
+
+    def upload(self, points: Iterable[models.PointStruct]) -> int:
+        """Upload every point of a stream
+
+        Args:
+            points: Points to upload, in a deterministic order
+
+        Returns:
+            Number of points uploaded by this call, excluding points skipped
+            because the checkpoint marks them as completed
+
+        Raises:
+            DataIngestionError: If a batch still fails after every retry
+        """
+        self._uploaded = 0
+        self._started_at = self._last_report = time.monotonic()
+
+        pending: deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                for start, end, batch in self._batches(points):
+                    pending.append(
+                        executor.submit(self._upload_batch, start, end, batch)
+                    )
+                    # Bound the batches in flight, so memory stays flat and
+                    # a failure stops the stream early
+                    while len(pending) >= self.workers * 2:
+                        pending.popleft().result()
+                while pending:
+                    pending.popleft().result()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        elapsed = time.monotonic() - self._started_at
+        logger.info(
+            f"Uploaded {self._uploaded} points in {elapsed:.1f}s "
+            f"({self._uploaded / max(elapsed, 1e-9):.0f} points/s)"
+        )
+        return self._uploaded
+
+    def _batches(
+        self, points: Iterable[models.PointStruct]
+    ) -> Iterator[tuple[int, int, list[models.PointStruct]]]:
+        """Group points into batches bounded by estimated size
+
+        Yields:
+            Tuples of (stream position of the first point, position after
+            the last point, points)
+        """
+        batch: list[models.PointStruct] = []
+        batch_start = 0
+        batch_bytes = 0
+        skipped = 0
+        for position, point in enumerate(points):
+            if self.checkpoint is not None and self.checkpoint.is_completed(position):
+                if batch:
+                    yield batch_start, position, batch
+                    batch, batch_bytes = [], 0
+                skipped += 1
+                continue
+
+            if not batch:
+                batch_start = position
+            batch.append(point)
+            batch_bytes += estimate_point_bytes(point)
+            if (
+                batch_bytes >= self.max_batch_bytes
+                or len(batch) >= self.max_batch_points
+            ):
+                yield batch_start, position + 1, batch
+                batch, batch_bytes = [], 0
+
+        if batch:
+            yield batch_start, batch_start + len(batch), batch
+        if skipped:
+            logger.info(f"Skipped {skipped} points uploaded before the checkpoint")
+
+    def _upload_batch(
+        self, start: int, end: int, batch: list[models.PointStruct]
+    ) -> None:
+        """Upsert one batch, retrying with exponential backoff"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.client.upsert(
+                    collection_name=self.collection_name, points=batch, wait=True
+                )
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise DataIngestionError(
+                        f"Failed to upload points {start}-{end} after "
+                        f"{self.max_retries} retries: {e}"
+                    ) from e
+                # Jitter spreads out the retries of batches that failed together
+                delay = self.retry_backoff * 2**attempt * random.uniform(0.5, 1.5)
+                logger.warning(
+                    f"Upload of points {start}-{end} failed ({e}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+        if self.checkpoint is not None:
+            self.checkpoint.mark_completed(start, end)
+        self._report(len(batch))
+
+    def _report(self, batch_points: int) -> None:
+        """Count uploaded points and log throughput periodically"""
+        with self._lock:
+            self._uploaded += batch_points
+            now = time.monotonic()
+            if now - self._last_report < REPORT_INTERVAL:
+                return
+            self._last_report = now
+            elapsed = now - self._started_at
+            logger.info(
+                f"Uploaded {self._uploaded} points "
+                f"({self._uploaded / elapsed:.0f} points/s)"
+            )